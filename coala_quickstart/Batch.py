@@ -0,0 +1,176 @@
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+from coala_quickstart.CPUCount import get_cpu_count
+
+
+class BatchResult:
+    """
+    The outcome of generating the configuration of one project in batch
+    mode.
+    """
+
+    def __init__(self, project_dir, seconds, coafile=None, error=None):
+        """
+        :param project_dir: The project directory.
+        :param seconds:     Time taken to process the project.
+        :param coafile:     Path of the written coafile, or None on failure.
+        :param error:       A description of the failure, or None.
+        """
+        self.project_dir = project_dir
+        self.seconds = seconds
+        self.coafile = coafile
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+    def to_dict(self):
+        return {'project_dir': self.project_dir,
+                'seconds': self.seconds,
+                'coafile': self.coafile,
+                'error': self.error}
+
+
+def read_manifest(path):
+    """
+    Reads a manifest file listing one project directory per line. Empty
+    lines and lines starting with ``#`` are ignored, and relative paths are
+    relative to the directory of the manifest.
+
+    :param path: Path to the manifest file.
+    :return:     A list of absolute project directories.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, 'r') as manifest:
+        lines = [line.strip() for line in manifest]
+    return [os.path.normpath(os.path.join(base_dir, line))
+            for line in lines
+            if line and not line.startswith('#')]
+
+
+def generate_project(project_dir, args):
+    """
+    Generates the coafile of a project non-interactively, like
+    ``coala-quickstart --ci`` run inside of the project directory.
+
+    :param project_dir: The project directory.
+    :param args:        The parsed arguments.
+    :return:            A ``BatchResult``.
+    """
+    from coala_quickstart.api import QuickstartSession
+
+    session = QuickstartSession(
+        project_dir,
+        incomplete_sections=bool(args.incomplete_sections),
+        filter_by_capabilities=not args.no_filter_by_capabilities,
+        time_budget=args.time_budget)
+    start = time.perf_counter()
+    try:
+        coafile = session.write_coafile()
+    except Exception as exception:
+        return BatchResult(project_dir, time.perf_counter() - start,
+                           error='{}: {}'.format(type(exception).__name__,
+                                                 exception))
+    return BatchResult(project_dir, time.perf_counter() - start, coafile)
+
+
+def _generate_project_task(task):
+    return generate_project(*task)
+
+
+def run_batch(project_dirs, args, jobs=0):
+    """
+    Generates the coafiles of several projects in a process pool.
+
+    :param project_dirs: A list of project directories.
+    :param args:         The parsed arguments, used for every project.
+    :param jobs:         Number of worker processes, 0 means one per CPU.
+    :return:             A list of ``BatchResult`` objects in the order of
+                         ``project_dirs``.
+    """
+    if jobs < 0:
+        raise ValueError('jobs must be 0 or a positive integer')
+
+    project_dirs = [os.path.abspath(project_dir)
+                    for project_dir in project_dirs]
+    # Batch mode never asks questions.
+    args.non_interactive = True
+    tasks = [(project_dir, args) for project_dir in project_dirs]
+
+    # The bear modules are imported before the worker processes are forked,
+    # so that they don't have to be imported again for every project.
+    from coala_quickstart.api import warm_up
+    warm_up()
+
+    jobs = min(jobs or get_cpu_count(), len(tasks))
+    if jobs <= 1:
+        return [_generate_project_task(task) for task in tasks]
+
+    with multiprocessing.Pool(processes=jobs) as pool:
+        return pool.map(_generate_project_task, tasks, chunksize=1)
+
+
+def get_batch_summary(results, seconds):
+    """
+    :param results: A list of ``BatchResult`` objects.
+    :param seconds: The wall clock time of the whole batch.
+    :return:        A JSON serializable dict summarizing the batch.
+    """
+    failures = [result for result in results if not result.succeeded]
+    return {'projects': len(results),
+            'failures': len(failures),
+            'seconds': seconds,
+            'repos_per_minute': len(results) * 60 / seconds if seconds else 0,
+            'results': [result.to_dict() for result in results]}
+
+
+def print_batch_summary(printer, summary):
+    """
+    Prints the per project timings and failures of a batch.
+
+    :param printer: A ``ConsolePrinter`` object.
+    :param summary: A summary returned by ``get_batch_summary``.
+    """
+    for result in summary['results']:
+        if result['error']:
+            printer.print('    FAILED {:>8.2f}s  {}: {}'.format(
+                result['seconds'], result['project_dir'], result['error']),
+                color='red')
+        else:
+            printer.print('    OK     {:>8.2f}s  {}'.format(
+                result['seconds'], result['coafile']),
+                color='green')
+    printer.print('\n{} projects processed in {:.2f}s ({:.1f} repos/minute), '
+                  '{} failed.'.format(summary['projects'], summary['seconds'],
+                                      summary['repos_per_minute'],
+                                      summary['failures']))
+
+
+def main_batch(args, printer):
+    """
+    Runs the batch mode for the ``--batch`` and ``--manifest`` arguments.
+
+    :return: The exit code, 1 if some project failed.
+    """
+    project_dirs = list(args.batch or [])
+    if args.manifest:
+        project_dirs += read_manifest(args.manifest)
+
+    start = time.perf_counter()
+    results = run_batch(project_dirs, args, args.jobs)
+    summary = get_batch_summary(results, time.perf_counter() - start)
+
+    print_batch_summary(printer, summary)
+    if args.report:
+        try:
+            with open(args.report, 'w') as report:
+                json.dump(summary, report, indent=2)
+        except OSError:
+            logging.error('Unable to write the batch report to {!r}.'.format(
+                args.report))
+    return 1 if summary['failures'] else 0
@@ -0,0 +1,148 @@
+"""
+The number of CPUs coala-quickstart may use, which sizes all its process
+pools. In containers ``multiprocessing.cpu_count()`` reports the CPUs of the
+host, so the CPU affinity and the CPU quota of the cgroup are taken into
+account too.
+"""
+import logging
+import math
+import multiprocessing
+import os
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+PROC_SELF_CGROUP = '/proc/self/cgroup'
+
+
+def _read(path):
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def get_cgroup_paths(proc_self_cgroup=PROC_SELF_CGROUP):
+    """
+    :param proc_self_cgroup: The ``/proc/self/cgroup`` file.
+    :return:                 A dict with the cgroup controllers as keys and
+                             the cgroup of the process as values, where the
+                             cgroup v2 hierarchy has the empty string as key.
+    """
+    paths = {}
+    for line in (_read(proc_self_cgroup) or '').splitlines():
+        parts = line.split(':', 2)
+        if len(parts) != 3:
+            continue
+        _, controllers, path = parts
+        for controller in controllers.split(','):
+            paths[controller] = path
+    return paths
+
+
+def _candidate_dirs(root, mount, path):
+    # Containers usually mount their own cgroup as the root of the
+    # hierarchy, so the root is tried if the path of the process is missing.
+    directory = os.path.join(root, mount)
+    if path.strip('/'):
+        yield os.path.join(directory, path.lstrip('/'))
+    yield directory
+
+
+def parse_cpu_max(content):
+    """
+    Parses the ``cpu.max`` file of cgroup v2.
+
+    >>> parse_cpu_max('400000 100000')
+    4.0
+    >>> parse_cpu_max('max 100000') is None
+    True
+
+    :param content: The content of the file.
+    :return:        The number of CPUs of the quota, None if unlimited.
+    """
+    parts = content.split()
+    if len(parts) != 2 or parts[0] == 'max':
+        return None
+    quota, period = int(parts[0]), int(parts[1])
+    return quota / period if quota > 0 and period > 0 else None
+
+
+def parse_cfs_quota(quota, period):
+    """
+    Parses the ``cpu.cfs_quota_us`` and ``cpu.cfs_period_us`` files of
+    cgroup v1.
+
+    >>> parse_cfs_quota('150000', '100000')
+    1.5
+    >>> parse_cfs_quota('-1', '100000') is None
+    True
+
+    :param quota:  The content of ``cpu.cfs_quota_us``.
+    :param period: The content of ``cpu.cfs_period_us``.
+    :return:       The number of CPUs of the quota, None if unlimited.
+    """
+    quota, period = int(quota), int(period)
+    return quota / period if quota > 0 and period > 0 else None
+
+
+def get_cgroup_cpu_limit(root=CGROUP_ROOT,
+                         proc_self_cgroup=PROC_SELF_CGROUP):
+    """
+    :param root:             The mount point of the cgroup file systems.
+    :param proc_self_cgroup: The ``/proc/self/cgroup`` file.
+    :return:                 The number of CPUs of the CPU quota of the
+                             cgroup v2 or v1 of the process, a float, None
+                             if there is no quota.
+    """
+    paths = get_cgroup_paths(proc_self_cgroup)
+    try:
+        if '' in paths:
+            for directory in _candidate_dirs(root, '', paths['']):
+                content = _read(os.path.join(directory, 'cpu.max'))
+                if content is not None:
+                    return parse_cpu_max(content)
+        if 'cpu' in paths:
+            for mount in ('cpu,cpuacct', 'cpu'):
+                for directory in _candidate_dirs(root, mount, paths['cpu']):
+                    quota = _read(os.path.join(directory,
+                                               'cpu.cfs_quota_us'))
+                    period = _read(os.path.join(directory,
+                                                'cpu.cfs_period_us'))
+                    if quota is not None and period is not None:
+                        return parse_cfs_quota(quota, period)
+    except ValueError as exception:
+        logging.warning('Unable to parse the CPU quota of the cgroup: {}'
+                        .format(exception))
+    return None
+
+
+def get_cpu_count(root=CGROUP_ROOT, proc_self_cgroup=PROC_SELF_CGROUP):
+    """
+    The number of CPUs available to the process: the CPUs it may run on,
+    limited by the CPU quota of its cgroup, rounded up. The
+    ``COALA_QUICKSTART_CPUS`` environment variable overrides it.
+
+    :param root:             The mount point of the cgroup file systems.
+    :param proc_self_cgroup: The ``/proc/self/cgroup`` file.
+    :return:                 The number of CPUs, at least 1.
+    """
+    override = os.environ.get('COALA_QUICKSTART_CPUS')
+    if override:
+        try:
+            if int(override) > 0:
+                return int(override)
+        except ValueError:
+            pass
+        logging.warning('COALA_QUICKSTART_CPUS must be a positive integer, '
+                        'not {!r}. It is ignored.'.format(override))
+
+    if hasattr(os, 'sched_getaffinity'):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover
+        cpu_count = multiprocessing.cpu_count()
+
+    limit = get_cgroup_cpu_limit(root, proc_self_cgroup)
+    if limit is not None:
+        cpu_count = min(cpu_count, math.ceil(limit))
+    return max(cpu_count, 1)
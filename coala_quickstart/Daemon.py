@@ -0,0 +1,255 @@
+"""
+A long running coala-quickstart process serving generate requests over a
+Unix domain socket, so that the bears only have to be imported once.
+
+The protocol consists of one JSON object per line in both directions.
+Every request has a ``command`` and gets a response with a boolean ``ok``
+and an ``error`` message if it is false:
+
+``{"command": "ping"}``
+    Responds with the ``version`` and ``pid`` of the daemon.
+``{"command": "generate", "project_dir": DIR, "args": [...]}``
+    Generates the configuration of a project, where ``args`` are
+    coala-quickstart command line arguments. Responds with the
+    ``settings`` as a list of ``[section, {setting: value}]`` pairs and the
+    ``coafile`` written, unless ``"write": false`` is given.
+``{"command": "shutdown"}``
+    Stops the daemon.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+
+from coala_quickstart import VERSION
+
+
+SOCKET_FILENAME = 'daemon.sock'
+
+# Maximum size of a request or response line.
+MAX_MESSAGE_SIZE = 2 ** 20
+
+
+def get_socket_path():
+    """
+    Returns the default path of the daemon socket, inside of the
+    coala-quickstart cache directory. It can be overridden with the
+    ``COALA_QUICKSTART_SOCKET`` environment variable.
+    """
+    socket_path = os.environ.get('COALA_QUICKSTART_SOCKET')
+    if socket_path:
+        return socket_path
+
+    from coala_quickstart.generation.BearCatalog import get_cache_dir
+    return os.path.join(get_cache_dir(), SOCKET_FILENAME)
+
+
+class DaemonError(Exception):
+    """
+    Raised by ``send_request`` if the daemon can't be reached or responds
+    with an error.
+    """
+
+
+def generate(project_dir, arg_list, write=True):
+    """
+    Handles a generate request.
+
+    :param project_dir: The project directory.
+    :param arg_list:    The coala-quickstart command line arguments.
+    :param write:       Whether to write the coafile of the project.
+    :return:            The response.
+    """
+    from coala_quickstart.api import QuickstartSession
+    from coala_quickstart.coala_quickstart import _get_arg_parser
+
+    args = _get_arg_parser().parse_args(arg_list)
+    if args.green_mode or args.batch or args.manifest or args.daemon:
+        raise ValueError('--green-mode, --batch, --manifest and --daemon '
+                         'are not supported by the daemon.')
+
+    session = QuickstartSession(
+        project_dir,
+        incomplete_sections=bool(args.incomplete_sections),
+        filter_by_capabilities=not args.no_filter_by_capabilities,
+        time_budget=args.time_budget)
+    start = time.perf_counter()
+    response = {'ok': True,
+                'settings': [[name, settings]
+                             for name, settings in session.run().items()]}
+    if write:
+        response['coafile'] = session.write_coafile()
+    response['seconds'] = time.perf_counter() - start
+    return response
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in iter(lambda: self.rfile.readline(MAX_MESSAGE_SIZE), b''):
+            response = self.server.dispatch(line)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn,
+                   socketserver.UnixStreamServer):
+    """
+    Serves requests concurrently, one thread per connection.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        """
+        :param socket_path: Path of the Unix domain socket to listen on.
+        :raises DaemonError: If another daemon listens on the socket.
+        """
+        if os.path.exists(socket_path):
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise DaemonError('{!r} exists and is not a socket.'.format(
+                    socket_path))
+            try:
+                send_request({'command': 'ping'}, socket_path)
+            except DaemonError:
+                # Left behind by a daemon that didn't shut down cleanly.
+                os.remove(socket_path)
+            else:
+                raise DaemonError('A daemon is already listening on {!r}.'
+                                  .format(socket_path))
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)),
+                    exist_ok=True)
+        super().__init__(socket_path, RequestHandler)
+        self.socket_path = socket_path
+
+    def server_bind(self):
+        # Create the socket readable and writable by the user only, as other
+        # local users could connect before a later change of its mode.
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def dispatch(self, line):
+        """
+        :param line: A request as a line of JSON.
+        :return:     The response as a dict.
+        """
+        try:
+            request = json.loads(line.decode())
+            command = request['command']
+            if command == 'ping':
+                return {'ok': True, 'version': VERSION, 'pid': os.getpid()}
+            if command == 'generate':
+                return generate(request['project_dir'],
+                                request.get('args', []),
+                                request.get('write', True))
+            if command == 'shutdown':
+                threading.Thread(target=self.shutdown).start()
+                return {'ok': True}
+            raise ValueError('Unknown command {!r}.'.format(command))
+        except SystemExit:
+            # Raised by ``argparse`` for invalid arguments.
+            return {'ok': False, 'error': 'Invalid arguments.'}
+        except Exception as exception:
+            return {'ok': False,
+                    'error': '{}: {}'.format(type(exception).__name__,
+                                             exception)}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def serve(socket_path, printer):
+    """
+    Warms up the caches and serves requests until a shutdown request.
+
+    :param socket_path: Path of the Unix domain socket to listen on.
+    :param printer:     A ``ConsolePrinter`` object.
+    """
+    from coala_quickstart.api import warm_up
+
+    warm_up()
+    server = DaemonServer(socket_path)
+    printer.print('coala-quickstart daemon listening on {!r}.'.format(
+        socket_path), color='green')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def send_request(request, socket_path, timeout=None):
+    """
+    Sends a request to the daemon and waits for the response.
+
+    :param request:     The request as a dict.
+    :param socket_path: Path of the Unix domain socket of the daemon.
+    :param timeout:     Timeout in seconds, None waits forever.
+    :return:            The response as a dict.
+    :raises DaemonError: If the daemon can't be reached or the request
+                         failed.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            client.sendall(json.dumps(request).encode() + b'\n')
+            with client.makefile('rb') as stream:
+                line = stream.readline(MAX_MESSAGE_SIZE)
+    except OSError as exception:
+        raise DaemonError('Unable to reach the daemon on {!r}: {}'.format(
+            socket_path, exception))
+    if not line:
+        raise DaemonError('The daemon closed the connection.')
+    response = json.loads(line.decode())
+    if not response.get('ok'):
+        raise DaemonError(response.get('error'))
+    return response
+
+
+def _get_client_arg_parser():
+    description = """
+Generates the .coafile of the current directory with a running
+coala-quickstart daemon. All other arguments are passed on to
+coala-quickstart.
+"""
+    arg_parser = argparse.ArgumentParser(
+        prog='coala-quickstart-client',
+        description=description,
+        add_help=True
+    )
+
+    arg_parser.add_argument(
+        '--socket', metavar='PATH',
+        help='Unix domain socket of the daemon.')
+
+    return arg_parser
+
+
+def client_main():
+    """
+    Entry point of ``coala-quickstart-client``, which forwards its command
+    line arguments but ``--socket`` to a running daemon for the current
+    directory.
+    """
+    args, arg_list = _get_client_arg_parser().parse_known_args(sys.argv[1:])
+    try:
+        response = send_request({'command': 'generate',
+                                 'project_dir': os.getcwd(),
+                                 'args': arg_list},
+                                args.socket or get_socket_path())
+    except DaemonError as exception:
+        logging.error(str(exception))
+        return 1
+    print("'{}' successfully generated.".format(response['coafile']))
+    return 0
@@ -0,0 +1,170 @@
+"""
+Instrumentation hooks of coala-quickstart.
+
+Listeners added with ``add_listener()`` are called with ``('start', span)``
+when a span starts and with ``('end', span)`` when it ends. Spans are
+emitted for:
+
+``stage``
+    The stages marked with ``Timings.timed()``.
+``extractor``
+    Every info extractor run, with the number of ``files`` and ``infos``.
+``bear_load``
+    Loading the bears, with the number of ``bears`` loaded.
+``bear``
+    Testing a bear in green mode, with its ``language``.
+``bear_run``
+    Every single bear invocation in green mode, with the ``bear``, the
+    number of ``files`` and the ``settings`` it was run on and the number
+    of ``results`` taken, up to the first one outside of the ignore ranges.
+
+Without listeners spans are not created at all, so they can be emitted
+everywhere without any cost for normal runs.
+"""
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+_listeners = []
+
+_span_ids = itertools.count(1)
+
+_local = threading.local()
+
+
+class Span:
+    """
+    A timed operation with its attributes.
+    """
+
+    def __init__(self, name, kind, attributes, parent=None):
+        """
+        :param name:       The name of the span, like a stage or bear name.
+        :param kind:       The kind of operation, like ``'stage'``.
+        :param attributes: A dict with additional information.
+        :param parent:     The span this span is nested in.
+        """
+        self.id = next(_span_ids)
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.parent = parent
+        self.start = time.time()
+        self.end = None
+        self._start_counter = time.perf_counter()
+        self.duration = None
+
+    def set(self, **attributes):
+        """
+        Adds attributes to the span, like results only known at its end.
+        """
+        self.attributes.update(attributes)
+
+    def finish(self):
+        """
+        Sets the end and duration of the span.
+        """
+        self.duration = time.perf_counter() - self._start_counter
+        self.end = self.start + self.duration
+
+    def to_dict(self):
+        """
+        :return: The span as a dict.
+        """
+        return {'id': self.id,
+                'parent': self.parent.id if self.parent else None,
+                'name': self.name,
+                'kind': self.kind,
+                'start': self.start,
+                'duration': self.duration,
+                'attributes': self.attributes}
+
+
+class NullSpan:
+    """
+    Yielded by ``span()`` if there are no listeners, ignores attributes.
+    """
+
+    def set(self, **attributes):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+def add_listener(listener):
+    """
+    :param listener: A callable taking the event, ``'start'`` or ``'end'``,
+                     and the ``Span``.
+    """
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    """
+    :param listener: A listener added with ``add_listener()``.
+    """
+    _listeners.remove(listener)
+
+
+def _emit(event, current_span):
+    for listener in list(_listeners):
+        try:
+            listener(event, current_span)
+        except Exception as exception:
+            logging.warning('Instrumentation listener {!r} failed: {}: {}'
+                            .format(listener, type(exception).__name__,
+                                    exception))
+
+
+@contextmanager
+def span(name, kind, **attributes):
+    """
+    Emits the start and end of a span around the ``with`` block, which gets
+    the ``Span`` to add attributes to. A raised exception is added as the
+    ``error`` attribute.
+
+    :param name:       The name of the span.
+    :param kind:       The kind of operation.
+    :param attributes: The attributes of the span.
+    """
+    if not _listeners:
+        yield NULL_SPAN
+        return
+    stack = _local.__dict__.setdefault('stack', [])
+    current_span = Span(name, kind, attributes, stack[-1] if stack else None)
+    stack.append(current_span)
+    _emit('start', current_span)
+    try:
+        yield current_span
+    except BaseException as exception:
+        current_span.set(error=type(exception).__name__)
+        raise
+    finally:
+        stack.pop()
+        current_span.finish()
+        _emit('end', current_span)
+
+
+def record_span(name, kind, start, duration, **attributes):
+    """
+    Emits the start and end of an operation that already finished, like
+    one that ran in another process, nested in the current span.
+
+    :param name:       The name of the span.
+    :param kind:       The kind of operation.
+    :param start:      The start of the operation, from ``time.time()``.
+    :param duration:   The duration of the operation in seconds.
+    :param attributes: The attributes of the span.
+    """
+    if not _listeners:
+        return
+    stack = _local.__dict__.setdefault('stack', [])
+    current_span = Span(name, kind, attributes, stack[-1] if stack else None)
+    current_span.start = start
+    current_span.duration = duration
+    current_span.end = start + duration
+    _emit('start', current_span)
+    _emit('end', current_span)
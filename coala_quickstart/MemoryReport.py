@@ -0,0 +1,215 @@
+"""
+Records the memory allocated in the stages of coala-quickstart with
+``tracemalloc`` for ``--memory-report``.
+
+For every stage marked with ``Timings.timed()`` the report contains the
+peak memory traced while the stage ran, the memory it retained after it
+finished and the source lines which retained the most memory. The
+allocation sites are only recorded for the top level stages, since
+comparing the ``tracemalloc`` snapshots takes seconds for big processes.
+The peaks include the snapshots taken at the stage boundaries. Python
+versions before 3.9 can't reset the traced peak, so there the peak of a
+stage includes the peaks of the stages before it. The traced peak is
+shared by all threads, so coala-quickstart doesn't overlap its stages while
+recording the report.
+"""
+import json
+import threading
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from coala_quickstart.Timings import add_recorder, remove_recorder
+
+MEMORY_REPORT_FORMAT = 1
+
+# Number of allocation sites reported per stage.
+TOP_ALLOCATION_SITES = 10
+
+_active_report = None
+
+
+def format_size(size):
+    """
+    >>> format_size(512)
+    '512 B'
+    >>> format_size(-3 * 2 ** 20)
+    '-3.0 MiB'
+
+    :param size: A size in bytes.
+    :return:     The size in human readable units.
+    """
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            break
+        size /= 1024
+    else:
+        unit = 'GiB'
+    return ('{} {}' if unit == 'B' else '{:.1f} {}').format(size, unit)
+
+
+class MemoryReport:
+    """
+    The peak and retained memory of each stage. Stages entered more than
+    once report the highest peak and the sum of the retained memory.
+    """
+
+    def __init__(self, site_depth=1):
+        """
+        :param site_depth: The nesting depth up to which the allocation sites
+                           of the stages are recorded.
+        """
+        self.records = OrderedDict()
+        self.site_depth = site_depth
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # ``Snapshot.filter_traces()`` is too slow for big snapshots, so the
+        # allocations of the report itself are skipped in the statistics.
+        self._ignored_files = {tracemalloc.__file__, __file__}
+
+    def _get_peak(self):
+        # Returns the traced peak since the last call, as far as the Python
+        # version allows.
+        peak = tracemalloc.get_traced_memory()[1]
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        return peak
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Records the memory allocated inside of the ``with`` block as stage
+        ``name``, or as a sub-step of the stage the block is nested in.
+
+        :param name: The name of the stage.
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], self._get_peak())
+        else:
+            self._get_peak()
+        frame = {'path': (stack[-1]['path'] + '/' if stack else '') + name,
+                 'peak': 0,
+                 'snapshot': (tracemalloc.take_snapshot()
+                              if len(stack) < self.site_depth else None),
+                 'current': tracemalloc.get_traced_memory()[0]}
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            peak = max(frame['peak'], self._get_peak())
+            retained = tracemalloc.get_traced_memory()[0] - frame['current']
+            statistics = (tracemalloc.take_snapshot().compare_to(
+                frame['snapshot'], 'lineno') if frame['snapshot'] else [])
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            with self._lock:
+                record = self.records.setdefault(
+                    frame['path'],
+                    {'peak': 0, 'retained': 0, 'calls': 0,
+                     'sites': OrderedDict()})
+                record['peak'] = max(record['peak'], peak)
+                record['retained'] += retained
+                record['calls'] += 1
+                for statistic in statistics:
+                    filename = statistic.traceback[0].filename
+                    if (statistic.size_diff <= 0 or
+                            filename in self._ignored_files):
+                        continue
+                    site = '{}:{}'.format(filename,
+                                          statistic.traceback[0].lineno)
+                    size, count = record['sites'].get(site, (0, 0))
+                    record['sites'][site] = (size + statistic.size_diff,
+                                             count + statistic.count_diff)
+
+    def get_rows(self):
+        """
+        :return: A list of dicts with the ``stage``, its ``peak`` and
+                 ``retained`` memory in bytes, the number of ``calls`` and
+                 the ``top`` allocation sites as dicts with ``site``,
+                 ``size`` and ``count``, sorted by peak memory, highest
+                 first.
+        """
+        with self._lock:
+            rows = [{'stage': path,
+                     'peak': record['peak'],
+                     'retained': record['retained'],
+                     'calls': record['calls'],
+                     'top': [{'site': site, 'size': size, 'count': count}
+                             for site, (size, count) in sorted(
+                                 record['sites'].items(),
+                                 key=lambda item: item[1][0],
+                                 reverse=True)[:TOP_ALLOCATION_SITES]]}
+                    for path, record in self.records.items()]
+        return sorted(rows, key=lambda row: row['peak'], reverse=True)
+
+    def print_report(self, printer, sites=3):
+        """
+        Prints the stages sorted by peak memory, each with its top
+        allocation sites.
+
+        :param printer: A ``ConsolePrinter`` object.
+        :param sites:   Number of allocation sites printed per stage.
+        """
+        rows = self.get_rows()
+        width = max([len('Stage')] + [len(row['stage']) for row in rows])
+        printer.print('{:<{width}}  {:>10}  {:>10}  {:>6}'.format(
+            'Stage', 'Peak', 'Retained', 'Calls', width=width))
+        for row in rows:
+            printer.print('{:<{width}}  {:>10}  {:>10}  {:>6}'.format(
+                row['stage'], format_size(row['peak']),
+                format_size(row['retained']), row['calls'], width=width))
+            for site in row['top'][:sites]:
+                printer.print('    {:>10}  {}'.format(
+                    format_size(site['size']), site['site']), color='cyan')
+
+    def to_dict(self):
+        """
+        :return: The report as a JSON serializable dict.
+        """
+        rows = self.get_rows()
+        return {'format': MEMORY_REPORT_FORMAT,
+                'peak': max([row['peak'] for row in rows] + [0]),
+                'stages': rows}
+
+    def write_json(self, path):
+        """
+        Writes the report to a JSON file.
+
+        :param path: The path of the file.
+        """
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def start_memory_report(site_depth=1):
+    """
+    Starts tracing the memory allocations and recording the stages marked
+    with ``Timings.timed()``.
+
+    :param site_depth: See ``MemoryReport``.
+    :return:           The ``MemoryReport`` object the stages are recorded
+                       to.
+    """
+    global _active_report
+    stop_memory_report()
+    tracemalloc.start()
+    _active_report = MemoryReport(site_depth)
+    add_recorder(_active_report)
+    return _active_report
+
+
+def stop_memory_report():
+    """
+    Stops recording the stages and tracing the memory allocations.
+
+    :return: The ``MemoryReport`` object the stages were recorded to, or None
+             if no report was started.
+    """
+    global _active_report
+    report, _active_report = _active_report, None
+    if report is not None:
+        remove_recorder(report)
+        tracemalloc.stop()
+    return report
@@ -0,0 +1,139 @@
+"""
+Exports the spans emitted by the instrumentation hooks for ``--metrics`` as
+metrics in the Prometheus textfile format, as read by the textfile
+collector of the node exporter, and as a trace with one JSON object per
+span and line.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from coala_quickstart.Hooks import add_listener, remove_listener
+
+PROMETHEUS_FILENAME = 'coala_quickstart.prom'
+TRACE_FILENAME = 'coala_quickstart_trace.jsonl'
+
+METRIC_PREFIX = 'coala_quickstart_'
+
+# The numeric span attributes exported as counters.
+COUNTED_ATTRIBUTES = ('files', 'infos', 'bears', 'results')
+
+
+def escape_label_value(value):
+    """
+    >>> print(escape_label_value('a "b"\\\\c'))
+    a \\"b\\"\\\\c
+
+    :param value: A label value.
+    :return:      The value escaped for the Prometheus text format.
+    """
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+class MetricsExporter:
+    """
+    Listens to the spans, appends every ended span to the trace file and
+    aggregates them per kind and name into metrics, written by ``close()``.
+    """
+
+    def __init__(self, directory):
+        """
+        :param directory: The directory to write the metrics and the trace
+                          to.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.prometheus_path = os.path.join(directory, PROMETHEUS_FILENAME)
+        self.trace_path = os.path.join(directory, TRACE_FILENAME)
+        self.metrics = OrderedDict()
+        self._lock = threading.Lock()
+        self._trace = open(self.trace_path, 'a')
+
+    def __call__(self, event, span):
+        if event != 'end':
+            return
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._trace.write(line + '\n')
+            metric = self.metrics.setdefault(
+                (span.kind, span.name),
+                OrderedDict([('spans', 0), ('errors', 0), ('seconds', 0.0)]))
+            metric['spans'] += 1
+            metric['errors'] += 'error' in span.attributes
+            metric['seconds'] += span.duration
+            for name in COUNTED_ATTRIBUTES:
+                value = span.attributes.get(name)
+                if isinstance(value, int) and not isinstance(value, bool):
+                    metric[name] = metric.get(name, 0) + value
+
+    def format_prometheus(self):
+        """
+        :return: The metrics in the Prometheus text format.
+        """
+        with self._lock:
+            metrics = [(key, OrderedDict(metric))
+                       for key, metric in self.metrics.items()]
+        names = OrderedDict((name, None)
+                            for _, metric in metrics for name in metric)
+        lines = []
+        for name in names:
+            full_name = METRIC_PREFIX + 'span_{}_total'.format(name)
+            lines.append('# HELP {} Sum of the {} of the spans.'.format(
+                full_name, name))
+            lines.append('# TYPE {} counter'.format(full_name))
+            for (kind, span_name), metric in metrics:
+                if name in metric:
+                    lines.append('{}{{kind="{}",name="{}"}} {}'.format(
+                        full_name, escape_label_value(kind),
+                        escape_label_value(span_name), metric[name]))
+        return ''.join(line + '\n' for line in lines)
+
+    def write_prometheus(self):
+        """
+        Writes the metrics atomically, so that a collector never reads a
+        partially written file.
+        """
+        temp_path = self.prometheus_path + '.{}.tmp'.format(os.getpid())
+        with open(temp_path, 'w') as file:
+            file.write(self.format_prometheus())
+        os.replace(temp_path, self.prometheus_path)
+
+    def close(self):
+        """
+        Writes the metrics and closes the trace file.
+        """
+        with self._lock:
+            self._trace.close()
+        self.write_prometheus()
+
+
+_active_exporter = None
+
+
+def start_metrics_export(directory):
+    """
+    Starts exporting the spans to ``directory``.
+
+    :param directory: The directory to write the metrics and the trace to.
+    :return:          The ``MetricsExporter``.
+    """
+    global _active_exporter
+    stop_metrics_export()
+    _active_exporter = MetricsExporter(directory)
+    add_listener(_active_exporter)
+    return _active_exporter
+
+
+def stop_metrics_export():
+    """
+    Stops exporting the spans and writes the metrics.
+
+    :return: The ``MetricsExporter``, or None if no export was started.
+    """
+    global _active_exporter
+    exporter, _active_exporter = _active_exporter, None
+    if exporter is not None:
+        remove_listener(exporter)
+        exporter.close()
+    return exporter
@@ -0,0 +1,84 @@
+"""
+Runs work in the background before it is known whether it is needed, like
+while the user answers the questions of the interactive mode.
+"""
+import threading
+from concurrent.futures import Future
+
+
+class Speculation:
+    """
+    Speculative results by name, each computed for some inputs. A result is
+    only used if it is requested for the same inputs, otherwise it is
+    discarded and computed again.
+
+    The work runs on daemon threads, so that discarded work doesn't delay
+    the exit of the interpreter.
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def start(self, name, inputs, function, *args):
+        """
+        Starts computing ``function(*args)`` in the background.
+
+        :param name:     The name of the result.
+        :param inputs:   The inputs the result is computed for, compared
+                         with ``==`` to the inputs it is requested for.
+        :param function: The function computing the result.
+        :param args:     The arguments of the function.
+        """
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(function(*args))
+            except BaseException as exception:
+                future.set_exception(exception)
+
+        with self._lock:
+            self._futures[name] = (inputs, future)
+        threading.Thread(target=run, name='speculation: ' + name,
+                         daemon=True).start()
+
+    def take(self, name, inputs):
+        """
+        Removes the speculative result of ``name`` and returns it if it was
+        computed for ``inputs``, waiting for it if necessary.
+
+        :param name:   The name of the result.
+        :param inputs: The inputs the result is needed for.
+        :return:       A tuple of a bool whether the result could be used and
+                       the result.
+        """
+        with self._lock:
+            speculated_inputs, future = self._futures.pop(name, (None, None))
+        if future is None or speculated_inputs != inputs:
+            return False, None
+        try:
+            return True, future.result()
+        except Exception:
+            # Computed again by the caller, which raises the error.
+            return False, None
+
+    def get(self, name, inputs, function, *args):
+        """
+        Returns the speculative result of ``name`` if it was computed for
+        ``inputs``, else ``function(*args)``.
+        """
+        used, result = self.take(name, inputs)
+        return result if used else function(*args)
+
+    def cancel(self):
+        """
+        Discards all the speculative results. Work already running
+        continues in the background.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, {}
+        for _, future in futures.values():
+            future.cancel()
@@ -0,0 +1,239 @@
+"""
+Runs the stages of coala-quickstart as a dependency graph, so that stages
+which don't depend on each other overlap.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+    )
+
+from coala_quickstart.CPUCount import get_cpu_count
+from coala_quickstart.Timings import record_stage_graph
+
+
+class Stage:
+    """
+    A function run by a ``StageGraph`` once all its dependencies finished.
+    """
+
+    def __init__(self, name, function, dependencies, process, main_thread):
+        """
+        :param name:         The name of the stage.
+        :param function:     The function, called with the results of the
+                             dependencies as positional arguments.
+        :param dependencies: The names of the stages it depends on.
+        :param process:      Whether to run the function in a separate
+                             process instead of a thread. The function,
+                             its arguments and result must be picklable.
+        :param main_thread:  Whether to run the function on the thread
+                             running the graph, which is needed for stages
+                             asking the user questions. Log records of the
+                             other threads are held back until it finishes.
+        """
+        if process and main_thread:
+            raise ValueError('Stage {!r} can\'t run in a separate process '
+                             'and on the main thread.'.format(name))
+        self.name = name
+        self.function = function
+        self.dependencies = tuple(dependencies)
+        self.process = process
+        self.main_thread = main_thread
+        self.start = None
+        self.end = None
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+def _run_timed(function, args):
+    # Runs in the worker, so that the time spent queued isn't counted.
+    start = time.perf_counter()
+    result = function(*args)
+    return result, start, time.perf_counter()
+
+
+class _HeldLogRecords(logging.Filter):
+    """
+    Holds back the log records of all threads but the current one from the
+    handlers of the root logger inside of the ``with`` block, and passes
+    them on to the handlers at its end.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.thread = threading.current_thread()
+        # The records by their id, as every handler filters them.
+        self.records = OrderedDict()
+        self.handlers = []
+
+    def filter(self, record):
+        if threading.current_thread() is self.thread:
+            return True
+        self.records.setdefault(id(record), record)
+        return False
+
+    def __enter__(self):
+        self.handlers = list(logging.getLogger().handlers)
+        for handler in self.handlers:
+            handler.addFilter(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        for handler in self.handlers:
+            handler.removeFilter(self)
+        for record in self.records.values():
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+class StageGraph:
+    """
+    Stages with their dependencies, run on threads or processes as soon as
+    the stages they depend on are finished::
+
+        graph = StageGraph()
+        graph.add('files', collect_files)
+        graph.add('info', collect_info)
+        graph.add('languages', detect_languages, ['files'])
+        results = graph.run()
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.start = None
+        self.end = None
+
+    def add(self, name, function, dependencies=(), process=False,
+            main_thread=False):
+        """
+        Adds a stage, see ``Stage``. The dependencies must have been added
+        before, so the graph can't contain cycles.
+        """
+        if name in self.stages:
+            raise ValueError('Stage {!r} already exists.'.format(name))
+        for dependency in dependencies:
+            if dependency not in self.stages:
+                raise ValueError('Stage {!r} depends on unknown stage {!r}.'
+                                 .format(name, dependency))
+        self.stages[name] = Stage(name, function, dependencies, process,
+                                  main_thread)
+
+    def run(self, jobs=None):
+        """
+        Runs all the stages. The stages to run on the main thread are run one
+        after another in the order they were added, while the others run in
+        the background. If a stage raises an exception, no further stages
+        are started and the exception is raised without waiting for the
+        running stages, which are left to finish in the background.
+
+        :param jobs: Maximum number of stages running concurrently on
+                     threads, None runs all stages which are ready.
+        :return:     A dict with the stage names as keys and their results
+                     as values.
+        """
+        results = {}
+        pending = OrderedDict(self.stages)
+        running = {}
+        finished = False
+        self.start = time.perf_counter()
+        threads = ThreadPoolExecutor(max_workers=jobs or len(self.stages)
+                                     or 1)
+        processes = None
+        try:
+            while pending or running:
+                main_stage = None
+                for stage in list(pending.values()):
+                    if not all(dependency in results
+                               for dependency in stage.dependencies):
+                        continue
+                    if stage.main_thread:
+                        main_stage = main_stage or stage
+                        continue
+                    del pending[stage.name]
+                    if stage.process and processes is None:
+                        processes = ProcessPoolExecutor(
+                            max_workers=get_cpu_count())
+                    executor = processes if stage.process else threads
+                    future = executor.submit(
+                        _run_timed, stage.function,
+                        [results[dependency]
+                         for dependency in stage.dependencies])
+                    running[future] = stage
+
+                if main_stage is not None:
+                    del pending[main_stage.name]
+                    with _HeldLogRecords():
+                        results[main_stage.name], main_stage.start, \
+                            main_stage.end = _run_timed(
+                                main_stage.function,
+                                [results[dependency] for dependency
+                                 in main_stage.dependencies])
+                elif not running:
+                    break
+
+                # Stages finished while a main thread stage ran are only
+                # collected, so that the next one starts right away.
+                done, _ = wait(running,
+                               timeout=0 if main_stage else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    results[stage.name], stage.start, stage.end = (
+                        future.result())
+            finished = True
+        finally:
+            # Running stages, like ones blocked by the exception of another
+            # stage, aren't waited for.
+            threads.shutdown(wait=finished)
+            if processes is not None:
+                processes.shutdown(wait=finished)
+            self.end = time.perf_counter()
+        record_stage_graph(self)
+        return results
+
+    def get_critical_path(self):
+        """
+        :return: The names of the chain of dependent stages that took the
+                 longest, which bounds the time the graph takes however many
+                 stages run concurrently.
+        """
+        finish = {}
+        previous = {}
+        for stage in self.stages.values():
+            if stage.end is None:
+                continue
+            before = max((dependency for dependency in stage.dependencies
+                          if dependency in finish),
+                         key=finish.get, default=None)
+            previous[stage.name] = before
+            finish[stage.name] = stage.duration + finish.get(before, 0)
+        name = max(finish, key=finish.get, default=None)
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1]
+
+    def get_report(self):
+        """
+        :return: A dict with the ``wall`` time the graph took, the
+                 ``sequential`` time the stages would have taken one after
+                 another, the ``critical_path`` time and the names of the
+                 ``critical_stages``, in seconds.
+        """
+        critical_stages = self.get_critical_path()
+        return {'wall': self.end - self.start,
+                'sequential': sum(stage.duration
+                                  for stage in self.stages.values()
+                                  if stage.end is not None),
+                'critical_path': sum(self.stages[name].duration
+                                     for name in critical_stages),
+                'critical_stages': critical_stages}
@@ -0,0 +1,235 @@
+"""
+Records the wall and CPU time spent in the stages of coala-quickstart for
+``--timings``.
+
+The stages are marked with ``timed()``, which does nothing unless
+``start_timings()`` was called or another recorder was added with
+``add_recorder()``, so the stages can be marked everywhere without any cost
+for normal runs. Stages marked inside of other stages are recorded as their
+sub-steps, as ``stage/sub-step``. The stages are also emitted as spans of
+the instrumentation hooks in ``coala_quickstart.Hooks``.
+
+The CPU time of a stage is the time of the thread it runs on, so stages
+running concurrently aren't charged each other's time, plus the time other
+processes spent on its behalf, see ``add_cpu_time()``. Python versions
+before 3.7 only measure the time of the whole process.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+
+from coala_quickstart.Hooks import span
+
+TIMINGS_FORMAT = 1
+
+_cpu_time = getattr(time, 'thread_time', time.process_time)
+
+_active_timings = None
+
+# Objects with a ``stage(name)`` context manager, entered in this order.
+_recorders = []
+
+
+class Timings:
+    """
+    The time spent in each stage, summed up over all the times the stage was
+    entered.
+    """
+
+    def __init__(self):
+        self.records = OrderedDict()
+        # The report of the last ``StageGraph`` run, see
+        # ``record_stage_graph()``.
+        self.stage_graph = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Records the time spent inside of the ``with`` block as stage
+        ``name``, or as a sub-step of the stage the block is nested in.
+
+        :param name: The name of the stage.
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        # The name and the CPU time of other processes of every stage.
+        frame = [name, 0.0]
+        stack.append(frame)
+        path = '/'.join(name for name, _ in stack)
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = _cpu_time() - cpu_start + frame[1]
+            stack.pop()
+            with self._lock:
+                record = self.records.setdefault(path, [0.0, 0.0, 0])
+                record[0] += wall
+                record[1] += cpu
+                record[2] += 1
+
+    def add_cpu_time(self, seconds):
+        """
+        Adds CPU time to the stages the current thread is in.
+
+        :param seconds: The CPU time in seconds.
+        """
+        for frame in self._local.__dict__.get('stack', ()):
+            frame[1] += seconds
+
+    def get_rows(self):
+        """
+        :return: A list of dicts with the ``stage``, ``wall`` and ``cpu``
+                 time in seconds and the number of ``calls`` of each stage,
+                 sorted by wall time, longest first.
+        """
+        with self._lock:
+            rows = [{'stage': path, 'wall': wall, 'cpu': cpu, 'calls': calls}
+                    for path, (wall, cpu, calls) in self.records.items()]
+        return sorted(rows, key=lambda row: row['wall'], reverse=True)
+
+    def get_total(self):
+        """
+        :return: The wall time of all the top level stages in seconds.
+        """
+        with self._lock:
+            return sum(wall for path, (wall, _, _) in self.records.items()
+                       if '/' not in path)
+
+    def print_report(self, printer):
+        """
+        Prints the stages sorted by wall time.
+
+        :param printer: A ``ConsolePrinter`` object.
+        """
+        rows = self.get_rows()
+        total = self.get_total() or 1.0
+        width = max([len('Stage')] + [len(row['stage']) for row in rows])
+        printer.print('{:<{width}}  {:>9}  {:>9}  {:>6}  {:>6}'.format(
+            'Stage', 'Wall (s)', 'CPU (s)', 'Calls', '%', width=width))
+        for row in rows:
+            printer.print(
+                '{:<{width}}  {:>9.3f}  {:>9.3f}  {:>6}  {:>6.1f}'.format(
+                    row['stage'], row['wall'], row['cpu'], row['calls'],
+                    100 * row['wall'] / total, width=width))
+        if self.stage_graph:
+            printer.print()
+            printer.print(
+                'Stage graph: {:.3f}s wall, {:.3f}s sequential, critical path '
+                '{:.3f}s: {}'.format(
+                    self.stage_graph['wall'],
+                    self.stage_graph['sequential'],
+                    self.stage_graph['critical_path'],
+                    ' -> '.join(self.stage_graph['critical_stages'])))
+
+    def to_dict(self):
+        """
+        :return: The timings as a JSON serializable dict.
+        """
+        return {'format': TIMINGS_FORMAT,
+                'total': self.get_total(),
+                'stages': self.get_rows(),
+                'stage_graph': self.stage_graph}
+
+    def write_json(self, path):
+        """
+        Writes the timings to a JSON file.
+
+        :param path: The path of the file.
+        """
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def start_timings():
+    """
+    Starts recording the stages marked with ``timed()``.
+
+    :return: The ``Timings`` object the stages are recorded to.
+    """
+    global _active_timings
+    stop_timings()
+    _active_timings = Timings()
+    # The timings are entered last, so that they don't include the overhead
+    # of the other recorders.
+    _recorders.append(_active_timings)
+    return _active_timings
+
+
+def stop_timings():
+    """
+    Stops recording the stages.
+
+    :return: The ``Timings`` object the stages were recorded to, or None if
+             no timings were started.
+    """
+    global _active_timings
+    timings, _active_timings = _active_timings, None
+    if timings is not None:
+        _recorders.remove(timings)
+    return timings
+
+
+def record_stage_graph(graph):
+    """
+    Adds the critical path report of a ``StageGraph`` run to the timings,
+    if timings were started.
+
+    :param graph: The ``StageGraph`` after it ran.
+    """
+    if _active_timings is not None:
+        _active_timings.stage_graph = graph.get_report()
+
+
+def add_cpu_time(seconds):
+    """
+    Adds the CPU time other processes spent on behalf of the current thread,
+    like the bear tests run on a process pool, to the stages it is in, if
+    timings were started.
+
+    :param seconds: The CPU time in seconds.
+    """
+    if _active_timings is not None:
+        _active_timings.add_cpu_time(seconds)
+
+
+def add_recorder(recorder):
+    """
+    Adds a recorder which enters its ``stage(name)`` context manager for
+    every stage marked with ``timed()``.
+
+    :param recorder: The recorder.
+    """
+    _recorders.insert(0, recorder)
+
+
+def remove_recorder(recorder):
+    """
+    Removes a recorder added with ``add_recorder()``.
+
+    :param recorder: The recorder.
+    """
+    _recorders.remove(recorder)
+
+
+@contextmanager
+def timed(name, kind='stage', **attributes):
+    """
+    Records the time spent inside of the ``with`` block as stage ``name``
+    if timings were started with ``start_timings()``, and passes the stage
+    on to the recorders added with ``add_recorder()``. The block gets the
+    span emitted for the stage, see ``Hooks.span()``.
+
+    :param name:       The name of the stage.
+    :param kind:       The kind of the span.
+    :param attributes: The attributes of the span.
+    """
+    with ExitStack() as stack:
+        for recorder in list(_recorders):
+            stack.enter_context(recorder.stage(name))
+        yield stack.enter_context(span(name, kind, **attributes))
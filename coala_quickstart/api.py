@@ -0,0 +1,229 @@
+"""
+Library interface to generate coala configurations without the command
+line interface::
+
+    session = QuickstartSession('/path/to/project')
+    settings = session.run()
+    settings['all.Python']['bears']  # e.g. 'PycodestyleBear'
+"""
+import os
+from collections import OrderedDict
+
+from coala_quickstart.coala_quickstart import _get_arg_parser
+
+
+class QuickstartSession:
+    """
+    Generates the configuration of one project. All the options and
+    intermediate results are kept on the session object, nothing is asked
+    or printed and the working directory is never changed, so sessions of
+    different projects can be run concurrently in threads. A single session
+    must not be shared between threads.
+
+    The stages can be run one after another to inspect or adjust their
+    results, every stage runs the stages it depends on if needed. ``run()``
+    runs the independent stages concurrently instead.
+    """
+
+    def __init__(self,
+                 project_dir,
+                 incomplete_sections=False,
+                 filter_by_capabilities=True,
+                 time_budget=None):
+        """
+        :param project_dir:
+            The project directory.
+        :param incomplete_sections:
+            Keep bears with non optional settings and don't fill in any
+            settings, like ``--allow-incomplete-sections``.
+        :param filter_by_capabilities:
+            Filter the bears by their capabilities, unlike
+            ``--no-filter-by-capabilities``.
+        :param time_budget:
+            Time budget in seconds for running coala with the generated
+            configuration, like ``--time-budget``.
+        """
+        from pyprint.NullPrinter import NullPrinter
+
+        self.project_dir = os.path.abspath(project_dir)
+        self.incomplete_sections = incomplete_sections
+        self.filter_by_capabilities = filter_by_capabilities
+        self.time_budget = time_budget
+        self.printer = NullPrinter()
+
+        self.project_files = None
+        self.ignore_globs = None
+        self.used_languages = None
+        self.extracted_info = None
+        self.all_bears = None
+        self.relevant_bears = None
+        self.settings = None
+
+    def get_args(self):
+        """
+        :return: The options of the session as the arguments parsed by the
+                 command line interface in non interactive mode.
+        """
+        arg_list = ['--non-interactive']
+        if self.incomplete_sections:
+            arg_list.append('--allow-incomplete-sections')
+        if not self.filter_by_capabilities:
+            arg_list.append('--no-filter-by-capabilities')
+        if self.time_budget is not None:
+            arg_list += ['--time-budget', str(self.time_budget)]
+        return _get_arg_parser().parse_args(arg_list)
+
+    def collect_project_files(self):
+        """
+        :return: A tuple of the list of project files and the list of
+                 ignore globs, read from the ``.gitignore`` files.
+        """
+        if self.project_files is None:
+            from coala_quickstart.generation.FileGlobs import (
+                get_project_files)
+            if not os.path.isdir(self.project_dir):
+                raise FileNotFoundError('No such project directory: {!r}'
+                                        .format(self.project_dir))
+            self.project_files, self.ignore_globs = get_project_files(
+                None, self.printer, self.project_dir, None, True)
+        return self.project_files, self.ignore_globs
+
+    def detect_languages(self):
+        """
+        :return: A list of tuples of the used languages and their usage in
+                 percent, sorted by usage.
+        """
+        if self.used_languages is None:
+            from coala_quickstart.generation.Project import get_used_languages
+            project_files, _ = self.collect_project_files()
+            self.used_languages = list(get_used_languages(project_files))
+        return self.used_languages
+
+    def collect_info(self):
+        """
+        :return: An ``InfoStore`` of the information extracted from the
+                 project files.
+        """
+        if self.extracted_info is None:
+            from coala_quickstart.generation.InfoCollector import (
+                collect_info)
+            self.extracted_info = collect_info(self.project_dir)
+        return self.extracted_info
+
+    def load_bears(self):
+        """
+        :return: A tuple of two dicts with section names as keys and lists
+                 of all the local and global bear classes as values.
+        """
+        if self.all_bears is None:
+            from coala_quickstart.generation.Bears import load_all_bears
+            self.all_bears = load_all_bears(args=self.get_args(),
+                                            project_dir=self.project_dir)
+        return self.all_bears
+
+    def select_bears(self):
+        """
+        :return: A dict with language name as key and a set of bear classes
+                 as value.
+        """
+        if self.relevant_bears is None:
+            from coala_quickstart.generation.Bears import (
+                filter_relevant_bears,
+                get_non_optional_settings_bears,
+                remove_unusable_bears,
+                )
+            project_files, _ = self.collect_project_files()
+            relevant_bears = filter_relevant_bears(
+                list(self.detect_languages()), self.printer, None,
+                self.collect_info(), project_files=project_files,
+                args=self.get_args(), all_bears=self.load_bears())
+            if not self.incomplete_sections:
+                remove_unusable_bears(
+                    relevant_bears,
+                    get_non_optional_settings_bears(relevant_bears))
+            self.relevant_bears = relevant_bears
+        return self.relevant_bears
+
+    def generate_settings(self):
+        """
+        :return: A dict with section name as key and a coala ``Section``
+                 object as value.
+        """
+        if self.settings is None:
+            from coala_quickstart.generation.Settings import (
+                generate_settings)
+            project_files, ignore_globs = self.collect_project_files()
+            self.settings = generate_settings(
+                self.project_dir, project_files, ignore_globs,
+                self.select_bears(), self.collect_info(),
+                self.incomplete_sections)
+        return self.settings
+
+    def run_concurrently(self):
+        """
+        Runs the stages up to the bear selection as a ``StageGraph``, so the
+        info extraction and bear loading overlap with the file scan and
+        language detection.
+
+        :return: The ``StageGraph`` after it ran.
+        """
+        from coala_quickstart.StageGraph import StageGraph
+
+        graph = StageGraph()
+        graph.add('file scanning', self.collect_project_files)
+        graph.add('language detection',
+                  lambda project_files: self.detect_languages(),
+                  ['file scanning'])
+        graph.add('info extraction', self.collect_info)
+        graph.add('bear loading', self.load_bears)
+        graph.add('bear selection', lambda *results: self.select_bears(),
+                  ['language detection', 'info extraction', 'bear loading'])
+        graph.run()
+        return graph
+
+    def run(self):
+        """
+        Runs all the stages, see ``run_concurrently()``.
+
+        :return: The generated configuration as a dict with the section
+                 names as keys and dicts of setting names and values as
+                 values, in the order they are written to a coafile.
+        """
+        if self.settings is None:
+            self.run_concurrently()
+        return OrderedDict(
+            (name, OrderedDict((setting.key, str(setting.value))
+                               for setting in section.contents.values()))
+            for name, section in self.generate_settings().items())
+
+    def write_coafile(self):
+        """
+        Writes the generated configuration to the ``.coafile`` of the
+        project, or to ``.coafile.new`` if it already exists.
+
+        :return: The path of the written file.
+        """
+        from coala_quickstart.generation.Settings import write_coafile
+        return write_coafile(self.printer, self.project_dir,
+                             self.generate_settings())
+
+
+def warm_up():
+    """
+    Imports the bears and loads the caches used by sessions, so that the
+    first session of a long running process, or of processes forked
+    afterwards, doesn't have to.
+    """
+    from coala_quickstart.generation.BearCatalog import get_default_catalog
+    from coala_quickstart.generation.EntryPoints import (
+        get_registered_info_extractors, use_cached_bear_dirs)
+    from coalib.settings.ConfigurationGathering import (
+        collect_all_bears_from_sections, load_configuration)
+
+    get_registered_info_extractors()
+    get_default_catalog()
+    with use_cached_bear_dirs():
+        sections, _ = load_configuration(
+            None, args=_get_arg_parser().parse_args(['--non-interactive']),
+            silent=True)
+        collect_all_bears_from_sections(sections)
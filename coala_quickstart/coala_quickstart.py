@@ -3,39 +3,20 @@ import logging
 import os
 import sys
 
-from pyprint.ConsolePrinter import ConsolePrinter
-
-from coala_utils.FilePathCompleter import FilePathCompleter
-from coala_utils.Question import ask_question
-
 from coala_quickstart import __version__
-from coala_quickstart.interaction.Logo import print_welcome_message
-from coala_quickstart.generation.InfoCollector import collect_info
-from coala_quickstart.generation.Project import (
-    ask_to_select_languages,
-    get_used_languages,
-    print_used_languages,
-    valid_path,
-    )
-from coala_quickstart.generation.FileGlobs import get_project_files
-from coala_quickstart.Strings import PROJECT_DIR_HELP
-from coala_quickstart.generation.Bears import (
-    filter_relevant_bears,
-    print_relevant_bears,
-    get_non_optional_settings_bears,
-    remove_unusable_bears,
-)
-from coala_quickstart.generation.Settings import (
-    generate_settings, write_coafile)
-from coala_quickstart.generation.SettingsClass import (
-    collect_bear_settings)
-from coala_quickstart.green_mode.green_mode_core import green_mode
+
+# The subsystems used by the different stages of ``main()`` are imported
+# lazily inside of it, so that ``--help`` and ``--version`` don't pay for
+# importing coala and the bears.
 
 MAX_ARGS_GREEN_MODE = 5
 MAX_VALUES_GREEN_MODE = 5
 
 
 def _get_arg_parser():
+    from coala_quickstart.green_mode.search_strategies import (
+        SEARCH_STRATEGIES)
+
     description = """
 coala-quickstart automatically creates a .coafile for use by coala.
 """
@@ -82,35 +63,195 @@ coala-quickstart automatically creates a .coafile for use by coala.
         help='Maximum number of values to optional settings allowed to be'
              ' checked by green_mode for each bear.')
 
+    arg_parser.add_argument(
+        '--time-budget', type=float, metavar='SECONDS',
+        help='Measure the cost of the bears on a sample of the project files'
+             ' and drop or replace bears so that running coala with the'
+             ' generated config is estimated to take at most SECONDS.')
+
+    arg_parser.add_argument(
+        '--batch', nargs='+', metavar='DIR',
+        help='Generate the coafiles of several project directories in a'
+             ' process pool, non-interactively.')
+
+    arg_parser.add_argument(
+        '--manifest', metavar='FILE',
+        help='Batch mode with the project directories listed in FILE, one'
+             ' per line.')
+
+    arg_parser.add_argument(
+        '-j', '--jobs', type=int, default=0,
+        help='Number of processes used in batch mode and to test the bears'
+             ' in green mode. 0 means one per CPU.')
+
+    arg_parser.add_argument(
+        '--search-strategy', default='exhaustive',
+        choices=list(SEARCH_STRATEGIES),
+        help='How green mode chooses the combinations of setting values to'
+             ' test the bears with: all of them, each setting on its own,'
+             ' binary searching max_ and min_ settings or skipping the'
+             ' combinations less permissive than ones already failing.')
+
+    arg_parser.add_argument(
+        '--probing', default='file-major',
+        choices=['file-major', 'combination-major'],
+        help='Find the green settings of every file in green mode, or only'
+             ' the ones green for all files, dropping a combination of'
+             ' settings at the first file it fails on.')
+
+    arg_parser.add_argument(
+        '--infer-rule-codes', const=True, action='store_const',
+        help='Infer the rules to ignore or select in green mode from the'
+             ' results of the bears run without them and verify them with'
+             ' one more run, instead of testing every rule code.')
+
+    arg_parser.add_argument(
+        '--report', metavar='FILE',
+        help='Write a JSON summary of the batch with per project timings'
+             ' and failures to FILE.')
+
+    arg_parser.add_argument(
+        '--daemon', const=True, action='store_const',
+        help='Keep running and serve requests of coala-quickstart-client'
+             ' over a Unix domain socket.')
+
+    arg_parser.add_argument(
+        '--socket', metavar='PATH',
+        help='Unix domain socket used by --daemon.')
+
+    arg_parser.add_argument(
+        '--timings', nargs='?', const='', metavar='FILE',
+        help='Print the wall and CPU time spent in each stage and write'
+             ' them as JSON to FILE if given.')
+
+    arg_parser.add_argument(
+        '--memory-report', nargs='?', const='', metavar='FILE',
+        help='Trace the memory allocations and print the peak and retained'
+             ' memory of each stage with its top allocation sites, and'
+             ' write them as JSON to FILE if given.')
+
+    arg_parser.add_argument(
+        '--metrics', metavar='DIR',
+        help='Write metrics of the stages, info extractors and bear runs in'
+             ' the Prometheus textfile format and a JSON lines trace of'
+             ' them to DIR.')
+
     return arg_parser
 
 
+def _report_stages(args, printer):
+    """
+    Stops recording the timings and memory started for ``--timings`` and
+    ``--memory-report``, prints them and writes them to the files given
+    with the options. Writes the metrics of ``--metrics``.
+
+    :param args:    The parsed arguments.
+    :param printer: A ``ConsolePrinter`` object.
+    """
+    from coala_quickstart.MemoryReport import stop_memory_report
+    from coala_quickstart.MetricsExporter import stop_metrics_export
+    from coala_quickstart.Timings import stop_timings
+
+    try:
+        stop_metrics_export()
+    except OSError as exception:
+        logging.error('Unable to write the metrics to {!r}: {}'.format(
+            args.metrics, exception))
+
+    for name, report, path in (
+            ('timings', stop_timings(), args.timings),
+            ('memory report', stop_memory_report(), args.memory_report)):
+        if report is None:
+            continue
+        printer.print()
+        report.print_report(printer)
+        if path:
+            try:
+                report.write_json(path)
+            except OSError as exception:
+                logging.error('Unable to write the {} to {!r}: {}'.format(
+                    name, path, exception))
+
+
 def main():
-    global MAX_ARGS_GREEN_MODE, MAX_VALUES_GREEN_MODE
     arg_parser = _get_arg_parser()
     args = arg_parser.parse_args()
 
+    from pyprint.ConsolePrinter import ConsolePrinter
+
     logging.basicConfig(stream=sys.stdout)
     printer = ConsolePrinter()
     logging.getLogger(__name__)
 
+    if args.daemon:
+        from coala_quickstart.Daemon import get_socket_path, serve
+        serve(args.socket or get_socket_path(), printer)
+        return
+
+    if args.batch or args.manifest:
+        from coala_quickstart.Batch import main_batch
+        if args.green_mode:
+            logging.warning('--green-mode is not supported in batch mode '
+                            'and will be ignored.')
+            args.green_mode = None
+        sys.exit(main_batch(args, printer))
+
+    from coala_quickstart.Timings import start_timings, timed
+
+    if args.timings is not None:
+        start_timings()
+    if args.memory_report is not None:
+        from coala_quickstart.MemoryReport import start_memory_report
+        start_memory_report()
+    if args.metrics:
+        from coala_quickstart.MetricsExporter import start_metrics_export
+        try:
+            start_metrics_export(args.metrics)
+        except OSError as exception:
+            logging.error('Unable to write the metrics to {!r}: {}'.format(
+                args.metrics, exception))
+
     fpc = None
     project_dir = os.getcwd()
+    max_args = MAX_ARGS_GREEN_MODE
+    max_values = MAX_VALUES_GREEN_MODE
 
     if args.green_mode:
         args.no_filter_by_capabilities = None
         args.incomplete_sections = None
         if args.max_args:
-            MAX_ARGS_GREEN_MODE = args.max_args
+            max_args = args.max_args
         if args.max_values:
-            MAX_VALUES_GREEN_MODE = args.max_values
+            max_values = args.max_values
 
     if not args.green_mode and (args.max_args or args.max_values):
         logging.warning(' --max-args and --max-values can be used '
                         'only with --green-mode. The arguments will '
                         'be ignored.')
 
+    speculation = None
     if not args.non_interactive and not args.green_mode:
+        from coala_quickstart.Speculation import Speculation
+        from coala_quickstart.generation.Bears import load_all_bears
+        from coala_quickstart.generation.FileGlobs import (
+            speculate_project_files)
+        from coala_quickstart.generation.InfoCollector import collect_info
+
+        # The project directory is most likely the default, so it is
+        # scanned while the user answers the questions. The results are
+        # discarded if another directory is chosen.
+        speculation = Speculation()
+        speculation.start('project files', project_dir,
+                          speculate_project_files, project_dir)
+        speculation.start('info', project_dir, collect_info, project_dir)
+        speculation.start('bears', None, load_all_bears, arg_parser, args)
+
+        from coala_utils.FilePathCompleter import FilePathCompleter
+        from coala_utils.Question import ask_question
+        from coala_quickstart.interaction.Logo import print_welcome_message
+        from coala_quickstart.generation.Project import valid_path
+        from coala_quickstart.Strings import PROJECT_DIR_HELP
+
         fpc = FilePathCompleter()
         fpc.activate()
         print_welcome_message(printer)
@@ -121,31 +262,101 @@ def main():
             typecast=valid_path)
         fpc.deactivate()
 
-    project_files, ignore_globs = get_project_files(
-        None,
-        printer,
-        project_dir,
-        fpc,
-        args.non_interactive)
+    from coala_quickstart.StageGraph import StageGraph
+    from coala_quickstart.generation.Bears import (
+        filter_relevant_bears,
+        load_all_bears,
+        print_relevant_bears,
+        get_non_optional_settings_bears,
+        remove_unusable_bears,
+        )
+    from coala_quickstart.generation.FileGlobs import get_project_files
+    from coala_quickstart.generation.InfoCollector import collect_info
+    from coala_quickstart.generation.Project import (
+        ask_to_select_languages,
+        get_used_languages,
+        )
+
+    def scan_files():
+        with timed('file scanning'):
+            return get_project_files(
+                None,
+                printer,
+                project_dir,
+                fpc,
+                args.non_interactive,
+                speculation)
+
+    def detect_languages(project_files_and_globs):
+        with timed('language detection'):
+            used_languages = list(get_used_languages(
+                project_files_and_globs[0]))
+        return ask_to_select_languages(used_languages, printer,
+                                       args.non_interactive)
+
+    def extract_info():
+        with timed('info extraction'):
+            if speculation is None:
+                return collect_info(project_dir)
+            return speculation.get('info', project_dir, collect_info,
+                                   project_dir)
 
-    used_languages = list(get_used_languages(project_files))
-    used_languages = ask_to_select_languages(used_languages, printer,
-                                             args.non_interactive)
+    def load_bears():
+        if speculation is None:
+            return load_all_bears(arg_parser, args)
+        return speculation.get('bears', None, load_all_bears, arg_parser,
+                               args)
 
-    extracted_information = collect_info(project_dir)
+    def select_bears(project_files_and_globs, used_languages,
+                     extracted_information, all_bears):
+        with timed('bear selection'):
+            return filter_relevant_bears(
+                used_languages, printer, arg_parser, extracted_information,
+                project_files=project_files_and_globs[0],
+                all_bears=all_bears)
 
-    relevant_bears = filter_relevant_bears(
-        used_languages, printer, arg_parser, extracted_information)
+    # Info extraction and bear loading don't depend on the project files,
+    # so they run while the files are scanned and the user is asked about
+    # them on the main thread. The memory report attributes the traced
+    # peak to the stages, so it runs them one after another instead.
+    serial = args.memory_report is not None
+    graph = StageGraph()
+    graph.add('file scanning', scan_files, main_thread=True)
+    graph.add('language detection', detect_languages, ['file scanning'],
+              main_thread=True)
+    graph.add('info extraction', extract_info, main_thread=serial)
+    graph.add('bear loading', load_bears, main_thread=serial)
+    graph.add('bear selection', select_bears,
+              ['file scanning', 'language detection', 'info extraction',
+               'bear loading'],
+              main_thread=True)
+    results = graph.run()
+    if speculation is not None:
+        speculation.cancel()
+
+    project_files, ignore_globs = results['file scanning']
+    extracted_information = results['info extraction']
+    relevant_bears = results['bear selection']
 
     if args.green_mode:
-        bear_settings_obj = collect_bear_settings(relevant_bears)
-        green_mode(
-            project_dir, ignore_globs, relevant_bears, bear_settings_obj,
-            MAX_ARGS_GREEN_MODE,
-            MAX_VALUES_GREEN_MODE,
-            project_files,
-            printer,
-        )
+        from coala_quickstart.generation.SettingsClass import (
+            collect_bear_settings)
+        from coala_quickstart.green_mode.green_mode_core import green_mode
+
+        with timed('green mode'):
+            bear_settings_obj = collect_bear_settings(relevant_bears)
+            green_mode(
+                project_dir, ignore_globs, relevant_bears, bear_settings_obj,
+                max_args,
+                max_values,
+                project_files,
+                printer,
+                args.jobs,
+                args.search_strategy,
+                args.probing,
+                args.infer_rule_codes,
+            )
+        _report_stages(args, printer)
         exit()
 
     print_relevant_bears(printer, relevant_bears)
@@ -155,12 +366,19 @@ def main():
         remove_unusable_bears(relevant_bears, unusable_bears)
         print_relevant_bears(printer, relevant_bears, 'usable')
 
-    settings = generate_settings(
-        project_dir,
-        project_files,
-        ignore_globs,
-        relevant_bears,
-        extracted_information,
-        args.incomplete_sections)
+    from coala_quickstart.generation.Settings import (
+        generate_settings, write_coafile)
+
+    with timed('settings filling'):
+        settings = generate_settings(
+            project_dir,
+            project_files,
+            ignore_globs,
+            relevant_bears,
+            extracted_information,
+            args.incomplete_sections)
+
+    with timed('writing'):
+        write_coafile(printer, project_dir, settings)
 
-    write_coafile(printer, project_dir, settings)
+    _report_stages(args, printer)
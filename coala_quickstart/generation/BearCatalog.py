@@ -0,0 +1,185 @@
+import inspect
+import json
+import logging
+import os
+import threading
+
+from coala_quickstart import VERSION
+
+
+CATALOG_FILENAME = 'bear_catalog.json'
+
+# Increase this whenever the layout or the meaning of the stored metadata
+# changes, so that existing catalogs get rebuilt.
+CATALOG_FORMAT = 1
+
+
+def get_cache_dir():
+    """
+    Returns the directory where coala-quickstart keeps its caches. It can
+    be overridden with the ``COALA_QUICKSTART_CACHE_DIR`` environment
+    variable.
+    """
+    cache_dir = os.environ.get('COALA_QUICKSTART_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+
+    import appdirs
+    return appdirs.user_cache_dir('coala-quickstart', version=VERSION)
+
+
+def get_bear_id(bear):
+    """
+    :param bear: A bear class.
+    :return:     The fully qualified name identifying the bear class in the
+                 catalog.
+    """
+    return bear.__module__ + '.' + bear.__qualname__
+
+
+def get_bear_files(bear):
+    """
+    Returns the source files the metadata of a bear is derived from, i.e.
+    the module of the bear and the modules of all its ``BEAR_DEPS``.
+
+    :param bear: A bear class.
+    :return:     A set of file paths, or None if some bear is not defined
+                 in a file.
+    """
+    files = set()
+    to_visit = [bear]
+    while to_visit:
+        current = to_visit.pop()
+        try:
+            files.add(os.path.abspath(inspect.getfile(current)))
+        except TypeError:
+            return None
+        to_visit += [dep for dep in current.BEAR_DEPS]
+    return files
+
+
+def get_file_stamp(path):
+    """
+    :return: A list of modification time and size of the given file, or
+             None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class BearCatalog:
+    """
+    Persistent catalog of metadata about bear classes, which is expensive
+    to compute as it requires introspecting the bears and their
+    dependencies. Entries are keyed by ``get_bear_id`` and are invalidated
+    when one of the source files of the bear changes, so they can be
+    looked up without importing the bear. A catalog can be shared by
+    several threads.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path:
+            Path to the JSON file backing the catalog. If None, the catalog
+            is only kept in memory.
+        """
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.RLock()
+        if path:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as catalog_file:
+                data = json.load(catalog_file)
+        except (OSError, ValueError):
+            return
+        if (data.get('format') == CATALOG_FORMAT and
+                data.get('version') == VERSION):
+            with self._lock:
+                self.entries = data.get('bears', {})
+
+    def save(self):
+        """
+        Writes the catalog to disk if it was modified.
+        """
+        with self._lock:
+            if not self.path or not self.dirty:
+                return
+            data = {'format': CATALOG_FORMAT,
+                    'version': VERSION,
+                    'bears': self.entries}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temporary_path = self.path + '.tmp' + str(os.getpid())
+                with open(temporary_path, 'w') as catalog_file:
+                    json.dump(data, catalog_file)
+                os.replace(temporary_path, self.path)
+            except OSError:
+                logging.warning('Unable to write the bear catalog to {!r}. '
+                                'Continuing without caching.'
+                                .format(self.path))
+                return
+            self.dirty = False
+
+    def get(self, bear_id, key):
+        """
+        Returns the metadata stored under ``key`` for a bear, if the stored
+        value is still valid. No bear module is imported for this.
+
+        :param bear_id: The identifier of the bear, see ``get_bear_id``.
+        :param key:     Name of the metadata.
+        :return:        The metadata or None.
+        """
+        with self._lock:
+            entry = self.entries.get(bear_id)
+            if not entry or key not in entry['metadata']:
+                return None
+            for path, stamp in entry['files'].items():
+                if get_file_stamp(path) != stamp:
+                    del self.entries[bear_id]
+                    self.dirty = True
+                    return None
+            return entry['metadata'][key]
+
+    def set(self, bear, key, value):
+        """
+        Stores metadata about a bear class.
+
+        :param bear:  The bear class.
+        :param key:   Name of the metadata.
+        :param value: JSON serializable metadata.
+        """
+        files = get_bear_files(bear)
+        if files is None:
+            return
+        bear_id = get_bear_id(bear)
+        stamps = {path: get_file_stamp(path) for path in files}
+        with self._lock:
+            entry = self.entries.get(bear_id)
+            if not entry or entry['files'] != stamps:
+                entry = {'files': stamps, 'metadata': {}}
+                self.entries[bear_id] = entry
+            entry['metadata'][key] = value
+            self.dirty = True
+
+
+_default_catalog = None
+
+
+def get_default_catalog():
+    """
+    Returns the catalog stored in the coala-quickstart cache directory,
+    which is loaded only once per process, unless the cache directory
+    changes.
+    """
+    global _default_catalog
+    path = os.path.join(get_cache_dir(), CATALOG_FILENAME)
+    if _default_catalog is None or _default_catalog.path != path:
+        _default_catalog = BearCatalog(path)
+    return _default_catalog
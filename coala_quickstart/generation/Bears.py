@@ -1,24 +1,67 @@
 import copy
+import os
 import random
 import re
+from argparse import Namespace
 from collections import defaultdict
 
 
 from coala_quickstart.Constants import (
     IMPORTANT_BEAR_LIST, ALL_CAPABILITIES, DEFAULT_CAPABILTIES)
 from coala_quickstart.Strings import BEAR_HELP
+from coala_quickstart.Timings import timed
+from coala_quickstart.generation.EntryPoints import use_cached_bear_dirs
 from coala_quickstart.generation.SettingsFilling import is_autofill_possible
 from coala_quickstart.generation.Utilities import concatenate
+from coala_quickstart.generation.VersionRange import is_version_compatible
 from coalib.bearlib.abstractions.LinterClass import LinterClass
-from coalib.settings.ConfigurationGathering import get_filtered_bears
+from coalib.collecting.Collectors import filter_section_bears_by_languages
+from coalib.settings.ConfigurationGathering import (
+    collect_all_bears_from_sections, load_configuration)
 from coalib.misc.DictUtilities import inverse_dicts
 
 
+def load_all_bears(arg_parser=None, args=None, project_dir=None):
+    """
+    Loads all the bears from the bear directories configured for coala.
+
+    :param arg_parser:
+        ``argparse.ArgumentParser`` object containing the arguments
+        passed.
+    :param args:
+        The parsed arguments, passed on so that coala doesn't parse
+        ``sys.argv`` again.
+    :param project_dir:
+        The directory of the ``.coafile`` configuring the bear directories,
+        the working directory if None.
+    :return:
+        A tuple of two dicts with section names as keys and lists of the
+        local and global bear classes as values.
+    """
+    if project_dir is not None:
+        # coala looks for the .coafile in the working directory otherwise.
+        args = Namespace(**vars(args or Namespace()))
+        args.config = os.path.join(project_dir, '.coafile')
+    with timed('bear loading', 'bear_load') as current_span, \
+            use_cached_bear_dirs():
+        sections, _ = load_configuration(None, arg_parser=arg_parser,
+                                         args=args, silent=True)
+        all_bears = collect_all_bears_from_sections(sections)
+        current_span.set(bears=len({bear
+                                    for bears in all_bears
+                                    for section_bears in bears.values()
+                                    for bear in section_bears}))
+    return all_bears
+
+
 def filter_relevant_bears(used_languages,
                           printer,
                           arg_parser,
                           extracted_info,
-                          log_printer=None):
+                          log_printer=None,
+                          project_files=None,
+                          args=None,
+                          all_bears=None):
     """
     From the bear dict, filter the bears per relevant language.
 
@@ -33,17 +76,27 @@ def filter_relevant_bears(used_languages,
         passed.
     :param extracted_info:
         list of information extracted from ``InfoExtractor`` classes.
+    :param project_files:
+        A list of file paths of the project, used to measure the cost of
+        the bears when a ``--time-budget`` is given.
+    :param args:
+        The parsed arguments. If None, they are parsed with ``arg_parser``.
+    :param all_bears:
+        The bears returned by ``load_all_bears``, loaded if None.
     :return:
         A dict with language name as key and bear classes as value.
     """
-    args = arg_parser.parse_args() if arg_parser else None
+    if args is None:
+        args = arg_parser.parse_args() if arg_parser else None
     used_languages.append(('All', 100))
 
+    # The bears are collected only once and then filtered per language.
+    if all_bears is None:
+        all_bears = load_all_bears(arg_parser, args)
     bears_by_lang = {
-        lang: set(inverse_dicts(*get_filtered_bears([lang],
-                                                    log_printer,
-                                                    arg_parser,
-                                                    silent=True)).keys())
+        lang: set(inverse_dicts(*(
+            filter_section_bears_by_languages(bears, [lang])
+            for bears in all_bears)).keys())
         for lang, _ in used_languages
     }
 
@@ -92,7 +145,8 @@ def filter_relevant_bears(used_languages,
              bear not in selected_bears[lang]])
 
     if args.green_mode:
-        return selected_bears
+        return filter_bears_by_time_budget(
+            args, selected_bears, bears_by_lang, project_files, printer)
 
     if not args.no_filter_by_capabilities:
         # Ask user for capablities
@@ -106,11 +160,13 @@ def filter_relevant_bears(used_languages,
             else DEFAULT_CAPABILTIES)
 
         # Filter bears based on capabilties
-        for lang, lang_bears in candidate_bears.items():
-            # Eliminate bears which doesn't contain the desired capabilites
-            capable_bears = get_bears_with_given_capabilities(
-                lang_bears, desired_capabilities)
-            candidate_bears[lang] = capable_bears
+        with timed('capability filtering'):
+            for lang, lang_bears in candidate_bears.items():
+                # Eliminate bears which doesn't contain the desired
+                # capabilites
+                capable_bears = get_bears_with_given_capabilities(
+                    lang_bears, desired_capabilities)
+                candidate_bears[lang] = capable_bears
 
     lint_task_info = extracted_info.get('LintTaskInfo', [])
     project_dependency_info = extracted_info.get('ProjectDependencyInfo', [])
@@ -179,7 +235,41 @@ def filter_relevant_bears(used_languages,
             else:
                 selected_bears[lang].update(lang_bears)
 
-    return selected_bears
+    return filter_bears_by_time_budget(
+        args, selected_bears, bears_by_lang, project_files, printer)
+
+
+def filter_bears_by_time_budget(args, selected_bears, bears_by_lang,
+                                project_files, printer):
+    """
+    Measures the cost of the selected bears on a sample of the project
+    files and drops or replaces bears that would exceed the time budget
+    given with ``--time-budget``.
+
+    :param args:
+        The parsed arguments.
+    :param selected_bears:
+        A dict with language name as key and bear classes as value.
+    :param bears_by_lang:
+        A dict with language name as key and all the bears available for
+        that language as value.
+    :param project_files:
+        A list of file paths of the project.
+    :param printer:
+        ``ConsolePrinter`` object to be used for console interactions.
+    :return:
+        The selected bears.
+    """
+    time_budget = getattr(args, 'time_budget', None)
+    if not time_budget or not project_files:
+        return selected_bears
+
+    from coala_quickstart.generation.Calibration import (
+        select_bears_within_budget)
+    with timed('time budget'):
+        return select_bears_within_budget(
+            selected_bears, bears_by_lang, project_files, time_budget,
+            printer)
 
 
 def get_non_optional_settings(bears):
@@ -304,9 +394,13 @@ def get_bears_with_matching_dependencies(bears, dependency_info):
                 installed_version = dep.version.value
                 bear_requirement_version = req_info['version']
                 if installed_version and bear_requirement_version:
-                    is_newer_version = is_version_newer(
-                        installed_version, bear_requirement_version)
-                    if is_newer_version:
+                    try:
+                        compatible = is_version_compatible(
+                            installed_version, bear_requirement_version)
+                    except ValueError:
+                        # Unknown specifier syntax, same as missing info.
+                        compatible = True
+                    if compatible:
                         matched_requirements.append(req)
                 else:
                     # No comparison can be made as the info is missing
@@ -477,14 +571,13 @@ def remove_bears_with_conflicting_capabilties(bears_by_lang):
 def is_version_newer(semver1, semver2):
     """
     Compares version strings and checks if the semver1 is
-    newer than semver2.
+    newer than semver2. Both may be version ranges, see
+    ``VersionRange.parse_range``.
     :returns:
-        True if semver1 is latest or matches semver2,
-        False otherwise.
+        True if semver1 allows a version which is latest or
+        matches semver2, False otherwise.
     """
-    semver1 = tuple(map(int, (re.sub('[^0-9\.]', '', semver1).split('.'))))
-    semver2 = tuple(map(int, (re.sub('[^0-9\.]', '', semver2).split('.'))))
-    return semver1 >= semver2
+    return is_version_compatible(semver1, semver2)
 
 
 def prompt_to_activate(bear, printer):
@@ -0,0 +1,306 @@
+import logging
+import os
+import time
+import tracemalloc
+from collections import defaultdict
+from queue import Queue
+
+from coala_quickstart.generation.Utilities import split_by_language
+
+# Number of files sampled per extension of a language, picked evenly over
+# the range of file sizes.
+SAMPLES_PER_EXTENSION = 3
+
+# Upper bound of files sampled per language.
+MAX_SAMPLES_PER_LANGUAGE = 15
+
+
+class BearCostEstimate:
+    """
+    Measured cost of running a bear on a sample of project files,
+    extrapolated to all the project files the bear would run on.
+    """
+
+    def __init__(self, bear, language, sampled_files, seconds,
+                 peak_memory, total_files):
+        """
+        :param bear:          The bear class.
+        :param language:      The language section the bear belongs to.
+        :param sampled_files: Number of files the bear was run on.
+        :param seconds:       Total time taken on the sampled files.
+        :param peak_memory:   Peak memory allocated in bytes while running
+                              on the largest sampled file, or None.
+        :param total_files:   Number of project files the bear runs on.
+        """
+        self.bear = bear
+        self.language = language
+        self.sampled_files = sampled_files
+        self.seconds = seconds
+        self.peak_memory = peak_memory
+        self.total_files = total_files
+
+    @property
+    def seconds_per_file(self):
+        return self.seconds / self.sampled_files if self.sampled_files else 0
+
+    @property
+    def estimated_seconds(self):
+        return self.seconds_per_file * self.total_files
+
+
+def sample_files(files,
+                 per_extension=SAMPLES_PER_EXTENSION,
+                 max_samples=MAX_SAMPLES_PER_LANGUAGE):
+    """
+    Picks a deterministic sample of files stratified by extension and
+    size, so that small and large files of each kind are measured.
+
+    :param files:         A collection of file paths.
+    :param per_extension: Number of files picked per extension.
+    :param max_samples:   Maximum number of files picked.
+    :return:              A list of file paths.
+    """
+    by_extension = defaultdict(list)
+    for path in sorted(files):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        by_extension[os.path.splitext(path)[1]].append((size, path))
+
+    strata = []
+    for extension in sorted(by_extension):
+        sized_files = sorted(by_extension[extension])
+        count = min(per_extension, len(sized_files))
+        if count == 1:
+            indices = [len(sized_files) - 1]
+        else:
+            indices = sorted({round(i * (len(sized_files) - 1) / (count - 1))
+                              for i in range(count)})
+        strata.append([sized_files[index][1] for index in indices])
+
+    # Take files round robin, so that every extension is represented even
+    # if ``max_samples`` is reached.
+    sample = []
+    for depth in range(per_extension):
+        for stratum in strata:
+            if depth < len(stratum) and len(sample) < max_samples:
+                sample.append(stratum[depth])
+    return sample
+
+
+def _read_file(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        return file.readlines()
+
+
+def _run_bear(bear, filename, file):
+    """
+    Runs the bear with its settings defaults on a single file. The messages
+    the bear logs are dropped.
+
+    :return: False if the bear could not be run.
+    """
+    from coalib.bears.GlobalBear import GlobalBear
+    from coalib.settings.Section import Section
+
+    section = Section('calibration')
+    if issubclass(bear, GlobalBear):
+        bear_obj = bear(section=section, message_queue=Queue(),
+                        file_dict={filename: file})
+        return bear_obj.execute() is not None
+    bear_obj = bear(section, Queue())
+    return bear_obj.execute(filename, file) is not None
+
+
+def measure_bear(bear, language, files, total_files):
+    """
+    Runs the bear on the given sample files and measures its cost.
+
+    :param bear:        The bear class.
+    :param language:    The language section the bear belongs to.
+    :param files:       The sampled file paths.
+    :param total_files: Number of project files the bear would run on.
+    :return:            A ``BearCostEstimate``, or None if the bear can not
+                        be run with default settings.
+    """
+    contents = [(path, _read_file(path)) for path in files]
+    seconds = 0
+    try:
+        for path, file in contents:
+            start = time.perf_counter()
+            if not _run_bear(bear, path, file):
+                logging.warning('Unable to measure the cost of {} as it '
+                                'failed on {!r}.'.format(bear.__name__, path))
+                return None
+            seconds += time.perf_counter() - start
+    except Exception as exception:
+        # Missing prerequisites or non-optional settings.
+        logging.warning('Unable to measure the cost of {}: {}'.format(
+            bear.__name__, exception))
+        return None
+
+    peak_memory = None
+    if contents and not tracemalloc.is_tracing():
+        # Memory is measured in a separate run, as tracing slows the bear
+        # down considerably.
+        path, file = max(contents, key=lambda content: len(content[1]))
+        tracemalloc.start()
+        try:
+            _run_bear(bear, path, file)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return BearCostEstimate(bear, language, len(contents), seconds,
+                            peak_memory, total_files)
+
+
+class BearCalibrator:
+    """
+    Measures and caches the estimated cost of bears for a project.
+    """
+
+    def __init__(self, project_files):
+        """
+        :param project_files: A list of file paths of the project.
+        """
+        self.project_files = list(project_files)
+        self.lang_files = split_by_language(self.project_files)
+        self.samples = {}
+        self.estimates = {}
+
+    def files_for_language(self, language):
+        if language.lower() == 'all':
+            return self.project_files
+        return self.lang_files.get(language.lower(), ())
+
+    def estimate(self, bear, language):
+        """
+        :return: The ``BearCostEstimate`` of the bear, or None if unknown.
+        """
+        key = (bear, language)
+        if key not in self.estimates:
+            files = self.files_for_language(language)
+            if language not in self.samples:
+                self.samples[language] = sample_files(files)
+            self.estimates[key] = measure_bear(
+                bear, language, self.samples[language], len(files))
+        return self.estimates[key]
+
+
+def _capabilities(bear):
+    return set(bear.CAN_DETECT) | set(bear.CAN_FIX)
+
+
+def apply_time_budget(selected_bears, candidate_bears, calibrator,
+                      time_budget):
+    """
+    Drops the most expensive bears until the estimated time to run all of
+    them is within the budget. A dropped bear is replaced by the cheapest
+    candidate bear of the same language sharing a capability with it, if
+    that one is cheaper.
+
+    :param selected_bears:  A dict with language name as key and a set of
+                            bear classes as value, which is modified.
+    :param candidate_bears: A dict with language name as key and bears that
+                            can be used as replacements as value.
+    :param calibrator:      A ``BearCalibrator``.
+    :param time_budget:     The time budget in seconds.
+    :return:                A list of tuples of the dropped bear estimates
+                            and the replacement estimates or None.
+    """
+    def cost(estimate):
+        return estimate.estimated_seconds if estimate else 0
+
+    estimates = [calibrator.estimate(bear, lang)
+                 for lang in sorted(selected_bears)
+                 for bear in sorted(selected_bears[lang],
+                                    key=lambda bear: bear.__name__)]
+    estimates = [estimate for estimate in estimates if estimate]
+    total = sum(cost(estimate) for estimate in estimates)
+
+    changes = []
+    for dropped in sorted(estimates, key=cost, reverse=True):
+        if total <= time_budget:
+            break
+        lang = dropped.language
+        selected_bears[lang].discard(dropped.bear)
+        total -= cost(dropped)
+
+        replacements = [
+            calibrator.estimate(bear, lang)
+            for bear in sorted(candidate_bears.get(lang, ()),
+                               key=lambda bear: bear.__name__)
+            if bear not in selected_bears[lang] and
+            _capabilities(bear) & _capabilities(dropped.bear)]
+        replacements = [estimate for estimate in replacements
+                        if estimate and cost(estimate) < cost(dropped)]
+        replacement = min(replacements, key=cost) if replacements else None
+        if replacement:
+            selected_bears[lang].add(replacement.bear)
+            total += cost(replacement)
+        changes.append((dropped, replacement))
+
+    return changes
+
+
+def _format_memory(size):
+    if size is None:
+        return 'n/a'
+    return '{:.1f} MiB'.format(size / 2 ** 20)
+
+
+def print_bear_estimates(printer, calibrator, changes, time_budget):
+    """
+    Prints the estimated cost of all the measured bears and the changes
+    made to fit into the time budget.
+
+    :param printer:     A ``ConsolePrinter`` object.
+    :param calibrator:  The ``BearCalibrator`` used.
+    :param changes:     The changes returned by ``apply_time_budget``.
+    :param time_budget: The time budget in seconds.
+    """
+    printer.print('\nEstimated cost of the bears on your project '
+                  '(time budget: {:.1f}s):'.format(time_budget))
+    estimates = [estimate for estimate in calibrator.estimates.values()
+                 if estimate]
+    for estimate in sorted(estimates,
+                           key=lambda estimate: -estimate.estimated_seconds):
+        printer.print('    {:<30} {:>8.2f}s for {:>6} files, {:>8.1f}ms/file,'
+                      ' peak {}'.format(
+                          estimate.bear.__name__,
+                          estimate.estimated_seconds,
+                          estimate.total_files,
+                          estimate.seconds_per_file * 1000,
+                          _format_memory(estimate.peak_memory)),
+                      color='cyan')
+    for dropped, replacement in changes:
+        message = '    {} exceeds the time budget and was dropped'.format(
+            dropped.bear.__name__)
+        if replacement:
+            message += ' in favour of {}'.format(replacement.bear.__name__)
+        printer.print(message + '.', color='yellow')
+    printer.print('')
+
+
+def select_bears_within_budget(selected_bears, bears_by_lang, project_files,
+                               time_budget, printer):
+    """
+    Calibrates the selected bears on the project and makes the selection
+    fit into the time budget.
+
+    :param selected_bears: A dict with language name as key and a set of
+                           bear classes as value, which is modified.
+    :param bears_by_lang:  A dict with language name as key and all the
+                           bears available for that language as value.
+    :param project_files:  A list of file paths of the project.
+    :param time_budget:    The time budget in seconds.
+    :param printer:        A ``ConsolePrinter`` object.
+    :return:               The selected bears.
+    """
+    calibrator = BearCalibrator(project_files)
+    changes = apply_time_budget(selected_bears, bears_by_lang, calibrator,
+                                time_budget)
+    print_bear_estimates(printer, calibrator, changes, time_budget)
+    return selected_bears
@@ -0,0 +1,249 @@
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+from coala_quickstart.generation.BearCatalog import get_cache_dir
+
+
+ENTRY_POINTS_FILENAME = 'entry_points.json'
+
+# Increase this whenever the layout of the stored table changes.
+ENTRY_POINTS_FORMAT = 1
+
+BEARS_ENTRY_POINT = 'coalabears'
+
+INFO_EXTRACTORS_ENTRY_POINT = 'coala_quickstart.info_extractors'
+
+
+def get_site_stamp(paths=None):
+    """
+    Returns the modification times of the directories on the import path.
+    Installing, upgrading or removing a distribution adds or removes its
+    metadata directory in one of them, which changes the stamp.
+
+    :param paths: List of import paths, defaults to ``sys.path``.
+    :return:      A list of ``[path, mtime]`` lists.
+    """
+    stamp = []
+    for path in sys.path if paths is None else paths:
+        try:
+            stat = os.stat(path) if path else None
+        except OSError:
+            continue
+        if stat and os.path.isdir(path):
+            stamp.append([path, stat.st_mtime_ns])
+    return stamp
+
+
+def _distribution_entry_points():
+    try:
+        from importlib.metadata import distributions
+    except ImportError:
+        try:
+            from importlib_metadata import distributions
+        except ImportError:
+            distributions = None
+
+    if distributions:
+        for distribution in distributions():
+            for entry_point in distribution.entry_points:
+                yield entry_point.group, entry_point.name, entry_point.value
+        return
+
+    # Python < 3.8 without the ``importlib_metadata`` backport. This is only
+    # reached when the table is rebuilt.
+    import pkg_resources
+    for distribution in pkg_resources.working_set:
+        for group, entry_points in distribution.get_entry_map().items():
+            for entry_point in entry_points.values():
+                value = entry_point.module_name
+                if entry_point.attrs:
+                    value += ':' + '.'.join(entry_point.attrs)
+                yield group, entry_point.name, value
+
+
+def scan_entry_points():
+    """
+    Collects the entry points of all the installed distributions.
+
+    :return: A dict with the entry point group as key and a list of
+             ``[name, value]`` lists as value.
+    """
+    table = {}
+    for group, name, value in _distribution_entry_points():
+        entry_points = table.setdefault(group, [])
+        if [name, value] not in entry_points:
+            entry_points.append([name, value])
+    return table
+
+
+def load_entry_point_table(path):
+    """
+    Loads the entry point table stored at the given path, rebuilding and
+    storing it if it does not match the current import path.
+
+    :param path: Path to the JSON file caching the table.
+    :return:     The table as returned by ``scan_entry_points``.
+    """
+    stamp = get_site_stamp()
+    try:
+        with open(path, 'r') as table_file:
+            data = json.load(table_file)
+        if (data.get('format') == ENTRY_POINTS_FORMAT and
+                data.get('stamp') == stamp):
+            return data['groups']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    table = scan_entry_points()
+    data = {'format': ENTRY_POINTS_FORMAT, 'stamp': stamp, 'groups': table}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = path + '.tmp' + str(os.getpid())
+        with open(temporary_path, 'w') as table_file:
+            json.dump(data, table_file)
+        os.replace(temporary_path, path)
+    except OSError:
+        logging.warning('Unable to write the entry point table to {!r}. '
+                        'Continuing without caching.'.format(path))
+    return table
+
+
+# The path and site stamp the table was loaded with, and the table.
+_entry_point_table = None
+
+
+def get_entry_points(group):
+    """
+    Returns the registered entry points of a group. The table of all entry
+    points is read from the coala-quickstart cache directory once per
+    process, and again once a distribution was installed or removed, see
+    ``get_site_stamp``, so long running processes like the daemon see it.
+
+    :param group: Name of the entry point group.
+    :return:      A list of ``(name, value)`` tuples, where value is of the
+                  form ``module:attribute``.
+    """
+    global _entry_point_table
+    path = os.path.join(get_cache_dir(), ENTRY_POINTS_FILENAME)
+    stamp = get_site_stamp()
+    cached = _entry_point_table
+    if cached is None or cached[:2] != (path, stamp):
+        cached = _entry_point_table = (path, stamp,
+                                       load_entry_point_table(path))
+    return [tuple(entry_point) for entry_point in cached[2].get(group, ())]
+
+
+def get_module_dir(value):
+    """
+    Locates the directory of the module an entry point refers to, without
+    importing the module itself.
+
+    :param value: The entry point value, e.g. ``bears`` or ``bears:attr``.
+    :return:      The absolute path of the directory, or None if the module
+                  can not be found.
+    """
+    module_name = value.split(':')[0].strip()
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    if spec.submodule_search_locations:
+        return os.path.abspath(list(spec.submodule_search_locations)[0])
+    if not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    return os.path.abspath(os.path.dirname(spec.origin))
+
+
+def collect_registered_bears_dirs(entrypoint):
+    """
+    Drop-in replacement for
+    ``coalib.collecting.Collectors.collect_registered_bears_dirs`` using
+    the cached entry point table.
+
+    :param entrypoint: The entry point group to find bear packages with.
+    :return:           List of bear directories.
+    """
+    bear_dirs = [get_module_dir(value)
+                 for _, value in get_entry_points(entrypoint)]
+    return [bear_dir for bear_dir in bear_dirs if bear_dir]
+
+
+_cached_bear_dirs_lock = threading.Lock()
+# The number of ``use_cached_bear_dirs`` blocks entered by all threads, and
+# the lookup of coala to restore when the last one ends.
+_cached_bear_dirs_users = 0
+_original_bear_dirs = None
+
+
+@contextmanager
+def use_cached_bear_dirs():
+    """
+    Makes coala look up the directories of registered bears in the cached
+    entry point table instead of going through ``pkg_resources`` in the
+    ``with`` block. The blocks can be nested and entered by several threads
+    at once, the lookup of coala is restored when the last one ends.
+    """
+    global _cached_bear_dirs_users, _original_bear_dirs
+    import coalib.settings.Section as section_module
+    with _cached_bear_dirs_lock:
+        if not _cached_bear_dirs_users:
+            _original_bear_dirs = section_module.collect_registered_bears_dirs
+            section_module.collect_registered_bears_dirs = (
+                collect_registered_bears_dirs)
+        _cached_bear_dirs_users += 1
+    try:
+        yield
+    finally:
+        with _cached_bear_dirs_lock:
+            _cached_bear_dirs_users -= 1
+            if not _cached_bear_dirs_users:
+                section_module.collect_registered_bears_dirs = (
+                    _original_bear_dirs)
+
+
+def load_entry_point(value):
+    """
+    Imports the object an entry point refers to.
+
+    :param value: The entry point value, e.g. ``package.module:Class``.
+    :return:      The referred object.
+    """
+    module_name, _, attributes = value.partition(':')
+    obj = importlib.import_module(module_name.strip())
+    for attribute in attributes.strip().split('.') if attributes else ():
+        obj = getattr(obj, attribute)
+    return obj
+
+
+def get_registered_info_extractors():
+    """
+    Loads the ``InfoExtractor`` classes registered by other distributions
+    with the ``coala_quickstart.info_extractors`` entry point group.
+
+    :return: A list of ``InfoExtractor`` subclasses.
+    """
+    from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
+
+    extractors = []
+    for name, value in get_entry_points(INFO_EXTRACTORS_ENTRY_POINT):
+        try:
+            extractor = load_entry_point(value)
+        except Exception:
+            logging.warning('Unable to load the info extractor {!r} from '
+                            '{!r}.'.format(name, value))
+            continue
+        if (not isinstance(extractor, type) or
+                not issubclass(extractor, InfoExtractor)):
+            logging.warning('The entry point {!r} does not refer to an '
+                            'InfoExtractor class.'.format(name))
+            continue
+        extractors.append(extractor)
+    return extractors
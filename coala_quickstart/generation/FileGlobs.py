@@ -11,7 +11,8 @@ def get_project_files(log_printer,
                       printer,
                       project_dir,
                       file_path_completer,
-                      non_interactive=False):
+                      non_interactive=False,
+                      speculation=None):
     """
     Gets the list of files matching files in the user's project directory
     after prompting for glob expressions.
@@ -24,22 +25,19 @@ def get_project_files(log_printer,
         A ``file_path_completer`` object.
     :param non_interactive
         Whether coala-quickstart is in non-interactive mode
+    :param speculation:
+        A ``Speculation`` object whose ``'project files'`` started with
+        ``speculate_project_files()`` are used if they were collected for
+        the same project directory and ignore globs.
     :return:
         A list of file paths matching the files.
     """
-    file_globs = ['**']
+    ignore_globs = get_gitignore_globs(project_dir)
 
-    ignore_globs = None
-    gitignore_dir_list = []
-    for dir_name, subdir_name, file_list in os.walk(project_dir):
-        if os.path.isfile(os.path.join(dir_name, '.gitignore')):
-            gitignore_dir_list += [dir_name]
-
-    if gitignore_dir_list:
+    if ignore_globs is not None:
         printer.print('The contents of your .gitignore file for the project '
                       'will be automatically loaded as the files to ignore.',
                       color='green')
-        ignore_globs = get_gitignore_glob(project_dir, gitignore_dir_list)
 
     if non_interactive and not ignore_globs:
         ignore_globs = []
@@ -56,6 +54,54 @@ def get_project_files(log_printer,
     printer.print()
 
     ignore_globs = list(ignore_globs)
+    if speculation is None:
+        file_paths = collect_project_files(project_dir, ignore_globs,
+                                           log_printer)
+    else:
+        used, speculated = speculation.take('project files', project_dir)
+        if used and speculated is not None and speculated[0] == ignore_globs:
+            file_paths = speculated[1]
+        else:
+            file_paths = collect_project_files(project_dir, ignore_globs,
+                                               log_printer)
+
+    return file_paths, ignore_globs
+
+
+def get_gitignore_globs(project_dir):
+    """
+    :param project_dir:
+        The project directory.
+    :return:
+        A list of the globs of the ``.gitignore`` files in the project
+        directory, None if there is no ``.gitignore`` file.
+    """
+    gitignore_dir_list = []
+    for dir_name, subdir_name, file_list in os.walk(project_dir):
+        if os.path.isfile(os.path.join(dir_name, '.gitignore')):
+            gitignore_dir_list += [dir_name]
+
+    if not gitignore_dir_list:
+        return None
+    return list(get_gitignore_glob(project_dir, gitignore_dir_list))
+
+
+def collect_project_files(project_dir, ignore_globs, log_printer=None):
+    """
+    Collects the files of the project directory, except those matching the
+    ignore globs and those of the ``.git`` directory.
+
+    :param project_dir:
+        The project directory.
+    :param ignore_globs:
+        A list of globs relative to the project directory.
+    :param log_printer:
+        A ``LogPrinter`` object.
+    :return:
+        A list of file paths.
+    """
+    file_globs = ['**']
+
     escaped_project_dir = glob_escape(project_dir)
     file_path_globs = [os.path.join(
         escaped_project_dir, glob_exp) for glob_exp in file_globs]
@@ -64,9 +110,25 @@ def get_project_files(log_printer,
 
     ignore_path_globs.append(os.path.join(escaped_project_dir, '.git/**'))
 
-    file_paths = collect_files(
+    return collect_files(
         file_path_globs,
         log_printer,
         ignored_file_paths=ignore_path_globs)
 
-    return file_paths, ignore_globs
+
+def speculate_project_files(project_dir):
+    """
+    Collects the files of the project directory if the ignore globs don't
+    have to be asked, to be started with ``Speculation.start()`` as
+    ``'project files'`` before the project directory is confirmed.
+
+    :param project_dir:
+        The project directory.
+    :return:
+        A tuple of the ignore globs and the file paths, None if the project
+        has no ``.gitignore`` file.
+    """
+    ignore_globs = get_gitignore_globs(project_dir)
+    if ignore_globs is None:
+        return None
+    return ignore_globs, collect_project_files(project_dir, ignore_globs)
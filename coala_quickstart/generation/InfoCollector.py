@@ -1,3 +1,7 @@
+from coala_quickstart.Timings import timed
+from coala_quickstart.generation.EntryPoints import (
+    get_registered_info_extractors)
+from coala_quickstart.info_extraction.InfoStore import InfoStore
 from coala_quickstart.info_extractors.EditorconfigInfoExtractor import (
     EditorconfigInfoExtractor)
 from coala_quickstart.info_extractors.PackageJSONInfoExtractor import (
@@ -11,22 +15,30 @@ from coala_quickstart.info_extractors.GruntfileInfoExtractor import (
 def collect_info(project_dir):
     """
     Collects information extracted by various ``InfoExtractor``
-    classes and returns them as a dictionary.
+    classes and returns them as an ``InfoStore``. Extractors registered with
+    the ``coala_quickstart.info_extractors`` entry point group are run on
+    their ``supported_file_globs``.
     """
-    editorconfig_info = EditorconfigInfoExtractor(
-        ['.editorconfig'], project_dir).extract_information()
-
-    package_json_info = PackageJSONInfoExtractor(
-        ['package.json'], project_dir).extract_information()
-
-    gemfile_info = GemfileInfoExtractor(
-        ['Gemfile'], project_dir).extract_information()
-
-    gruntfile_info = GruntfileInfoExtractor(
-        ['Gruntfile.js'], project_dir).extract_information()
-
-    extracted_info = aggregate_info([
-        editorconfig_info, package_json_info, gemfile_info, gruntfile_info])
+    extractors = [
+        (EditorconfigInfoExtractor, ['.editorconfig']),
+        (PackageJSONInfoExtractor, ['package.json']),
+        (GemfileInfoExtractor, ['Gemfile']),
+        (GruntfileInfoExtractor, ['Gruntfile.js']),
+        ] + [(extractor, list(extractor.supported_file_globs))
+             for extractor in get_registered_info_extractors()]
+
+    information = []
+    for extractor, target_globs in extractors:
+        with timed(extractor.__name__, 'extractor') as current_span:
+            information.append(extractor(
+                target_globs, project_dir).extract_information())
+            current_span.set(
+                files=len(information[-1]),
+                infos=sum(len(info_instances)
+                          for extracted_info in information[-1].values()
+                          for info_instances in extracted_info.values()))
+
+    extracted_info = aggregate_info(information)
 
     return extracted_info
 
@@ -34,17 +46,14 @@ def collect_info(project_dir):
 def aggregate_info(infoextractors):
     """
     Aggregates inforamtion extracted from multiple ``InfoExtractor``
-    instances to one dictionary.
+    instances to one ``InfoStore``, which maps the info names to lists
+    of ``Info`` instances.
 
     :param infoextractors: list of values of ``information`` attribute
                            of different ``InfoExtractor`` instances.
     """
-    result = {}
-    for ie in infoextractors:
-        for fname, extracted_info in ie.items():
-            for info_name, info_instances in extracted_info.items():
-                if result.get(info_name):
-                    result[info_name] += info_instances
-                else:
-                    result[info_name] = info_instances
-    return result
+    return InfoStore(info
+                     for ie in infoextractors
+                     for extracted_info in ie.values()
+                     for info_instances in extracted_info.values()
+                     for info in info_instances)
@@ -149,6 +149,8 @@ def write_coafile(printer, project_dir, settings):
         Full path of the user's project directory.
     :param settings:
         A dict with section name as key and a ``Section`` object as value.
+    :return:
+        The path of the written file.
     """
     coafile = os.path.join(project_dir, '.coafile')
     if os.path.isfile(coafile):
@@ -163,3 +165,4 @@ def write_coafile(printer, project_dir, settings):
     writer.close()
 
     printer.print("'" + coafile + "' successfully generated.", color='green')
+    return coafile
@@ -1,6 +1,11 @@
+from coala_quickstart.generation.BearCatalog import (
+    get_bear_id, get_default_catalog)
 from coala_quickstart.generation.Utilities import (
     search_for_orig, get_all_args, get_default_args)
 
+# Key of the settings classification in the ``BearCatalog``.
+SETTINGS_METADATA_KEY = 'settings'
+
 
 def in_annot(func, key):
     """
@@ -113,6 +118,23 @@ class SettingTypes:
         self.settings_others = []
         self.fillup_settings(functions, settings, bear, trigger)
 
+    @classmethod
+    def from_metadata(cls, metadata):
+        """
+        Creates a ``SettingTypes`` object from the metadata returned by
+        ``to_metadata`` without introspecting the bear again.
+        """
+        setting_types = cls.__new__(cls)
+        setting_types.settings_bool = list(metadata['bool'])
+        setting_types.settings_others = list(metadata['others'])
+        return setting_types
+
+    def to_metadata(self):
+        """
+        :return: A JSON serializable dict of the classified settings.
+        """
+        return {'bool': self.settings_bool, 'others': self.settings_others}
+
     def fillup_settings(self, functions, settings, bear, trigger):
         """
         Fill settings_bool and settings_others depending upon whether the
@@ -275,12 +297,44 @@ class BearSettings:
     Collect optional and non-optional settings for each bear
     """
 
-    def __init__(self, bear):
+    def __init__(self, bear, catalog=None):
         """
         :param bear:
             A bear class object.
+        :param catalog:
+            A ``BearCatalog`` to look up the classification of the settings
+            in, and to store it to after introspecting the bear.
         """
         self.bear = bear
+        metadata = None
+        if catalog is not None:
+            metadata = catalog.get(get_bear_id(bear), SETTINGS_METADATA_KEY)
+        if metadata is not None:
+            self.non_optional_settings = SettingTypes.from_metadata(
+                metadata['non_optional'])
+            self.optional_settings = SettingTypes.from_metadata(
+                metadata['optional'])
+            return
+
+        self.introspect_bear(bear)
+        if catalog is not None:
+            catalog.set(bear, SETTINGS_METADATA_KEY, self.to_metadata())
+
+    def to_metadata(self):
+        """
+        :return: A JSON serializable dict of the classified settings.
+        """
+        return {'non_optional': self.non_optional_settings.to_metadata(),
+                'optional': self.optional_settings.to_metadata()}
+
+    def introspect_bear(self, bear):
+        """
+        Classifies the settings of the bear by inspecting the signatures
+        of its methods and of its dependencies.
+
+        :param bear:
+            A bear class object.
+        """
         functions = None
         function = bear.create_arguments if (
             'create_arguments' in dir(bear)) else bear.run
@@ -297,7 +351,7 @@ class BearSettings:
             # Recursively look for optional settings (which have a default
             # value) inside BEAR_DEPS
             optional_settings = get_default_args(function)
-            optional_settings.update(parse_dep_tree_optional(self.bear))
+            optional_settings.update(parse_dep_tree_optional(bear))
             functions = [function]
         else:
             optional_settings_create_arguments = get_default_args(function)
@@ -342,15 +396,21 @@ class BearSettings:
             optional_settings, functions, bear, trigger='optional')
 
 
-def collect_bear_settings(bears):
+def collect_bear_settings(bears, catalog=None):
     """
     :param bears:
         Dict of candidate bears for the project for each language.
+    :param catalog:
+        The ``BearCatalog`` caching the settings classification, defaults
+        to the catalog in the coala-quickstart cache directory.
     :return:
         A BearSettings object.
     """
+    if catalog is None:
+        catalog = get_default_catalog()
     bear_settings_obj = []
     for language in bears:
         for bear in bears[language]:
-            bear_settings_obj.append(BearSettings(bear))
+            bear_settings_obj.append(BearSettings(bear, catalog))
+    catalog.save()
     return bear_settings_obj
@@ -4,6 +4,7 @@ from termcolor import colored
 from coalib.settings.Setting import Setting
 from coalib.misc.Constants import TRUE_STRINGS, FALSE_STRINGS
 from coala_quickstart.generation.InfoMapping import INFO_SETTING_MAPS
+from coala_quickstart.info_extraction.InfoStore import InfoStore
 from coala_utils.string_processing.Core import join_names
 
 
@@ -28,10 +29,13 @@ def fill_section(section,
                              who need this setting in all following indexes.
     :param log_printer:      The log printer for logging.
     :param bears:            All bear classes or instances.
-    :param extracted_info:   A list of information extracted from the project
-                             files by ``InfoExtractor`` classes.
+    :param extracted_info:   An ``InfoStore`` or a dict of information
+                             extracted from the project files by
+                             ``InfoExtractor`` classes.
     :return:                 The new section.
     """
+    extracted_info = InfoStore.from_dict(extracted_info)
+
     # Retrieve needed settings.
     prel_needed_settings = {}
 
@@ -98,41 +102,40 @@ def autofill_value(setting_key, section, bears, extracted_information):
                                   belongs.
     :param bears:                 list of bears having the setting_key
                                   as one of the settings.
-    :param extracted_information: list of information extracted from
-                                  ``InfoExtractor`` classes.
+    :param extracted_information: ``InfoStore`` or dict of information
+                                  extracted from ``InfoExtractor`` classes.
     :return:                      yields possible values that can be
                                   used to fill the setting_key.
     """
-    if INFO_SETTING_MAPS.get(setting_key):
-        for mapping in INFO_SETTING_MAPS[setting_key]:
-            scope = mapping['scope']
-            if (scope.check_belongs_to_scope(
-                    section, bears)):
-                # look for the values in extracted information
-                # from all the ``InfoExtractor`` instances.
-                values = extracted_information.get(
-                    mapping['info_kind'].__name__)
-                if values:
-                    for val in values:
-                        if scope.check_is_applicable_information(section, val):
-                            yield mapping['mapper_function'](val)
+    for mapping, values in _applicable_information(
+            setting_key, section, bears, extracted_information):
+        for val in values:
+            yield mapping['mapper_function'](val)
 
 
 def is_autofill_possible(setting_key, section, bears, extracted_info):
     """
     Checks if it is possible to autofill the setting values.
     """
-    if INFO_SETTING_MAPS.get(setting_key):
-        for mapping in INFO_SETTING_MAPS[setting_key]:
-            scope = mapping['scope']
-            if (scope.check_belongs_to_scope(
-                    section, bears)):
-                values = extracted_info.get(
-                    mapping['info_kind'].__name__)
-                for val in values:
-                    if scope.check_is_applicable_information(section, val):
-                        return True
-    return False
+    return any(values for _, values in _applicable_information(
+        setting_key, section, bears, extracted_info))
+
+
+def _applicable_information(setting_key, section, bears, extracted_info):
+    """
+    Yields the mappings of the setting whose scope the section and bears
+    belong to, together with the information applicable to the section.
+    """
+    if not INFO_SETTING_MAPS.get(setting_key):
+        return
+    extracted_info = InfoStore.from_dict(extracted_info)
+    for mapping in INFO_SETTING_MAPS[setting_key]:
+        scope = mapping['scope']
+        if scope.check_belongs_to_scope(section, bears):
+            # look for the values in extracted information
+            # from all the ``InfoExtractor`` instances.
+            yield mapping, extracted_info.get_applicable(
+                scope, mapping['info_kind'], section)
 
 
 def resolve_anomaly(setting_name,
@@ -4,6 +4,7 @@ import os
 from collections import defaultdict
 import re
 import yaml
+from functools import lru_cache
 
 from coala_utils.Extensions import exts
 from coala_utils.string_processing import unescaped_search_for
@@ -135,6 +136,18 @@ def get_extensions(project_files):
     return extset
 
 
+@lru_cache(maxsize=None)
+def get_signature(func):
+    """
+    Memoized ``inspect.signature``, as bears are introspected once per
+    setting.
+
+    :param func: Function name.
+    :return:     The ``inspect.Signature`` of the function.
+    """
+    return inspect.signature(func)
+
+
 def get_default_args(func):
     """
     :param func: Function name.
@@ -142,7 +155,7 @@ def get_default_args(func):
         A dict of function paramters as keys
         and default values as value if default values exist.
     """
-    signature = inspect.signature(func)
+    signature = get_signature(func)
     return {
         k: v.default
         for k, v in signature.parameters.items()
@@ -157,7 +170,7 @@ def get_all_args(func):
         A dict of function paramters as keys
         and default values as value.
     """
-    signature = inspect.signature(func)
+    signature = get_signature(func)
     return {
         k: v.default
         for k, v in signature.parameters.items()
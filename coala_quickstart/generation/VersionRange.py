@@ -0,0 +1,338 @@
+import re
+from functools import lru_cache
+
+
+_WILDCARDS = ('x', 'X', '*')
+
+_COMPARATOR_REGEX = re.compile(
+    r'(~>|~=|===|==|!=|>=|<=|\^|~|>|<|=)?\s*'
+    r'(v?(?:\d+|[xX*])(?:\.(?:\d+|[xX*]))*[0-9A-Za-z.+-]*)')
+
+_VERSION_REGEX = re.compile(r'^\s*[v=]?\s*(\d+(?:\.\d+)*)')
+
+_BARE_VERSION_REGEX = re.compile(r'^\s*v?\d+(?:\.\d+)*\s*$')
+
+_HYPHEN_RANGE_REGEX = re.compile(r'^\s*(\S+)\s+-\s+(\S+)\s*$')
+
+
+@lru_cache(maxsize=None)
+def parse_version(version):
+    """
+    Parses a version string into a tuple of integers which can be
+    compared with other parsed versions. Only the numeric release
+    segment is considered; pre-release and build tags are dropped and
+    trailing zero components are stripped, so that ``1.2`` and
+    ``1.2.0`` compare equal.
+
+    >>> parse_version('1.2.0')
+    (1, 2)
+    >>> parse_version('v2.10.1-beta.6')
+    (2, 10, 1)
+    >>> parse_version('latest')
+    Traceback (most recent call last):
+      ...
+    ValueError: 'latest' is not a valid version.
+
+    :param version: The version string.
+    :return:        A tuple of integers.
+    """
+    match = _VERSION_REGEX.match(version)
+    if not match:
+        raise ValueError('{!r} is not a valid version.'.format(version))
+    return _normalize([int(part) for part in match.group(1).split('.')])
+
+
+def _normalize(components):
+    components = list(components)
+    while components and components[-1] == 0:
+        components.pop()
+    return tuple(components)
+
+
+def _parse_partial(version):
+    """
+    Parses a possibly partial version like ``1.2``, ``1.x`` or ``1.2.*``.
+
+    :return: A tuple of the list of given integer components and a bool
+             telling whether the version ended with a wildcard.
+    """
+    if version.startswith('v'):
+        version = version[1:]
+    components = []
+    for part in version.split('.'):
+        if part in _WILDCARDS:
+            return components, True
+        digits = re.match(r'\d+', part)
+        if not digits:
+            break
+        components.append(int(digits.group()))
+        if digits.end() != len(part):
+            # Pre-release or build tag, e.g. ``0-beta`` in ``1.0.0-beta``.
+            break
+    return components, False
+
+
+def _bump(components, index):
+    """
+    Returns the smallest version greater than all versions that share the
+    first ``index + 1`` components with ``components``.
+    """
+    components = list(components) + [0] * (index + 1 - len(components))
+    return _normalize(components[:index] + [components[index] + 1])
+
+
+class VersionRange:
+    """
+    A compiled set of versions, stored as a sorted union of disjoint
+    intervals. Each interval is a tuple ``(low, low_inclusive, high,
+    high_inclusive)`` of parsed versions, where ``None`` stands for an
+    unbounded side.
+    """
+
+    def __init__(self, intervals):
+        self.intervals = tuple(
+            # ``>=0`` is no bound at all, as no version is lower than 0.
+            (None, False) + interval[2:] if interval[:2] == ((), True)
+            else interval
+            for interval in intervals if not _is_empty(interval))
+
+    def __repr__(self):
+        return 'VersionRange({!r})'.format(list(self.intervals))
+
+    def __eq__(self, other):
+        return (isinstance(other, VersionRange) and
+                self.intervals == other.intervals)
+
+    def __hash__(self):
+        return hash(self.intervals)
+
+    @property
+    def is_empty(self):
+        return not self.intervals
+
+    def contains(self, version):
+        """
+        Checks if the given version lies inside the range.
+
+        :param version: A version string or a tuple returned by
+                        ``parse_version``.
+        """
+        if isinstance(version, str):
+            version = parse_version(version)
+        for low, low_inclusive, high, high_inclusive in self.intervals:
+            if low is not None and (
+                    version < low or version == low and not low_inclusive):
+                continue
+            if high is not None and (
+                    version > high or version == high and not high_inclusive):
+                continue
+            return True
+        return False
+
+    def intersection(self, other):
+        """
+        Returns a ``VersionRange`` containing the versions present in both
+        ranges.
+        """
+        return VersionRange(_intersect(first, second)
+                            for first in self.intervals
+                            for second in other.intervals)
+
+    def intersects(self, other):
+        """
+        Checks if at least one version satisfies both ranges.
+        """
+        return any(not _is_empty(_intersect(first, second))
+                   for first in self.intervals
+                   for second in other.intervals)
+
+
+def _intersect(first, second):
+    low, low_inclusive = max(
+        (first[0], first[1]), (second[0], second[1]), key=_low_key)
+    high, high_inclusive = min(
+        (first[2], first[3]), (second[2], second[3]), key=_high_key)
+    return low, low_inclusive, high, high_inclusive
+
+
+def _low_key(bound):
+    version, inclusive = bound
+    # An unbounded low is the weakest bound, an exclusive one the strongest.
+    return (version is not None, version or (), not inclusive)
+
+
+def _high_key(bound):
+    version, inclusive = bound
+    return (version is None, version or (), inclusive)
+
+
+def _is_empty(interval):
+    low, low_inclusive, high, high_inclusive = interval
+    if low is None or high is None:
+        return False
+    return low > high or (
+        low == high and not (low_inclusive and high_inclusive))
+
+
+ANY_VERSION = VersionRange([(None, False, None, False)])
+
+
+def _comparator_range(operator, version):
+    """
+    Compiles a single comparator such as ``>=1.2`` or ``~>3.0`` into a
+    ``VersionRange``.
+    """
+    components, wildcard = _parse_partial(version)
+    if not components:
+        if operator in ('<', '>', '!='):
+            # ``<*``, ``>*`` and ``!=*`` can not be satisfied.
+            return VersionRange([])
+        return ANY_VERSION
+
+    count = len(components)
+    exact = _normalize(components)
+
+    if operator == '^':
+        nonzero = [index for index, value in enumerate(components) if value]
+        index = nonzero[0] if nonzero else count - 1
+        return VersionRange([(exact, True, _bump(components, index), False)])
+
+    if operator == '~':
+        index = 1 if count >= 2 else 0
+        return VersionRange([(exact, True, _bump(components, index), False)])
+
+    if operator in ('~>', '~='):
+        index = max(count - 2, 0)
+        return VersionRange([(exact, True, _bump(components, index), False)])
+
+    if operator in ('', '=', '==', '===', '!='):
+        # A bare partial version is treated as an npm x-range, while ``==``
+        # only acts as a prefix match when a wildcard is given (PEP 440).
+        if wildcard or (operator in ('', '=') and count < 3):
+            matching = (exact, True, _bump(components, count - 1), False)
+        else:
+            matching = (exact, True, exact, True)
+        if operator != '!=':
+            return VersionRange([matching])
+        return VersionRange([(None, False, matching[0], not matching[1]),
+                             (matching[2], not matching[3], None, False)])
+
+    if wildcard:
+        # npm x-ranges: ``>1.2.x`` means ``>=1.3.0``, ``<=1.2.x`` means
+        # ``<1.3.0``.
+        upper = _bump(components, count - 1)
+        if operator == '>':
+            return VersionRange([(upper, True, None, False)])
+        if operator == '<=':
+            return VersionRange([(None, False, upper, False)])
+
+    if operator == '>':
+        return VersionRange([(exact, False, None, False)])
+    if operator == '>=':
+        return VersionRange([(exact, True, None, False)])
+    if operator == '<':
+        return VersionRange([(None, False, exact, False)])
+    assert operator == '<='
+    return VersionRange([(None, False, exact, True)])
+
+
+def _hyphen_range(start, end):
+    low, _ = _parse_partial(start)
+    high, _ = _parse_partial(end)
+    if not high:
+        high_bound = (None, False)
+    elif len(high) < 3:
+        high_bound = (_bump(high, len(high) - 1), False)
+    else:
+        high_bound = (_normalize(high), True)
+    return VersionRange([(_normalize(low), True) + high_bound])
+
+
+def _comparator_set_range(spec):
+    """
+    Compiles a set of comparators which all have to be satisfied, separated
+    by whitespace (npm) or commas (RubyGems and PEP 440).
+    """
+    hyphen = _HYPHEN_RANGE_REGEX.match(spec)
+    if hyphen:
+        return _hyphen_range(*hyphen.groups())
+
+    result = ANY_VERSION
+    position = 0
+    spec = spec.replace(',', ' ')
+    for match in _COMPARATOR_REGEX.finditer(spec):
+        if spec[position:match.start()].strip():
+            break
+        position = match.end()
+        operator, version = match.groups()
+        result = result.intersection(
+            _comparator_range(operator or '', version))
+    if spec[position:].strip():
+        raise ValueError('Unable to parse the version range {!r}.'.format(
+            spec.strip()))
+    return result
+
+
+@lru_cache(maxsize=None)
+def parse_range(spec):
+    """
+    Compiles an npm, RubyGems or PEP 440 style version specifier into a
+    ``VersionRange``. Compiled ranges are memoized by their string.
+
+    >>> parse_range('^1.2').contains('1.9.3')
+    True
+    >>> parse_range('~> 3.0').contains('4.0')
+    False
+    >>> parse_range('>=1 <2 || ~=3.1').contains('3.5')
+    True
+    >>> parse_range('>= 2, != 2.1.*').contains('2.1.4')
+    False
+
+    :param spec: The version specifier string.
+    :return:     A ``VersionRange`` object.
+    :raises ValueError: If the specifier can not be parsed.
+    """
+    spec = spec.strip()
+    if spec in ('', 'latest') or spec in _WILDCARDS:
+        return ANY_VERSION
+    intervals = []
+    for alternative in spec.split('||'):
+        intervals += _comparator_set_range(alternative).intervals
+    return VersionRange(intervals)
+
+
+@lru_cache(maxsize=None)
+def parse_requirement_range(spec):
+    """
+    Compiles the version of a bear requirement into a ``VersionRange``.
+    Unlike ``parse_range``, a bare version like ``2.9.5`` is treated as the
+    minimum required version, since bears pin the version they install but
+    work with newer ones as well.
+
+    >>> parse_requirement_range('2.9.5').contains('3.0.0')
+    True
+    >>> parse_requirement_range('~=1.4').contains('2.0')
+    False
+    """
+    if _BARE_VERSION_REGEX.match(spec):
+        return parse_range('>=' + spec.strip())
+    return parse_range(spec)
+
+
+def is_version_compatible(dependency_spec, requirement_spec):
+    """
+    Checks if a dependency declared by the project with ``dependency_spec``
+    can satisfy a bear requirement with the version ``requirement_spec``.
+
+    >>> is_version_compatible('~8.0', '8.1.3')
+    False
+    >>> is_version_compatible('^8.0', '8.1.3')
+    True
+
+    :param dependency_spec:  Version range declared in the project's
+                             manifest, e.g. in ``package.json``.
+    :param requirement_spec: Version of the bear requirement.
+    :return:                 True if some version satisfies both.
+    """
+    return parse_range(dependency_spec).intersects(
+        parse_requirement_range(requirement_spec))
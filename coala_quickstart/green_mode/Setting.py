@@ -34,3 +34,45 @@ def find_max_min_of_setting(setting, value, contents, operator):
     if operator(value, current_val):
         contents[settings_key][position][setting] = value
     return contents
+
+
+class SettingExtremes:
+    """
+    Folds the values of settings guessed for every file into the max or min
+    of each setting in constant time per file, so they are written to the
+    contents only once.
+    """
+
+    def __init__(self, operators):
+        """
+        :param operators:
+            An ``OrderedDict`` with the setting names as keys and either the
+            less than or greater than operator as values.
+        """
+        self.operators = operators
+        self.values = {}
+
+    def add(self, values):
+        """
+        :param values:
+            A dict with the values of the settings for one file.
+        """
+        for setting, operator in self.operators.items():
+            value = values[setting]
+            if (setting not in self.values or
+                    operator(value, self.values[setting])):
+                self.values[setting] = value
+
+    def update_contents(self, contents):
+        """
+        :param contents:
+            The python object to be written to 'PROJECT_DATA'.
+        :return:
+            The contents with the min or max values of the settings, see
+            ``find_max_min_of_setting()``.
+        """
+        for setting, operator in self.operators.items():
+            if setting in self.values:
+                contents = find_max_min_of_setting(
+                    setting, self.values[setting], contents, operator)
+        return contents
@@ -0,0 +1,174 @@
+import mmap
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import accumulate
+
+_ENCODING = 'utf-8'
+# Decoded files may contain lone surrogates, which must survive the round
+# trip.
+_ERRORS = 'surrogatepass'
+
+
+class FileLines(Sequence):
+    """
+    The lines of a file in a ``FileStore``, decoded on the first access and
+    kept, as the bears are run on every file many times. It can be used like
+    the tuple of lines of a file dict.
+    """
+
+    __slots__ = ('_buffer', '_offsets', '_first', '_length', '_lines')
+
+    def __init__(self, buffer, offsets, first, length):
+        """
+        :param buffer:  The buffer with the encoded lines.
+        :param offsets: An array of the offsets of the lines in the buffer,
+                        with the end of the last line as last item.
+        :param first:   The index of the first line of the file in
+                        ``offsets``.
+        :param length:  The number of lines of the file.
+        """
+        self._buffer = buffer
+        self._offsets = offsets
+        self._first = first
+        self._length = length
+        self._lines = None
+
+    def __len__(self):
+        return self._length
+
+    def _get_lines(self):
+        if self._lines is None:
+            offsets = self._offsets[self._first:
+                                    self._first + self._length + 1]
+            self._lines = tuple(
+                self._buffer[start:end].decode(_ENCODING, _ERRORS)
+                for start, end in zip(offsets, offsets[1:]))
+        return self._lines
+
+    def __getitem__(self, index):
+        return self._get_lines()[index]
+
+    def __iter__(self):
+        return iter(self._get_lines())
+
+    def __eq__(self, other):
+        if isinstance(other, (FileLines, tuple, list)):
+            return len(self) == len(other) and all(
+                line == other_line for line, other_line in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return tuple, (tuple(self),)
+
+    def __repr__(self):
+        return 'FileLines({!r})'.format(tuple(self))
+
+
+class FileStore(Mapping):
+    """
+    The contents of files in a single memory map of a temporary file, with
+    file names as keys and ``FileLines`` as values. Files without contents,
+    the raw files of ``get_file_dict()``, map to None.
+
+    Files are added one by one, so their contents don't have to be in
+    memory all at once. Processes forked after the store is created share
+    its memory, so the bear tests access the files without copying or
+    pickling them and the resident memory doesn't grow with the number of
+    processes. Every process decodes the files it reads once and keeps
+    them, see ``FileLines``. Pickling a store copies its contents.
+    """
+
+    def __init__(self, file_dict=None):
+        """
+        :param file_dict: A dict of file names as keys and file contents,
+                          sequences of lines, or None as values, to add.
+        """
+        self._index = {}
+        self._offsets = array('q', [0])
+        self._file = tempfile.TemporaryFile()
+        self._map = None
+        self._files = {}
+        for filename, lines in (file_dict or {}).items():
+            self.add(filename, lines)
+
+    def add(self, filename, lines):
+        """
+        Adds a file. Files can't be added once the store was read.
+
+        :param filename: The name of the file.
+        :param lines:    A sequence of the lines of the file or None.
+        """
+        if self._map is not None:
+            raise ValueError('Files can only be added before the store is '
+                             'read.')
+        if lines is None:
+            self._index[filename] = None
+            return
+        self._index[filename] = (len(self._offsets) - 1, len(lines))
+        text = ''.join(lines)
+        data = text.encode(_ENCODING, _ERRORS)
+        # Every character of ASCII text is a byte.
+        lengths = (map(len, lines) if len(data) == len(text) else
+                   (len(line.encode(_ENCODING, _ERRORS)) for line in lines))
+        start = self._offsets[-1]
+        self._offsets.extend(start + end for end in accumulate(lengths))
+        self._file.write(data)
+
+    def _get_map(self):
+        if self._map is None:
+            self._file.flush()
+            # Empty files can't be mapped.
+            self._map = (mmap.mmap(self._file.fileno(), self.size,
+                                   access=mmap.ACCESS_READ)
+                         if self.size else b'')
+        return self._map
+
+    def __getitem__(self, filename):
+        position = self._index[filename]
+        if position is None:
+            return None
+        lines = self._files.get(filename)
+        if lines is None:
+            lines = self._files[filename] = FileLines(
+                self._get_map(), self._offsets, *position)
+        return lines
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def size(self):
+        """
+        The number of bytes of the contents.
+        """
+        return self._offsets[-1]
+
+    def close(self):
+        """
+        Releases the memory and the temporary file. The ``FileLines`` of the
+        store can't be used afterwards.
+        """
+        self._files.clear()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __reduce__(self):
+        return FileStore, ({filename: None if lines is None else tuple(lines)
+                            for filename, lines in self.items()},)
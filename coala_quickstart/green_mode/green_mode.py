@@ -1,13 +1,18 @@
 import fnmatch
-import itertools
 import operator
 import os
+import re
 import sys
+import time
+from collections import Counter, OrderedDict
 from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 
+from coala_quickstart.CPUCount import get_cpu_count
+from coala_quickstart.Hooks import record_span
+from coala_quickstart.Timings import add_cpu_time, timed
 from coala_quickstart.generation.Utilities import (
-    contained_in,
     get_all_args,
     get_extensions,
     get_yaml_contents,
@@ -21,7 +26,16 @@ from coala_quickstart.green_mode.file_aggregator import (
     aggregate_files,
     )
 from coala_quickstart.green_mode.Setting import (
-    find_max_min_of_setting,
+    SettingExtremes,
+    )
+from coala_quickstart.green_mode.file_store import FileStore
+from coala_quickstart.green_mode.ignore_index import (
+    IgnoreRangeIndex,
+    get_ignore_index,
+    )
+from coala_quickstart.green_mode.search_strategies import (
+    ExhaustiveSearch,
+    run_searches,
     )
 from coala_quickstart.generation.Settings import (
     generate_ignore_field,
@@ -42,6 +56,11 @@ from coalib.settings.Section import Section
 
 
 settings_key = 'green_mode_infinite_value_settings'
+# The key of the settings taking rule codes in `bear_settings.yaml`.
+rule_codes_key = 'rule_codes'
+# The code of the rule in the origin of a result, like 'PycodestyleBear
+# (E501)'.
+_ORIGIN_CODE = re.compile(r'\((\S+)\)$')
 _CI_PYTEST_ACTIVE = os.environ.get('CI') and os.environ.get('PYTEST')
 _PYTHON_VERSION_MINOR = sys.version_info[0:2]
 _RESERVE_CPUS = 1
@@ -118,7 +137,7 @@ def generate_complete_filename_list(contents, project_dir):
     return file_names_list
 
 
-def run_quickstartbear(contents, project_dir):
+def run_quickstartbear(contents, project_dir, file_store=None):
     """
     Runs the QuickstartBear which pareses the file_dict
     to get the exact value of some settings which can attain
@@ -130,13 +149,17 @@ def run_quickstartbear(contents, project_dir):
     :param project_dir:
         The project directory from which to get the files for the
         QuickstartBear to run.
+    :param file_store:
+        The ``FileStore`` to add the files to. If None, a new one is
+        created, which is closed again if reading the files fails.
     :return:
         - An updated contents value after guessing values of certain
           settings.
-        - Collection of SourceRange objects indicating the parts of
-          code to ignore.
+        - An ``IgnoreRangeIndex`` of the SourceRange objects indicating
+          the parts of code to ignore.
         - The complete file dict contains file names as keys and file
-          contents as values to those keys.
+          contents as values to those keys, the ``FileStore`` to be closed
+          by the caller.
         - The complete file name list from the project directory and sub
           directories.
     """
@@ -145,28 +168,37 @@ def run_quickstartbear(contents, project_dir):
 
     complete_filename_list = generate_complete_filename_list(
         contents['dir_structure'], project_dir)
-    complete_file_dict = get_file_dict(complete_filename_list,
-                                       allow_raw_files=True)
-    ignore_ranges = list(yield_ignore_ranges(complete_file_dict))
     find_max = ['max_lines_per_file', 'max_line_length']
     find_min = ['min_lines_per_file']
-    for key in complete_file_dict:
-        return_val = quickstartbear_obj.execute(
-            filename=key, file=complete_file_dict[key])
-        return_val = return_val[0]
-        # eg. return_val = {'setting_name': value, ...}
-        if return_val is not None:
-            for setting in find_max:
-                contents = find_max_min_of_setting(
-                    setting, return_val[setting], contents,
-                    operator.gt)
-
-            for setting in find_min:
-                contents = find_max_min_of_setting(
-                    setting, return_val[setting], contents,
-                    operator.lt)
-
-    bear_settings = get_yaml_contents(str(
+    extremes = SettingExtremes(OrderedDict(
+        [(setting, operator.gt) for setting in find_max] +
+        [(setting, operator.lt) for setting in find_min]))
+
+    # The files are read one at a time and go to the file store, so only
+    # the file read and the values of the settings are held in memory.
+    complete_file_dict = FileStore() if file_store is None else file_store
+    ignore_ranges = IgnoreRangeIndex()
+    try:
+        for filename in complete_filename_list:
+            for key, file in get_file_dict([filename],
+                                           allow_raw_files=True).items():
+                complete_file_dict.add(key, file)
+                if file is None:
+                    continue
+                ignore_ranges.add(yield_ignore_ranges({key: file}))
+                return_val = quickstartbear_obj.execute(filename=key,
+                                                        file=file)
+                return_val = return_val[0]
+                # eg. return_val = {'setting_name': value, ...}
+                if return_val is not None:
+                    extremes.add(return_val)
+    except BaseException:
+        if file_store is None:
+            complete_file_dict.close()
+        raise
+    contents = extremes.update_contents(contents)
+
+    bear_settings = load_bear_settings(str(
         Path(__file__).parent / 'bear_settings.yaml'))['type2']
     full_dict = {}
 
@@ -191,6 +223,19 @@ def run_quickstartbear(contents, project_dir):
             complete_filename_list)
 
 
+@lru_cache()
+def load_bear_settings(path):
+    """
+    Parses a `bear_settings.yaml` only once, it is read for every setting
+    of every bear. The returned data must not be modified.
+    :param path:
+        The path of the `bear_settings.yaml`.
+    :return:
+        The YAML data as python objects.
+    """
+    return get_yaml_contents(path)
+
+
 def get_setting_type(setting, bear, dir=None):
     """
     Retrieves the type of setting according to cEP0022.md
@@ -214,14 +259,53 @@ def get_setting_type(setting, bear, dir=None):
     __location__ = os.path.realpath(
         os.path.join(os.getcwd(), os.path.dirname(__file__))) if (
         dir is None) else dir
-    bear_settings = get_yaml_contents(os.path.join(
+    bear_settings = load_bear_settings(os.path.join(
         __location__, 'bear_settings.yaml'))
     for type_setting in bear_settings:
+        if type_setting == rule_codes_key:
+            continue
         for bear_names in bear_settings[type_setting]:
             if bear_names in str(bear):
                 if setting in bear_settings[type_setting][bear_names]:
-                    return (type_setting,
-                            bear_settings[type_setting][bear_names][setting])
+                    return (type_setting, deepcopy(
+                        bear_settings[type_setting][bear_names][setting]))
+
+
+def get_rule_code_settings(bear, dir=None):
+    """
+    Retrieves the settings of a bear taking the codes of the rules it
+    checks from the `rule_codes` of bear_settings.yaml.
+    :param bear:
+        The bear class.
+    :param dir:
+        The directory where to look for `bear_settings.yaml`, defaults
+        to the `green_mode` directory.
+    :return:
+        An OrderedDict with the setting names as keys and 'ignore' or
+        'select' as values.
+    """
+    __location__ = os.path.realpath(
+        os.path.join(os.getcwd(), os.path.dirname(__file__))) if (
+        dir is None) else dir
+    bear_settings = load_bear_settings(os.path.join(
+        __location__, 'bear_settings.yaml'))
+    settings = OrderedDict()
+    for bear_names, kinds in bear_settings.get(rule_codes_key, {}).items():
+        if bear_names in str(bear):
+            settings.update(sorted(kinds.items()))
+    return settings
+
+
+def get_rule_code(result):
+    """
+    :param result:
+        A result of a bear.
+    :return:
+        The code of the rule in the origin of the result, like 'E501' for
+        'PycodestyleBear (E501)', or None.
+    """
+    match = _ORIGIN_CODE.search(str(getattr(result, 'origin', '')))
+    return match.group(1) if match else None
 
 
 def get_kwargs(settings, bear, contents, dir=None):
@@ -269,26 +353,32 @@ def get_kwargs(settings, bear, contents, dir=None):
     return kwargs
 
 
-def check_bear_results(ret_val, ignore_ranges):
-    if len(ret_val) == 0:
-        return True
-    elif len(ignore_ranges) == 0:
-        return False
-    # Check whether all the results lie in an ignore_ranges object
-    for result in ret_val:
-        for ignores in ignore_ranges:
-            for range_object in result.affected_code:
-                if not contained_in(range_object, ignores[1]):
-                    return False
-    return True
+def _is_ignored(result, ignore_index):
+    # Check whether the result lies in the ignore ranges of its file
+    return len(ignore_index) != 0 and all(
+        ignore_index.contains(range_object)
+        for range_object in result.affected_code)
 
 
-def _create_mp_pool(jobs: int = 0):
+def check_bear_results(ret_val, ignore_ranges):
     """
-    Create a multiprocessing pool.
+    Checks whether a bear is green, i.e. all of its results lie in the
+    ignore ranges. Stops at the first result which doesn't, so the results
+    can be given lazily.
+    :param ret_val:
+        An iterable of the results of the bear.
+    :param ignore_ranges:
+        An ``IgnoreRangeIndex`` or a collection of SourceRange objects.
+    """
+    ignore_index = get_ignore_index(ignore_ranges)
+    return all(_is_ignored(result, ignore_index) for result in ret_val)
+
 
+def _get_pool_size(jobs: int = 0):
+    """
     :param jobs: Number of jobs to run concurrently.
                  0 means auto-detect.  1 means no pool.
+    :return:     The number of processes of the pool, None for no pool.
     """
     if not isinstance(jobs, int):
         raise TypeError('jobs must be an int')
@@ -297,107 +387,473 @@ def _create_mp_pool(jobs: int = 0):
     if jobs < 0:
         raise ValueError('jobs must be 0 or a positive integer')
 
-    import multiprocessing as mp
-    cpu_count = mp.cpu_count()
+    cpu_count = get_cpu_count()
     if cpu_count <= _RESERVE_CPUS:
         return
     if jobs == 0 or jobs > cpu_count - _RESERVE_CPUS:
         jobs = cpu_count - _RESERVE_CPUS
-    pool = mp.Pool(processes=jobs)
+    return jobs
+
+
+def _create_mp_pool(jobs: int = 0, initializer=None, initargs=()):
+    """
+    Create a multiprocessing pool.
+
+    :param jobs:        Number of jobs to run concurrently.
+                        0 means auto-detect.  1 means no pool.
+    :param initializer: Called with ``initargs`` in every process.
+    """
+    processes = _get_pool_size(jobs)
+    if processes is None:
+        return
+
+    import multiprocessing as mp
+    # Forked processes start with coalib, the bears and the caches of this
+    # process already loaded, whatever the default start method is.
+    if 'fork' in mp.get_all_start_methods():
+        mp = mp.get_context('fork')
+    pool = mp.Pool(processes=processes, initializer=initializer,
+                   initargs=initargs)
     return pool
 
 
+@lru_cache()
+def _get_run_args(bear):
+    return get_all_args(bear.run)
+
+
+def _get_outcome(ret_val, ignore_ranges, origins=False):
+    """
+    Takes the results of a bear run up to the first one outside of the
+    ignore ranges, which makes the bear not green, unless the rule codes of
+    all of them are needed. A generator of results is closed then, so the
+    bear doesn't create the remaining ones.
+    """
+    results = iter(ret_val or ())
+    if origins:
+        results = list(results)
+        return (check_bear_results(results, ignore_ranges), len(results),
+                frozenset(get_rule_code(result) for result in results
+                          if not _is_ignored(result, ignore_ranges)))
+
+    count = 0
+    try:
+        for count, result in enumerate(results, 1):
+            if not _is_ignored(result, ignore_ranges):
+                return False, count
+    finally:
+        if hasattr(results, 'close'):
+            results.close()
+    return True, count
+
+
+def run_bear_test(bear, filename, arguments, file_dict, ignore_ranges,
+                  origins=False):
+    """
+    Runs a bear with one combination of setting values.
+
+    :param bear:
+        The bear class.
+    :param filename:
+        The file a local bear is run on, None for a global bear.
+    :param arguments:
+        The setting values, with the ``filename`` but without the ``file``
+        of a local bear.
+    :param file_dict:
+        A dict of file names as keys and file contents as values to those
+        keys.
+    :param ignore_ranges:
+        An ``IgnoreRangeIndex`` or a collection of SourceRange objects.
+    :param origins:
+        Whether to add the codes of the rules of the results, see
+        ``get_rule_code()``, to the tuple returned.
+    :return:
+        None if a dependency of a local bear isn't green for the values,
+        else a tuple of whether the bear is green and its number of results,
+        with a frozenset of the rule codes of the results not in the ignore
+        ranges if ``origins`` is True. Without ``origins`` the results are
+        only taken up to the first one which isn't in the ignore ranges, so
+        the number of results is a lower bound for bears which aren't green.
+    """
+    ignore_ranges = get_ignore_index(ignore_ranges)
+    if filename is None:
+        section = Section('test-section-global-bear')
+        bear_obj = bear(section=section, message_queue=None,
+                        file_dict=file_dict)
+        bear_obj.file_dict = file_dict
+        return _get_outcome(bear_obj.run(**arguments), ignore_ranges,
+                            origins)
+
+    arguments = dict(arguments, file=file_dict[filename])
+    for dep in bear.BEAR_DEPS:
+        section = Section('dep-bear')
+        bear_obj = dep(section, None)
+        dep_args = _get_run_args(dep)
+        new_arguments = {}
+        for arg_ in arguments.keys():
+            if arg_ in dep_args.keys():  # pragma: no cover
+                new_arguments[arg_] = arguments[arg_]
+        green, _ = _get_outcome(bear_obj.run(**new_arguments),
+                                ignore_ranges)
+        if not green:
+            return None
+
+    section = Section('test-section-local-bear')
+    bear_obj = bear(section, None)
+    return _get_outcome(bear_obj.run(**arguments), ignore_ranges, origins)
+
+
+def _timed_bear_test(index, bear, filename, arguments, origins, file_dict,
+                     ignore_ranges):
+    start = time.time()
+    counter = time.perf_counter()
+    cpu_start = time.process_time()
+    outcome = run_bear_test(bear, filename, arguments, file_dict,
+                            ignore_ranges, origins)
+    return (index, outcome, start, time.perf_counter() - counter,
+            time.process_time() - cpu_start)
+
+
+# The file dict and ignore ranges of a worker process of a
+# ``BearTestPool``, sent once when the process starts.
+_worker_data = {}
+
+
+def _init_worker(file_dict, ignore_ranges):
+    _worker_data['file_dict'] = file_dict
+    _worker_data['ignore_ranges'] = ignore_ranges
+
+
+def _run_in_worker(task):
+    return _timed_bear_test(*task, file_dict=_worker_data['file_dict'],
+                            ignore_ranges=_worker_data['ignore_ranges'])
+
+
+class BearTestPool:
+    """
+    Runs bear tests with ``run_bear_test()`` on a pool of processes, which
+    is started on the first use and closed at the end of the ``with``
+    block. The processes get the file dict and ignore ranges once when
+    they start, the tests only send the bear and setting values and get
+    back whether the bear is green. Without a pool the tests run in this
+    process.
+    """
+
+    # Number of chunks the tests of a bear are split into per process, to
+    # balance the load while keeping the overhead per test low.
+    CHUNKS_PER_PROCESS = 4
+
+    def __init__(self, file_dict, ignore_ranges, jobs: int = 0):
+        """
+        :param file_dict:     A dict of file names as keys and file contents
+                              as values to those keys.
+        :param ignore_ranges: An ``IgnoreRangeIndex`` or a collection of
+                              SourceRange objects.
+        :param jobs:          Number of processes, 0 means one per CPU but
+                              the reserved ones, 1 means no pool.
+        """
+        self.file_dict = file_dict
+        self.ignore_ranges = get_ignore_index(ignore_ranges)
+        self.processes = _get_pool_size(jobs)
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(terminate=exc_type is not None)
+
+    def close(self, terminate=False):
+        """
+        Stops the processes, after their running tests finished unless
+        ``terminate`` is True.
+        """
+        if self.pool is None:
+            return
+        if terminate:
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
+        self.pool = None
+
+    def run(self, bear, tests, origins=False):
+        """
+        Runs the tests of a bear, each emitted as ``bear_run`` span.
+
+        :param bear:    The bear class.
+        :param tests:   A list of tuples of the file name, None for a global
+                        bear, and the setting values, see
+                        ``run_bear_test()``.
+        :param origins: Whether to get the rule codes of the results too.
+        :return:        A list with the results of ``run_bear_test()`` in
+                        the order of the tests.
+        """
+        tasks = [(index, bear, filename, arguments, origins)
+                 for index, (filename, arguments) in enumerate(tests)]
+        parallel = (self.processes or 0) > 1 and len(tasks) > 1
+        if parallel:  # pragma nt: no cover
+            if self.pool is None:
+                self.pool = _create_mp_pool(
+                    self.processes, _init_worker,
+                    (self.file_dict, self.ignore_ranges))
+            chunksize = max(1, len(tasks) //
+                            (self.processes * self.CHUNKS_PER_PROCESS))
+            outputs = self.pool.imap_unordered(_run_in_worker, tasks,
+                                               chunksize)
+        else:
+            outputs = (_timed_bear_test(*task, file_dict=self.file_dict,
+                                        ignore_ranges=self.ignore_ranges)
+                       for task in tasks)
+
+        outcomes = [None] * len(tasks)
+        for index, outcome, start, duration, cpu in outputs:
+            if parallel:
+                # The CPU time of this thread doesn't include the workers.
+                add_cpu_time(cpu)
+            outcomes[index] = outcome
+            if outcome is None:
+                continue
+            filename, arguments = tests[index]
+            record_span(bear.__name__, 'bear_run', start, duration,
+                        bear=bear.__name__,
+                        files=1 if filename else len(self.file_dict),
+                        settings=arguments, results=outcome[1])
+        return outcomes
+
+
+def _is_green(outcome):
+    return outcome is not None and outcome[0] is True
+
+
+def _probe_combination_major(bear, combinations, files, pool, failures):
+    """
+    Tests setting combinations file by file and drops a combination as soon
+    as a file isn't green for it. The combinations left are tested on
+    chunks of the next files, doubling in size, so the first rounds, on the
+    files most likely to fail, are short, and the later ones have enough
+    tests to keep the pool busy.
+
+    :param bear:         The local bear class.
+    :param combinations: A list of dicts of setting values, without the
+                         ``filename``.
+    :param files:        The files in the order to test them.
+    :param pool:         The ``BearTestPool`` to run the tests on.
+    :param failures:     A ``Counter`` of the tests files weren't green for,
+                         which is updated.
+    :return:             A list of whether every file is green for each of
+                         the combinations.
+    """
+    green = [True] * len(combinations)
+    alive = list(range(len(combinations)))
+    start, chunk = 0, 1
+    while alive and start < len(files):
+        tests = [(index, filename) for index in alive
+                 for filename in files[start:start + chunk]]
+        outcomes = pool.run(bear, [
+            (filename, dict(combinations[index], filename=filename))
+            for index, filename in tests])
+        for (index, filename), outcome in zip(tests, outcomes):
+            if not _is_green(outcome):
+                green[index] = False
+                failures[filename] += 1
+        alive = [index for index in alive if green[index]]
+        start += chunk
+        chunk *= 2
+    return green
+
+
+def _get_inference(kwargs, rule_codes, defaults):
+    """
+    Chooses the setting taking rule codes to infer the values of, the one
+    ignoring rules if there is one.
+
+    :param kwargs:     The values to test per setting.
+    :param rule_codes: A dict of the settings taking rule codes, see
+                       ``get_rule_code_settings()``.
+    :param defaults:   A dict with the default values of the settings.
+    :return:           A tuple of the setting, its kind, its default value
+                       and the list of codes to test it with, or None.
+    """
+    settings = sorted((kind != 'ignore', setting)
+                      for setting, kind in rule_codes.items()
+                      if setting in kwargs)
+    if not settings:
+        return None
+    _, setting = settings[0]
+    return (setting, rule_codes[setting], defaults.get(setting),
+            kwargs[setting])
+
+
+def _infer_rule_codes(bear, tests, pool, inference):
+    """
+    Runs a bear without the setting taking rule codes, derives its value
+    from the rule codes of the results and runs the bear again with it to
+    verify that it's green, instead of testing every value of the setting.
+    Results without a rule code can't be avoided with it. Ignoring rules
+    only removes results, so only the files with results are verified, but
+    selecting rules can turn on rules which are off by default, so all the
+    files are.
+
+    :param bear:      The local bear class.
+    :param tests:     A list of tuples of dicts of setting values, without
+                      the inferred setting, and the list of files to test
+                      them on.
+    :param pool:      The ``BearTestPool`` to run the tests on.
+    :param inference: The tuple returned by ``_get_inference()``.
+    :return:          A list with, for each test, None if the bear isn't
+                      green for all the files with any value of the setting,
+                      else a dict with the value if it is needed.
+    """
+    setting, kind, default, codes = inference
+    runs = [(index, filename) for index, (_, files) in enumerate(tests)
+            for filename in files]
+    outcomes = pool.run(bear, [
+        (filename, dict(tests[index][0], filename=filename))
+        for index, filename in runs], origins=True)
+
+    reported = [set() for _ in tests]
+    failing = [[] for _ in tests]
+    for (index, filename), outcome in zip(runs, outcomes):
+        if outcome is None or reported[index] is None:
+            reported[index] = None
+        elif not _is_green(outcome):
+            reported[index].update(outcome[2])
+            failing[index].append(filename)
+
+    values = [None] * len(tests)
+    verification = []
+    for index, codes_found in enumerate(reported):
+        if codes_found is None or None in codes_found:
+            continue
+        if kind == 'ignore':
+            ignored = list(default) if isinstance(
+                default, (list, tuple)) else []
+            value = ignored + sorted(codes_found.difference(ignored))
+        else:
+            value = [code for code in codes if code not in codes_found]
+        values[index] = value
+        if failing[index]:
+            verification.extend(
+                (index, filename) for filename in (
+                    failing[index] if kind == 'ignore' else tests[index][1]))
+
+    outcomes = pool.run(bear, [
+        (filename, dict(tests[index][0], filename=filename,
+                        **{setting: values[index]}))
+        for index, filename in verification])
+    for (index, _), outcome in zip(verification, outcomes):
+        if not _is_green(outcome):
+            values[index] = None
+
+    return [None if value is None else
+            {setting: value} if failing[index] else {}
+            for index, value in enumerate(values)]
+
+
+def _run_searches(bear, strategy, spaces, filenames, file_dict,
+                  ignore_ranges, jobs, pool, probe_files=None,
+                  failures=None, inference=None):
+    if pool is None:
+        with BearTestPool(file_dict, ignore_ranges, jobs) as pool:
+            return _run_searches(bear, strategy, spaces, filenames,
+                                 file_dict, ignore_ranges, jobs, pool,
+                                 probe_files, failures, inference)
+
+    def evaluate(tests):
+        if inference is not None:
+            return _infer_rule_codes(
+                bear, [(arguments, probe_files or [filenames[index]])
+                       for index, arguments in tests], pool, inference)
+        if probe_files is not None:
+            return _probe_combination_major(
+                bear, [arguments for _, arguments in tests], probe_files,
+                pool, failures)
+        outcomes = pool.run(bear, [(filenames[index], arguments)
+                                   for index, arguments in tests])
+        return [_is_green(outcome) for outcome in outcomes]
+
+    return run_searches(strategy or ExhaustiveSearch(), spaces, evaluate)
+
+
 def local_bear_test(bear, file_dict, file_names, lang, kwargs,
                     ignore_ranges,
                     jobs: int = 0,
+                    pool=None,
+                    strategy=None,
+                    probing='file-major',
+                    failures=None,
+                    rule_codes=None,
                     ):
     lang_files = split_by_language(file_names)
     lang_files = {k.lower(): v for k, v in lang_files.items()}
 
-    pool = _create_mp_pool(jobs)
+    files = list(lang_files[lang.lower()])
+    inference = _get_inference(kwargs, rule_codes, {
+        setting: default for setting, (_, _, default)
+        in bear.get_metadata().optional_params.items()}) if (
+        rule_codes) else None
+    if inference is not None:
+        # The values of the settings taking rule codes aren't tested.
+        kwargs = {key: values for key, values in kwargs.items()
+                  if key not in rule_codes}
+    if probing == 'combination-major':
+        return {bear: _combination_major_bear_test(
+            bear, file_dict, files, kwargs, ignore_ranges, jobs, pool,
+            strategy, failures, inference)}
+
+    spaces = []
+    for file in files:
+        kwargs['filename'] = [file]
+        kwargs['file'] = [file_dict[file]]
+        spaces.append(OrderedDict((key, values)
+                                  for key, values in kwargs.items()
+                                  if key != 'file'))
 
     file_results = []
+    for results in _run_searches(bear, strategy, spaces, files, file_dict,
+                                 ignore_ranges, jobs, pool,
+                                 inference=inference):
+        # The sets of bear setting values found to be green
+        # for a particular file
+        file_results.extend(results)
 
-    for file in lang_files[lang.lower()]:
-        kwargs['filename'] = [file]
-        kwargs['file'] = [file_dict[file]]
+    return {bear: file_results}
 
-        results = []
-        values = []
-
-        for vals in itertools.product(*kwargs.values()):
-
-            flag = 0
-            for dep in bear.BEAR_DEPS:
-                section = Section('dep-bear')
-                bear_obj = dep(section, None)
-                arguments = dict(zip(kwargs, vals))
-                dep_args = get_all_args(dep.run)
-                new_arguments = {}
-                for arg_ in arguments.keys():
-                    if arg_ in dep_args.keys():  # pragma: no cover
-                        new_arguments[arg_] = arguments[arg_]
-                arguments = new_arguments
-                ret_val = bear_obj.run(**arguments)
-                ret_val = [] if not ret_val else list(ret_val)
-                dep_res = check_bear_results(ret_val, ignore_ranges)
-                if not dep_res:
-                    flag = 1
-            if flag == 1:
-                continue
 
-            print_val = dict(zip(kwargs, vals))
-            print_val.pop('file', None)
-            values.append(vals)
-            section = Section('test-section-local-bear')
-            bear_obj = bear(section, None)
-            ret_val = bear_obj.run(**dict(zip(kwargs, vals)))
-            ret_val = [] if not ret_val else list(ret_val)
-            if pool:  # pragma Python 3.5: no cover; pragma nt: no cover
-                results.append(pool.apply(check_bear_results,
-                                          args=(ret_val, ignore_ranges)))
-            else:  # pragma Python 3.4,3.6,3.7: no cover
-                results.append(check_bear_results(ret_val, ignore_ranges))
-
-        for index, result in enumerate(results):
-            if result is True:
-                # A set of bear setting values is found to be green
-                # for a particular file
-                arguments = dict(zip(kwargs, values[index]))
-                arguments.pop('file')
-                file_results.append(arguments)
+def _combination_major_bear_test(bear, file_dict, files, kwargs,
+                                 ignore_ranges, jobs, pool, strategy,
+                                 failures, inference):
+    """
+    Finds the setting combinations green for all of the files, testing the
+    files which weren't green most often in the earlier bear tests first,
+    then the longest ones.
 
-    return {bear: file_results}
+    :return: The per file results of the combinations green for all files.
+    """
+    failures = Counter() if failures is None else failures
+    files.sort(key=lambda filename: (-failures[filename],
+                                     -len(file_dict[filename] or ())))
+    space = OrderedDict((key, values) for key, values in kwargs.items()
+                        if key not in ('file', 'filename'))
+
+    results, = _run_searches(bear, strategy, [space], [None], file_dict,
+                             ignore_ranges, jobs, pool, files, failures,
+                             inference)
+    return [dict(arguments, filename=filename)
+            for arguments in results
+            for filename in files]
 
 
 def global_bear_test(bear, file_dict, kwargs, ignore_ranges,
                      jobs: int = 0,
+                     pool=None,
+                     strategy=None,
                      ):
-    results = []
-    values = []
-    file_results = []
-
-    pool = _create_mp_pool(jobs)
-
-    for vals in itertools.product(*kwargs.values()):
-        values.append(vals)
-        section = Section('test-section-global-bear')
-        bear_obj = bear(section=section, message_queue=None,
-                        file_dict=file_dict)
-        bear_obj.file_dict = file_dict
-        ret_val = bear_obj.run(**dict(zip(kwargs, vals)))
-        ret_val = list(ret_val)
-        if pool:  # pragma Python 3.5: no cover; pragma nt: no cover
-            results.append(pool.apply(check_bear_results,
-                                      args=(ret_val, ignore_ranges)))
-        else:  # pragma Python 3.4,3.6,3.7: no cover
-            results.append(check_bear_results(ret_val, ignore_ranges))
-
-    for index, result in enumerate(results):
-        if result is True:
-            # A set of bear setting values is found to be green for this bear
-            arguments = dict(zip(kwargs, values[index]))
-            file_results.append(arguments)
+    # The sets of bear setting values found to be green for this bear
+    file_results, = _run_searches(bear, strategy, [OrderedDict(kwargs)],
+                                  [None], file_dict, ignore_ranges, jobs,
+                                  pool)
 
     return {bear: file_results}
 
@@ -405,6 +861,11 @@ def global_bear_test(bear, file_dict, kwargs, ignore_ranges,
 def run_test_on_each_bear(bear, file_dict, file_names, lang, kwargs,
                           ignore_ranges, type_of_setting, printer=None,
                           jobs: int = 0,
+                          pool=None,
+                          strategy=None,
+                          probing='file-major',
+                          failures=None,
+                          rule_codes=None,
                           ):
     if type_of_setting == 'non-op':
         printer.print('Finding suitable values to necessary '
@@ -418,23 +879,28 @@ def run_test_on_each_bear(bear, file_dict, file_names, lang, kwargs,
                       )
     if issubclass(bear, GlobalBear):
         file_results = global_bear_test(bear, file_dict, kwargs,
-                                        ignore_ranges)
+                                        ignore_ranges, jobs, pool, strategy)
     else:
         file_results = local_bear_test(
-            bear, file_dict, file_names, lang, kwargs, ignore_ranges)
+            bear, file_dict, file_names, lang, kwargs, ignore_ranges,
+            jobs, pool, strategy, probing, failures, rule_codes)
     return file_results
 
 
 def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
                   contents, file_names, op_args_limit, value_to_op_args_limit,
                   printer=None,
-                  jobs: int = 0):
+                  jobs: int = 0,
+                  strategy=None,
+                  probing='file-major',
+                  infer_rule_codes=False):
     """
     Tests the bears with the generated file dict and list of files
     along with the values recieved for each and every type of setting
     and checks whether they yield a result or not. A setting value
     is said to be 'green' if no results are produced by the bear. The
-    bears are tested agains all possible combination of settings.
+    search strategy chooses which combinations of settings the bears are
+    tested against, by default all possible combinations.
     :param bear:
         The bears from Constants/GREEN_MODE_COMPATIBLE_BEAR_LIST along
         with Constants/IMPORTANT_BEAR_LIST.
@@ -445,7 +911,7 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
         A dict of file names as keys and file contents as values to those
         keys.
     :param ignore_ranges:
-        Collection of SourceRange objects.
+        An ``IgnoreRangeIndex`` or a collection of SourceRange objects.
     :param contents:
         The python object to be written to 'PROJECT_DATA' which
         contains the file and directory structure of the project and values
@@ -458,6 +924,21 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
     :param value_to_op_args_limit:
         The maximum number of values to run the bear again and again for
         a optioanl setting.
+    :param jobs:
+        Number of processes the bears are tested on, 0 means one per CPU.
+    :param strategy:
+        A strategy of ``search_strategies``, ``ExhaustiveSearch`` if None.
+    :param probing:
+        ``'file-major'`` to find the green settings of every file on its
+        own, ``'combination-major'`` to only find the settings green for
+        all files of a language, dropping a combination of settings at the
+        first file it isn't green for. The files which weren't green most
+        often for the bears tested before are tested first.
+    :param infer_rule_codes:
+        Whether to infer the values of the settings taking rule codes, see
+        ``get_rule_code_settings()``, from the results of the bears run
+        without them instead of testing the values, so they aren't limited
+        by ``value_to_op_args_limit``.
     :return:
         Two Result data structures, one when the bears are run only with
         non-optional settings and the other including the optional settings.
@@ -468,35 +949,51 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
     """
     final_non_op_results = []
     final_unified_results = []
-    for lang in bears:
-        for bear in bears[lang]:
-            for settings in bear_settings_obj:
-                if settings.bear == bear:
-                    # first get non optional settings
-                    non_op_set = settings.non_optional_settings
-                    op_set = settings.optional_settings
-            non_op_kwargs = get_kwargs(non_op_set, bear, contents)
-            op_kwargs = get_kwargs(op_set, bear, contents)
-            non_op_file_results = run_test_on_each_bear(
-                bear, file_dict, file_names, lang, non_op_kwargs,
-                ignore_ranges, 'non-op', printer,
-                jobs=jobs,
-                )
-            if len(op_kwargs) < op_args_limit and not(
-                    True in [len(value) > value_to_op_args_limit
-                             for key, value in op_kwargs.items()]):
-                unified_kwargs = dict(non_op_kwargs)
-                unified_kwargs.update(op_kwargs)
-                unified_file_results = run_test_on_each_bear(
-                    bear, file_dict, file_names, lang,
-                    unified_kwargs, ignore_ranges, 'unified',
-                    printer,
-                    jobs=jobs,
-                    )
-            else:
-                unified_file_results = None
-            final_non_op_results.append(non_op_file_results)
-            final_unified_results.append(unified_file_results)
+    failures = Counter()
+    with BearTestPool(file_dict, ignore_ranges, jobs) as pool:
+        for lang in bears:
+            for bear in bears[lang]:
+                for settings in bear_settings_obj:
+                    if settings.bear == bear:
+                        # first get non optional settings
+                        non_op_set = settings.non_optional_settings
+                        op_set = settings.optional_settings
+                with timed(bear.__name__, 'bear', language=lang):
+                    non_op_kwargs = get_kwargs(non_op_set, bear, contents)
+                    op_kwargs = get_kwargs(op_set, bear, contents)
+                    rule_codes = (get_rule_code_settings(bear)
+                                  if infer_rule_codes else {})
+                    non_op_file_results = run_test_on_each_bear(
+                        bear, file_dict, file_names, lang, non_op_kwargs,
+                        ignore_ranges, 'non-op', printer,
+                        jobs=jobs,
+                        pool=pool,
+                        strategy=strategy,
+                        probing=probing,
+                        failures=failures,
+                        rule_codes=rule_codes,
+                        )
+                    if len(op_kwargs) < op_args_limit and not(
+                            True in [len(value) > value_to_op_args_limit
+                                     for key, value in op_kwargs.items()
+                                     if key not in rule_codes]):
+                        unified_kwargs = dict(non_op_kwargs)
+                        unified_kwargs.update(op_kwargs)
+                        unified_file_results = run_test_on_each_bear(
+                            bear, file_dict, file_names, lang,
+                            unified_kwargs, ignore_ranges, 'unified',
+                            printer,
+                            jobs=jobs,
+                            pool=pool,
+                            strategy=strategy,
+                            probing=probing,
+                            failures=failures,
+                            rule_codes=rule_codes,
+                            )
+                    else:
+                        unified_file_results = None
+                final_non_op_results.append(non_op_file_results)
+                final_unified_results.append(unified_file_results)
 
     return final_non_op_results, final_unified_results
 
@@ -644,6 +1141,8 @@ def generate_green_mode_sections(data, project_dir, project_files,
                             escape(x, '\\') for x in ignore_list)
                         section['files'] = ', '.join(
                             escape(x, '\\') for x in dict_[key_])
+                    elif isinstance(dict_[key_], list):
+                        section[key_] = ', '.join(map(str, dict_[key_]))
                     else:
                         section[key_] = str(dict_[key_])
                     section['bears'] = bear.__name__
@@ -1,5 +1,6 @@
 import os
 
+from coala_quickstart.Timings import timed
 from coala_quickstart.generation.Utilities import (
     get_yaml_contents,
     dump_yaml_to_file,
@@ -11,16 +12,21 @@ from coala_quickstart.green_mode.green_mode import (
     initialize_project_data,
     run_quickstartbear,
     )
+from coala_quickstart.green_mode.file_store import FileStore
 from coala_quickstart.green_mode.filename_operations import (
     check_filename_prefix_postfix,
     )
+from coala_quickstart.green_mode.search_strategies import (
+    get_search_strategy,
+    )
 
 PROJECT_DATA = '.project_data.yaml'
 
 
 def green_mode(project_dir: str, ignore_globs, bears, bear_settings_obj,
                op_args_limit, value_to_op_args_limit, project_files,
-               printer=None):
+               printer=None, jobs=0, search_strategy='exhaustive',
+               probing='file-major', infer_rule_codes=False):
     """
     Runs the green mode of coala-quickstart.
 
@@ -49,6 +55,16 @@ def green_mode(project_dir: str, ignore_globs, bears, bear_settings_obj,
     :param value_to_op_args_limit:
         The maximum number of values to run the bear again and again for
         a optional setting.
+    :param jobs:
+        Number of processes the bears are tested on, 0 means one per CPU.
+    :param search_strategy:
+        The name of the strategy choosing the combinations of settings the
+        bears are tested with, a key of
+        ``search_strategies.SEARCH_STRATEGIES``.
+    :param probing:
+        ``'file-major'`` or ``'combination-major'``, see ``bear_test_fun()``.
+    :param infer_rule_codes:
+        Whether to infer the rule codes to ignore, see ``bear_test_fun()``.
     """
     from coala_quickstart.green_mode.filename_operations import (
         check_filename_prefix_postfix)
@@ -60,26 +76,35 @@ def green_mode(project_dir: str, ignore_globs, bears, bear_settings_obj,
     if os.path.isfile(project_data):
         os.remove(project_data)
 
-    if not os.path.isfile(project_data):
-        new_data = initialize_project_data(project_dir + os.sep, ignore_globs)
-        data_to_dump = {'dir_structure': new_data}
-        dump_yaml_to_file(project_data, data_to_dump)
+    with timed('project data'):
+        if not os.path.isfile(project_data):
+            new_data = initialize_project_data(project_dir + os.sep,
+                                               ignore_globs)
+            data_to_dump = {'dir_structure': new_data}
+            dump_yaml_to_file(project_data, data_to_dump)
 
-    # Operations before the running of QuickstartBear are done over here.
-    # Eg. do operations on filenames over here.
-    project_data_contents = get_yaml_contents(project_data)
-    project_data_contents = check_filename_prefix_postfix(
-        project_data_contents)
+        # Operations before the running of QuickstartBear are done over here.
+        # Eg. do operations on filenames over here.
+        project_data_contents = get_yaml_contents(project_data)
+        project_data_contents = check_filename_prefix_postfix(
+            project_data_contents)
 
-    # Run QuickstartBear
-    (project_data_contents, ignore_ranges, file_dict,
-     file_names) = run_quickstartbear(
-        project_data_contents, project_dir)
+    # Run QuickstartBear. The bear tests read the files from the shared
+    # file store, so the processes running them don't get copies of the
+    # files.
+    with FileStore() as file_dict:
+        with timed('QuickstartBear'):
+            (project_data_contents, ignore_ranges, _,
+             file_names) = run_quickstartbear(
+                project_data_contents, project_dir, file_dict)
 
-    final_non_op_results, final_unified_results = bear_test_fun(
-        bears, bear_settings_obj, file_dict,
-        ignore_ranges, project_data_contents, file_names,
-        op_args_limit, value_to_op_args_limit, printer)
+        with timed('bear tests'):
+            final_non_op_results, final_unified_results = bear_test_fun(
+                bears, bear_settings_obj, file_dict,
+                ignore_ranges, project_data_contents, file_names,
+                op_args_limit, value_to_op_args_limit, printer, jobs,
+                get_search_strategy(search_strategy), probing,
+                infer_rule_codes)
 
     # Call to create `.coafile` goes over here.
     settings_non_op = generate_data_struct_for_sections(
@@ -94,8 +119,10 @@ def green_mode(project_dir: str, ignore_globs, bears, bear_settings_obj,
         if bear not in settings_unified:
             settings_unified[bear] = settings_non_op[bear]
 
-    generate_green_mode_sections(
-        settings_unified, project_dir, project_files, ignore_globs, printer)
+    with timed('writing'):
+        generate_green_mode_sections(
+            settings_unified, project_dir, project_files, ignore_globs,
+            printer)
 
     # Final Dump.
     dump_yaml_to_file(project_data, project_data_contents)
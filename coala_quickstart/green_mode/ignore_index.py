@@ -0,0 +1,85 @@
+from bisect import bisect_right
+from collections import defaultdict
+
+
+def _get_bounds(source_range):
+    start, end = source_range.start, source_range.end
+    bounds = (start.line, start.column), (end.line, end.column)
+    if None in bounds[0] + bounds[1]:
+        return None
+    return bounds
+
+
+class IgnoreRangeIndex:
+    """
+    The ignore ranges of a project, as the sorted intervals of every file,
+    to find out in logarithmic time whether a range lies in an ignore range
+    of its file, like ``Utilities.contained_in()``.
+    """
+
+    def __init__(self, ignore_ranges=()):
+        """
+        :param ignore_ranges: The tuples of the bears and the SourceRange
+                              object of ``yield_ignore_ranges()`` to add.
+        """
+        self._count = 0
+        # The sorted starts of the intervals per file, and the greatest end
+        # of the intervals up to each of them.
+        self._starts = {}
+        self._max_ends = {}
+        self._intervals = defaultdict(list)
+        self.add(ignore_ranges)
+
+    def add(self, ignore_ranges):
+        """
+        Adds ignore ranges, sorting the intervals of their files again.
+
+        :param ignore_ranges: The tuples of the bears and the SourceRange
+                              object of ``yield_ignore_ranges()``.
+        """
+        files = set()
+        for _, source_range in ignore_ranges:
+            self._count += 1
+            bounds = _get_bounds(source_range)
+            # Ranges without lines or columns don't contain any range.
+            if bounds is not None:
+                self._intervals[source_range.start.file].append(bounds)
+                files.add(source_range.start.file)
+
+        for filename in files:
+            intervals = sorted(self._intervals[filename])
+            self._intervals[filename] = intervals
+            self._starts[filename] = [start for start, _ in intervals]
+            max_ends = []
+            for _, end in intervals:
+                max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+            self._max_ends[filename] = max_ends
+
+    def contains(self, source_range):
+        """
+        :param source_range: A SourceRange object.
+        :return:             Whether the range lies in an ignore range of
+                             its file.
+        """
+        bounds = _get_bounds(source_range)
+        starts = self._starts.get(source_range.start.file)
+        if bounds is None or starts is None:
+            return False
+        start, end = bounds
+        index = bisect_right(starts, start)
+        return index > 0 and self._max_ends[source_range.start.file][
+            index - 1] >= end
+
+    def __len__(self):
+        return self._count
+
+
+def get_ignore_index(ignore_ranges):
+    """
+    :param ignore_ranges: An ``IgnoreRangeIndex`` or a collection of the
+                          tuples of ``yield_ignore_ranges()``.
+    :return:              An ``IgnoreRangeIndex`` of the ignore ranges.
+    """
+    if isinstance(ignore_ranges, IgnoreRangeIndex):
+        return ignore_ranges
+    return IgnoreRangeIndex(ignore_ranges)
@@ -0,0 +1,334 @@
+"""
+Strategies choosing which combinations of setting values the green mode
+runs a bear with.
+
+A strategy's ``search()`` is a generator getting the values to try per
+setting. It yields lists of combinations to test, as tuples of the indices
+of the values, receives a list of whether the bear was green for each of
+them, and returns the green combinations in the order of
+``itertools.product()``. ``run_searches()`` runs the searches of several
+files together, so the tests of a round run on the process pool at once.
+"""
+import itertools
+import numbers
+from collections import OrderedDict
+
+
+def _product(space):
+    return itertools.product(*(range(len(values))
+                               for values in space.values()))
+
+
+def _replace(combination, position, index):
+    return combination[:position] + (index,) + combination[position + 1:]
+
+
+def permissiveness(setting, value):
+    """
+    Guesses how permissive a setting value is from the name of the setting,
+    for the strategies but ``ExhaustiveSearch``. Only the numbers of
+    ``max_`` and ``min_`` settings are compared, as other numeric settings
+    like ``indent_size`` aren't more permissive the bigger they are.
+
+    >>> permissiveness('max_line_length', 80) < permissiveness(
+    ...     'max_line_length', 100)
+    True
+    >>> permissiveness('min_lines_per_file', 1)
+    -1
+    >>> permissiveness('allow_trailing_whitespace', True)
+    1
+    >>> permissiveness('use_spaces', True) is None
+    True
+    >>> permissiveness('indent_size', 4) is None
+    True
+
+    :param setting: The name of the setting.
+    :param value:   The value.
+    :return:        A number, greater for more permissive values, None if
+                    the values of the setting can't be compared.
+    """
+    if isinstance(value, bool):
+        if setting.startswith(('allow_', 'ignore_')):
+            return int(value)
+        return None
+    if isinstance(value, numbers.Real):
+        if setting.startswith('max_'):
+            return value
+        if setting.startswith('min_'):
+            return -value
+    return None
+
+
+def _get_ranks(space, permissiveness):
+    """
+    :return: A list with a list of the ranks of the values per setting, 0
+             for the most permissive ones, or None for all values of a
+             setting if they can't be compared.
+    """
+    ranks = []
+    for setting, values in space.items():
+        levels = [permissiveness(setting, value) for value in values]
+        if None in levels:
+            ranks.append([None] * len(values))
+            continue
+        distinct = sorted(set(levels), reverse=True)
+        ranks.append([distinct.index(level) for level in levels])
+    return ranks
+
+
+class ExhaustiveSearch:
+    """
+    Tests every combination of the values, the reference for the other
+    strategies.
+    """
+
+    def search(self, space):
+        combinations = list(_product(space))
+        outcomes = yield combinations
+        return [combination
+                for combination, green in zip(combinations, outcomes)
+                if green]
+
+
+class OneAtATimeSearch:
+    """
+    Tests the values of every setting with the most permissive values of
+    all other settings, or their first ones if they can't be compared, then
+    only the combinations of the values of the combinations found green.
+    Combinations green only because of the interaction of several settings
+    are missed.
+    """
+
+    def __init__(self, permissiveness=permissiveness):
+        """
+        :param permissiveness: A function like ``permissiveness()``.
+        """
+        self.permissiveness = permissiveness
+
+    def search(self, space):
+        if not all(space.values()):
+            return []
+        baseline = tuple(0 if None in ranks else ranks.index(0)
+                         for ranks in _get_ranks(space,
+                                                 self.permissiveness))
+        probes = [baseline] + [_replace(baseline, position, index)
+                               for position, values in enumerate(
+                                   space.values())
+                               for index in range(len(values))
+                               if index != baseline[position]]
+        outcomes = yield probes
+        green = dict(zip(probes, outcomes))
+
+        # The values of the green probes.
+        green_indices = [sorted({probe[position] for probe in probes
+                                 if green[probe]})
+                         for position in range(len(baseline))]
+        candidates = list(itertools.product(*green_indices))
+        unknown = [combination for combination in candidates
+                   if combination not in green]
+        if unknown:
+            outcomes = yield unknown
+            green.update(zip(unknown, outcomes))
+        return [combination for combination in candidates
+                if green[combination]]
+
+
+def _is_numeric(values):
+    return all(isinstance(value, numbers.Real) and
+               not isinstance(value, bool) for value in values)
+
+
+class BinarySearch:
+    """
+    Binary searches the numeric setting with the most values which can be
+    compared, see ``permissiveness()``, for every combination of the other
+    settings, assuming the bear is green either from some value up or up to
+    some value. Without such settings of at least 3 values every combination
+    is tested.
+    """
+
+    def __init__(self, permissiveness=permissiveness):
+        """
+        :param permissiveness: A function like ``permissiveness()``.
+        """
+        self.permissiveness = permissiveness
+
+    def search(self, space):
+        ranks = _get_ranks(space, self.permissiveness)
+        numeric = [(len(values), position)
+                   for position, values in enumerate(space.values())
+                   if len(values) >= 3 and _is_numeric(values) and
+                   None not in ranks[position]]
+        if not numeric:
+            return (yield from ExhaustiveSearch().search(space))
+
+        _, position = max(numeric)
+        values = list(space.values())[position]
+        order = sorted(range(len(values)), key=ranks[position].__getitem__)
+        others = OrderedDict((name, values)
+                             for index, (name, values)
+                             in enumerate(space.items())
+                             if index != position)
+
+        def combine(outer, rank):
+            return outer[:position] + (order[rank],) + outer[position:]
+
+        outers = list(_product(others))
+        probes = [combine(outer, rank) for outer in outers
+                  for rank in (0, len(order) - 1)]
+        outcomes = iter((yield probes))
+
+        green = set()
+        # The ranks known to be green and not green of the searched outers.
+        searching = {}
+        for outer in outers:
+            low, high = next(outcomes), next(outcomes)
+            if low and high:
+                green.update(combine(outer, rank)
+                             for rank in range(len(order)))
+            elif low or high:
+                searching[outer] = ((0, len(order) - 1) if low else
+                                    (len(order) - 1, 0))
+
+        while searching:
+            probes = [(outer, (green_rank + red_rank) // 2)
+                      for outer, (green_rank, red_rank) in searching.items()
+                      if abs(green_rank - red_rank) > 1]
+            outcomes = yield [combine(outer, rank) for outer, rank in probes]
+            for (outer, rank), outcome in zip(probes, outcomes):
+                green_rank, red_rank = searching[outer]
+                searching[outer] = ((rank, red_rank) if outcome else
+                                    (green_rank, rank))
+            for outer, (green_rank, red_rank) in list(searching.items()):
+                if abs(green_rank - red_rank) <= 1:
+                    ranks = (range(green_rank, len(order))
+                             if green_rank > red_rank else
+                             range(green_rank + 1))
+                    green.update(combine(outer, rank) for rank in ranks)
+                    del searching[outer]
+
+        return [combination for combination in _product(space)
+                if combination in green]
+
+
+class DominanceSearch:
+    """
+    Tests the combinations from the most permissive values on and skips
+    the combinations which are at most as permissive as one the bear
+    wasn't green for, which would not be green either. See
+    ``permissiveness()``. Without comparable values every combination is
+    tested.
+    """
+
+    def __init__(self, permissiveness=permissiveness):
+        """
+        :param permissiveness: A function like ``permissiveness()``.
+        """
+        self.permissiveness = permissiveness
+
+    def search(self, space):
+        ranks = _get_ranks(space, self.permissiveness)
+
+        def dominates(failed, combination):
+            return all(index == failed_index or (
+                           ranks[position][index] is not None and
+                           ranks[position][index] >
+                           ranks[position][failed_index])
+                       for position, (failed_index, index)
+                       in enumerate(zip(failed, combination)))
+
+        levels = OrderedDict()
+        for combination in _product(space):
+            level = sum(ranks[position][index] or 0
+                        for position, index in enumerate(combination))
+            levels.setdefault(level, []).append(combination)
+
+        green = set()
+        failed = []
+        for level in sorted(levels):
+            candidates = [combination for combination in levels[level]
+                          if not any(dominates(failure, combination)
+                                     for failure in failed)]
+            outcomes = yield candidates
+            for combination, outcome in zip(candidates, outcomes):
+                if outcome:
+                    green.add(combination)
+                else:
+                    failed.append(combination)
+
+        return [combination for combination in _product(space)
+                if combination in green]
+
+
+SEARCH_STRATEGIES = OrderedDict([
+    ('exhaustive', ExhaustiveSearch),
+    ('one-at-a-time', OneAtATimeSearch),
+    ('binary', BinarySearch),
+    ('dominance', DominanceSearch),
+])
+
+
+def get_search_strategy(name):
+    """
+    :param name: A key of ``SEARCH_STRATEGIES``.
+    :return:     An instance of the strategy.
+    """
+    return SEARCH_STRATEGIES[name]()
+
+
+def run_searches(strategy, spaces, evaluate):
+    """
+    Runs the searches of a strategy for several spaces together, testing
+    the combinations they yield in one call of ``evaluate`` per round.
+
+    :param strategy: The search strategy.
+    :param spaces:   A list of ``OrderedDict`` objects with the setting
+                     names as keys and lists of their values as values.
+    :param evaluate: Called with a list of tuples of the index of the space
+                     and a dict of setting values, returns a list of whether
+                     the bear is green for each of them, or dicts of
+                     setting values to add to the ones found green.
+    :return:         A list with a list of the dicts of the green setting
+                     values per space.
+    """
+    def to_arguments(space, combination):
+        return OrderedDict((name, values[index])
+                           for (name, values), index
+                           in zip(space.items(), combination))
+
+    searches = [strategy.search(space) for space in spaces]
+    results = [None] * len(spaces)
+    pending = OrderedDict()
+    # The setting values added by ``evaluate`` per space and combination.
+    additions = {}
+
+    def advance(index, outcomes):
+        try:
+            pending[index] = searches[index].send(outcomes)
+        except StopIteration as stop:
+            results[index] = stop.value
+            pending.pop(index, None)
+
+    for index in range(len(spaces)):
+        advance(index, None)
+    while pending:
+        batches = list(pending.items())
+        outcomes = evaluate([(index, to_arguments(spaces[index],
+                                                  combination))
+                             for index, batch in batches
+                             for combination in batch])
+        start = 0
+        for index, batch in batches:
+            green = []
+            for combination, outcome in zip(
+                    batch, outcomes[start:start + len(batch)]):
+                if isinstance(outcome, dict):
+                    additions[index, combination] = outcome
+                green.append(isinstance(outcome, dict) or bool(outcome))
+            advance(index, green)
+            start += len(batch)
+
+    return [[dict(to_arguments(space, combination),
+                  **additions.get((index, combination), {}))
+             for combination in result]
+            for index, (space, result) in enumerate(zip(spaces, results))]
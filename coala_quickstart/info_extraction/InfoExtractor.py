@@ -1,6 +1,6 @@
 import os
 
-from coalib.parsing.Globbing import glob, fnmatch
+from coalib.parsing.Globbing import glob, glob_escape, fnmatch
 from coala_quickstart.info_extraction.Info import Info
 
 
@@ -101,16 +101,14 @@ class InfoExtractor:
         """
         Returns matched filenames acoording to the list of file globs and
         supported files of the extractor.
+
+        The globs are matched relative to ``directory`` without changing
+        the working directory, so that extractors can run concurrently.
         """
+        escaped_directory = glob_escape(directory)
         matches = []
-
-        cwd = os.getcwd()
-        os.chdir(directory)
-
         for g in file_globs:
-            matches += glob(g)
-
-        matched_files = [f for f in matches if not os.path.isdir(f)]
-        os.chdir(cwd)
+            matches += glob(os.path.join(escaped_directory, g))
 
-        return matched_files
+        return [os.path.relpath(f, directory)
+                for f in matches if not os.path.isdir(f)]
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+
+
+class InfoStore(dict):
+    """
+    A collection of ``Info`` instances, mapping the name of each kind of
+    information to the list of its instances like the plain dictionary
+    ``aggregate_info`` used to return. The instances are additionally
+    indexed by their source and the class of their extractor, and the
+    applicability of information to a section is computed once per
+    ``InfoScope`` and section.
+    """
+
+    def __init__(self, infos=()):
+        """
+        :param infos: Iterable of ``Info`` instances to add.
+        """
+        super().__init__()
+        self.by_source = OrderedDict()
+        self.by_extractor = OrderedDict()
+        self._applicable = {}
+        for info in infos:
+            self.add(info)
+
+    @classmethod
+    def from_dict(cls, info_dict):
+        """
+        Creates an ``InfoStore`` from a dictionary with the info name as key
+        and a list of ``Info`` instances as value. An ``InfoStore`` is
+        returned unchanged.
+        """
+        if isinstance(info_dict, InfoStore):
+            return info_dict
+        return cls(info for infos in info_dict.values() for info in infos)
+
+    def add(self, info):
+        """
+        Adds an ``Info`` instance to the store and its indexes.
+        """
+        self.setdefault(info.name, []).append(info)
+        self.by_source.setdefault(info.source, []).append(info)
+        self.by_extractor.setdefault(
+            type(info.extractor), []).append(info)
+        self._applicable.clear()
+
+    def get_by_kind(self, info_kind):
+        """
+        :param info_kind: An ``Info`` class or its name.
+        :return:          The list of instances of that kind.
+        """
+        if isinstance(info_kind, type):
+            info_kind = info_kind.__name__
+        return self.get(info_kind, [])
+
+    def get_by_source(self, source):
+        return self.by_source.get(source, [])
+
+    def get_by_extractor(self, extractors):
+        """
+        :param extractors: An ``InfoExtractor`` class or a tuple of them.
+        :return:           The instances extracted by instances of the given
+                           classes or their subclasses.
+        """
+        return [info
+                for extractor, infos in self.by_extractor.items()
+                if issubclass(extractor, extractors)
+                for info in infos]
+
+    def get_in_scope(self, scope, info_kind):
+        """
+        Returns the instances of the given kind allowed by the sources and
+        extractors of an ``InfoScope``, like
+        ``InfoScope.check_is_applicable_information`` without a section.
+        """
+        infos = self.get_by_kind(info_kind)
+        sources = scope.allowed_sources
+        extractors = tuple(scope.allowed_extractors)
+        if not sources and not extractors:
+            return infos
+
+        from_sources = {id(info)
+                        for source in sources
+                        for info in self.get_by_source(source)}
+        from_extractors = {id(info)
+                           for info in self.get_by_extractor(extractors)}
+        if sources and extractors:
+            allowed = from_sources & from_extractors
+        else:
+            allowed = from_sources | from_extractors
+        return [info for info in infos if id(info) in allowed]
+
+    def get_applicable(self, scope, info_kind, section):
+        """
+        Returns the instances of the given kind applicable to a section
+        according to an ``InfoScope``. The result is cached per scope, kind
+        and section.
+
+        :param scope:     An ``InfoScope`` instance.
+        :param info_kind: An ``Info`` class or its name.
+        :param section:   The section the information is used for.
+        :return:          A list of ``Info`` instances.
+        """
+        key = (id(scope), getattr(info_kind, '__name__', info_kind),
+               _section_key(section))
+        if key not in self._applicable:
+            self._applicable[key] = (
+                scope,
+                [info for info in self.get_in_scope(scope, info_kind)
+                 if scope.check_is_applicable_information(section, info)])
+        return self._applicable[key][1]
+
+
+def _section_key(section):
+    """
+    Identifies a section by its name and the files it contains, which is
+    all the applicability of information depends on.
+    """
+    if not hasattr(section, 'get'):
+        return section
+    files = section.get('files')
+    return section.name, str(files.value) if files is not None else None
@@ -395,6 +395,8 @@ if __name__ == '__main__':
           entry_points={
               'console_scripts': [
                   'coala-quickstart = coala_quickstart.coala_quickstart:main',
+                  'coala-quickstart-client = '
+                  'coala_quickstart.Daemon:client_main',
               ],
           },
           classifiers=CLASSIFIERS,
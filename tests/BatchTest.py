@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pyprint.ConsolePrinter import ConsolePrinter
+from coala_utils.ContextManagers import retrieve_stdout
+
+from coala_quickstart import Batch
+from coala_quickstart.Batch import (
+    BatchResult,
+    generate_project,
+    get_batch_summary,
+    main_batch,
+    read_manifest,
+    run_batch,
+    )
+from coala_quickstart.coala_quickstart import _get_arg_parser, main
+from tests.TestUtilities import bear_test_module
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.projects = []
+        for name in ('first', 'second'):
+            project_dir = os.path.join(self.temp_dir.name, name)
+            os.makedirs(project_dir)
+            with open(os.path.join(project_dir, 'main.py'), 'w') as file:
+                file.write('print("coala")\n')
+            self.projects.append(project_dir)
+        self.missing = os.path.join(self.temp_dir.name, 'missing')
+        self.arg_parser = _get_arg_parser()
+        self.printer = ConsolePrinter()
+        self.argv = patch('sys.argv', ['coala-quickstart', '--ci'])
+        self.argv.start()
+
+    def tearDown(self):
+        self.argv.stop()
+        self.temp_dir.cleanup()
+
+    def parse_args(self, *arg_list):
+        return self.arg_parser.parse_args(['--ci'] + list(arg_list))
+
+    def test_read_manifest(self):
+        manifest = os.path.join(self.temp_dir.name, 'manifest.txt')
+        with open(manifest, 'w') as file:
+            file.write('# projects\nfirst\n\n  {}  \n'.format(self.missing))
+        self.assertEqual(read_manifest(manifest),
+                         [self.projects[0], self.missing])
+
+    def test_generate_project(self):
+        with bear_test_module():
+            result = generate_project(self.projects[0], self.parse_args())
+        self.assertTrue(result.succeeded, result.error)
+        self.assertEqual(result.coafile,
+                         os.path.join(self.projects[0], '.coafile'))
+        with open(result.coafile) as coafile:
+            self.assertIn('[all.python]', coafile.read())
+        self.assertGreater(result.seconds, 0)
+
+        result = generate_project(self.missing, self.parse_args())
+        self.assertFalse(result.succeeded)
+        self.assertIsNone(result.coafile)
+        self.assertIn('FileNotFoundError', result.error)
+
+    def test_generate_project_incomplete_sections(self):
+        with bear_test_module():
+            result = generate_project(
+                self.projects[0],
+                self.parse_args('--allow-incomplete-sections'))
+        self.assertTrue(result.succeeded, result.error)
+
+    def test_run_batch(self):
+        args = self.arg_parser.parse_args([])
+        with bear_test_module():
+            results = run_batch(self.projects + [self.missing], args,
+                                jobs=2)
+        self.assertTrue(args.non_interactive)
+        self.assertEqual([result.project_dir for result in results],
+                         self.projects + [self.missing])
+        self.assertEqual([result.succeeded for result in results],
+                         [True, True, False])
+
+        with bear_test_module(), \
+                patch.object(Batch, 'generate_project',
+                             return_value='result') as generate:
+            self.assertEqual(run_batch(self.projects[:1], args), ['result'])
+            generate.assert_called_once_with(self.projects[0], args)
+
+        with self.assertRaises(ValueError):
+            run_batch(self.projects, args, jobs=-1)
+
+    def test_get_batch_summary(self):
+        results = [BatchResult('a', 1, 'a/.coafile'),
+                   BatchResult('b', 2, error='ValueError: b')]
+        summary = get_batch_summary(results, 4)
+        self.assertEqual(summary['projects'], 2)
+        self.assertEqual(summary['failures'], 1)
+        self.assertEqual(summary['repos_per_minute'], 30)
+        self.assertEqual(summary['results'][1],
+                         {'project_dir': 'b', 'seconds': 2, 'coafile': None,
+                          'error': 'ValueError: b'})
+        self.assertEqual(get_batch_summary([], 0)['repos_per_minute'], 0)
+
+    def test_main_batch(self):
+        manifest = os.path.join(self.temp_dir.name, 'manifest.txt')
+        with open(manifest, 'w') as file:
+            file.write('second\nmissing\n')
+        report = os.path.join(self.temp_dir.name, 'report.json')
+        args = self.parse_args('--batch', self.projects[0],
+                               '--manifest', manifest,
+                               '--jobs', '1', '--report', report)
+
+        with bear_test_module(), retrieve_stdout() as stdout:
+            self.assertEqual(main_batch(args, self.printer), 1)
+            output = stdout.getvalue()
+        self.assertIn('3 projects processed', output)
+        self.assertIn('FAILED', output)
+        with open(report) as report_file:
+            self.assertEqual(json.load(report_file)['failures'], 1)
+
+        args = self.parse_args('--batch', self.projects[1], '--jobs', '1',
+                               '--report', self.temp_dir.name)
+        with bear_test_module(), retrieve_stdout(), \
+                self.assertLogs(level='ERROR'):
+            self.assertEqual(main_batch(args, self.printer), 0)
+
+    def test_main(self):
+        sys.argv = ['coala-quickstart', '--green-mode', '--jobs', '1',
+                    '--batch', self.missing]
+        with retrieve_stdout() as stdout, \
+                self.assertLogs(level='WARNING'), \
+                patch('coala_quickstart.api.warm_up'):
+            with self.assertRaises(SystemExit) as exit_context:
+                main()
+            self.assertEqual(exit_context.exception.code, 1)
+            self.assertIn('1 projects processed', stdout.getvalue())
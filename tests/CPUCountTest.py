@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from coala_quickstart.CPUCount import (
+    get_cgroup_cpu_limit,
+    get_cgroup_paths,
+    get_cpu_count,
+    )
+
+
+class CPUCountTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, 'cgroup')
+        self.proc_self_cgroup = os.path.join(self.temp_dir.name, 'cgroup.proc')
+        self.environ = patch.dict('os.environ')
+        self.environ.start()
+        os.environ.pop('COALA_QUICKSTART_CPUS', None)
+        self.affinity = patch('os.sched_getaffinity', create=True,
+                              return_value=set(range(64)))
+        self.affinity.start()
+
+    def tearDown(self):
+        self.affinity.stop()
+        self.environ.stop()
+        self.temp_dir.cleanup()
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(content)
+
+    def write_v1(self, quota, period='100000', mount='cpu,cpuacct',
+                 path='/kubepods/pod1'):
+        self.write(self.proc_self_cgroup,
+                   '12:memory:{0}\n4:cpu,cpuacct:{0}\n'.format(path))
+        directory = os.path.join(self.root, mount, path.lstrip('/'))
+        self.write(os.path.join(directory, 'cpu.cfs_quota_us'), quota)
+        self.write(os.path.join(directory, 'cpu.cfs_period_us'), period)
+
+    def write_v2(self, cpu_max, path='/'):
+        self.write(self.proc_self_cgroup, '0::{}\n'.format(path))
+        self.write(os.path.join(self.root, path.lstrip('/'), 'cpu.max'),
+                   cpu_max)
+
+    def get_cpu_count(self):
+        return get_cpu_count(self.root, self.proc_self_cgroup)
+
+    def test_cgroup_paths(self):
+        self.write(self.proc_self_cgroup,
+                   '12:memory:/a\n4:cpu,cpuacct:/b\n0::/c\ninvalid\n')
+        self.assertEqual(get_cgroup_paths(self.proc_self_cgroup),
+                         {'memory': '/a', 'cpu': '/b', 'cpuacct': '/b',
+                          '': '/c'})
+        self.assertEqual(get_cgroup_paths(self.root), {})
+
+    def test_no_cgroup(self):
+        self.assertIsNone(get_cgroup_cpu_limit(self.root,
+                                               self.proc_self_cgroup))
+        self.assertEqual(self.get_cpu_count(), 64)
+
+    def test_cgroup_v2(self):
+        self.write_v2('400000 100000\n')
+        self.assertEqual(self.get_cpu_count(), 4)
+
+    def test_cgroup_v2_nested(self):
+        self.write_v2('150000 100000\n', '/kubepods/pod1')
+        self.assertEqual(get_cgroup_cpu_limit(self.root,
+                                              self.proc_self_cgroup), 1.5)
+        self.assertEqual(self.get_cpu_count(), 2)
+
+    def test_cgroup_v2_unlimited(self):
+        self.write_v2('max 100000\n')
+        self.assertEqual(self.get_cpu_count(), 64)
+
+    def test_cgroup_v1(self):
+        self.write_v1('400000')
+        self.assertEqual(self.get_cpu_count(), 4)
+
+    def test_cgroup_v1_mounted_as_root(self):
+        # The container only sees its own cgroup, at the root of the mount.
+        self.write(self.proc_self_cgroup, '4:cpu,cpuacct:/kubepods/pod1\n')
+        self.write(os.path.join(self.root, 'cpu', 'cpu.cfs_quota_us'),
+                   '200000')
+        self.write(os.path.join(self.root, 'cpu', 'cpu.cfs_period_us'),
+                   '100000')
+        self.assertEqual(self.get_cpu_count(), 2)
+
+    def test_cgroup_v1_unlimited(self):
+        self.write_v1('-1')
+        self.assertEqual(self.get_cpu_count(), 64)
+
+    def test_cgroup_invalid(self):
+        self.write_v1('invalid')
+        with self.assertLogs(level='WARNING') as logs:
+            self.assertEqual(self.get_cpu_count(), 64)
+        self.assertIn('Unable to parse the CPU quota', logs.output[-1])
+
+    def test_affinity(self):
+        self.write_v2('800000 100000\n')
+        with patch('os.sched_getaffinity', create=True,
+                   return_value={0, 1}):
+            self.assertEqual(self.get_cpu_count(), 2)
+
+    def test_small_quota(self):
+        self.write_v2('10000 100000\n')
+        self.assertEqual(self.get_cpu_count(), 1)
+
+    def test_environment_override(self):
+        self.write_v2('400000 100000\n')
+        os.environ['COALA_QUICKSTART_CPUS'] = '12'
+        self.assertEqual(self.get_cpu_count(), 12)
+        for value in ('0', 'many'):
+            os.environ['COALA_QUICKSTART_CPUS'] = value
+            with self.assertLogs(level='WARNING') as logs:
+                self.assertEqual(self.get_cpu_count(), 4)
+            self.assertIn('must be a positive integer', logs.output[-1])
@@ -0,0 +1,208 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from pyprint.ConsolePrinter import ConsolePrinter
+from coala_utils.ContextManagers import retrieve_stdout
+
+from coala_quickstart import VERSION
+from coala_quickstart import Daemon
+from coala_quickstart.Daemon import (
+    MAX_MESSAGE_SIZE,
+    SOCKET_FILENAME,
+    DaemonError,
+    DaemonServer,
+    client_main,
+    get_socket_path,
+    send_request,
+    serve,
+    )
+from coala_quickstart.coala_quickstart import main
+from tests.TestUtilities import bear_test_module, redirect_cache_dir
+
+
+class DaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+        # Unix socket paths are limited to about 100 characters.
+        self.temp_dir = tempfile.TemporaryDirectory(dir='/tmp')
+        self.socket_path = os.path.join(self.temp_dir.name, 'd.sock')
+        self.project_dir = os.path.join(self.temp_dir.name, 'project')
+        os.makedirs(self.project_dir)
+        with open(os.path.join(self.project_dir, 'main.py'), 'w') as file:
+            file.write('print("coala")\n')
+        self.bear_test_module = bear_test_module()
+        self.bear_test_module.__enter__()
+
+    def tearDown(self):
+        self.bear_test_module.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def start_server(self):
+        server = DaemonServer(self.socket_path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_get_socket_path(self):
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_SOCKET': self.socket_path}):
+            self.assertEqual(get_socket_path(), self.socket_path)
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_SOCKET': '',
+                         'COALA_QUICKSTART_CACHE_DIR': self.temp_dir.name}):
+            self.assertEqual(get_socket_path(),
+                             os.path.join(self.temp_dir.name,
+                                          SOCKET_FILENAME))
+
+    def test_ping(self):
+        self.start_server()
+        response = send_request({'command': 'ping'}, self.socket_path)
+        self.assertEqual(response['version'], VERSION)
+        self.assertEqual(response['pid'], os.getpid())
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_generate(self):
+        self.start_server()
+        response = send_request({'command': 'generate',
+                                 'project_dir': self.project_dir,
+                                 'args': ['--ci'],
+                                 'write': False},
+                                self.socket_path)
+        self.assertEqual([name for name, _ in response['settings']],
+                         ['all', 'all.Python'])
+        self.assertNotIn('coafile', response)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.project_dir, '.coafile')))
+
+        response = send_request({'command': 'generate',
+                                 'project_dir': self.project_dir,
+                                 'args': ['--allow-incomplete-sections']},
+                                self.socket_path)
+        self.assertEqual(response['coafile'],
+                         os.path.join(self.project_dir, '.coafile'))
+
+    def test_errors(self):
+        self.start_server()
+        for request, error in (
+                ({'command': 'unknown'}, 'Unknown command'),
+                ({}, 'KeyError'),
+                ({'command': 'generate', 'project_dir': self.project_dir,
+                  'args': ['--invalid']}, 'Invalid arguments'),
+                ({'command': 'generate', 'project_dir': self.project_dir,
+                  'args': ['--green-mode']}, 'not supported'),
+                ({'command': 'generate',
+                  'project_dir': os.path.join(self.temp_dir.name, 'no')},
+                 'FileNotFoundError')):
+            with self.assertRaisesRegex(DaemonError, error), \
+                    retrieve_stdout():
+                send_request(request, self.socket_path)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            client.sendall(b'{broken\n{"command": "ping"}\n')
+            with client.makefile('rb') as stream:
+                self.assertFalse(json.loads(stream.readline())['ok'])
+                self.assertTrue(json.loads(stream.readline())['ok'])
+
+    def test_unreachable(self):
+        with self.assertRaisesRegex(DaemonError, 'Unable to reach'):
+            send_request({'command': 'ping'}, self.socket_path)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(self.socket_path)
+            listener.listen(1)
+
+            def close_connection():
+                connection, _ = listener.accept()
+                connection.recv(MAX_MESSAGE_SIZE)
+                connection.close()
+
+            thread = threading.Thread(target=close_connection)
+            thread.start()
+            with self.assertRaisesRegex(DaemonError, 'closed'):
+                send_request({'command': 'ping'}, self.socket_path)
+            thread.join()
+
+    def test_socket_mode(self):
+        umask = os.umask(0)
+        try:
+            self.start_server()
+        finally:
+            self.assertEqual(os.umask(umask), 0)
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_socket_in_use(self):
+        self.start_server()
+        with self.assertRaisesRegex(DaemonError, 'already listening'):
+            DaemonServer(self.socket_path)
+
+    def test_stale_socket(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(self.socket_path)
+        self.start_server()
+        self.assertTrue(send_request({'command': 'ping'}, self.socket_path))
+
+        not_a_socket = os.path.join(self.temp_dir.name, 'file')
+        open(not_a_socket, 'w').close()
+        with self.assertRaisesRegex(DaemonError, 'not a socket'):
+            DaemonServer(not_a_socket)
+        self.assertTrue(os.path.exists(not_a_socket))
+
+    def test_serve_and_shutdown(self):
+        thread = threading.Thread(
+            target=serve, args=(self.socket_path, ConsolePrinter()))
+        with patch('coala_quickstart.api.warm_up'), retrieve_stdout():
+            thread.start()
+            for _ in range(500):
+                try:
+                    send_request({'command': 'ping'}, self.socket_path)
+                    break
+                except DaemonError:
+                    thread.join(0.01)
+            send_request({'command': 'shutdown'}, self.socket_path)
+            thread.join()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_client_main(self):
+        self.start_server()
+        cwd = os.getcwd()
+        os.chdir(self.project_dir)
+        self.addCleanup(os.chdir, cwd)
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_SOCKET': self.socket_path}), \
+                patch('sys.argv', ['coala-quickstart-client', '--ci']), \
+                retrieve_stdout() as stdout:
+            self.assertEqual(client_main(), 0)
+            self.assertIn('successfully generated', stdout.getvalue())
+
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_SOCKET': self.socket_path + 'x'}), \
+                self.assertLogs(level='ERROR'):
+            self.assertEqual(client_main(), 1)
+
+        os.remove(os.path.join(self.project_dir, '.coafile'))
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_SOCKET': self.socket_path + 'x'}), \
+                patch('sys.argv', ['coala-quickstart-client', '--socket',
+                                   self.socket_path, '--ci']), \
+                retrieve_stdout() as stdout:
+            self.assertEqual(client_main(), 0)
+            self.assertIn("'{}' successfully generated".format(
+                os.path.join(self.project_dir, '.coafile')),
+                stdout.getvalue())
+
+    def test_main(self):
+        with patch('sys.argv', ['coala-quickstart', '--daemon',
+                                '--socket', self.socket_path]), \
+                patch.object(Daemon, 'serve') as serve_method:
+            self.assertIsNone(main())
+            self.assertEqual(serve_method.call_args[0][0], self.socket_path)
@@ -0,0 +1,95 @@
+import threading
+import unittest
+
+from coala_quickstart.Hooks import (
+    NULL_SPAN,
+    Span,
+    add_listener,
+    remove_listener,
+    span,
+    )
+from coala_quickstart.Timings import timed
+
+
+class HooksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        add_listener(self.listener)
+
+    def tearDown(self):
+        remove_listener(self.listener)
+
+    def listener(self, event, current_span):
+        self.events.append((event, current_span))
+
+    def test_span(self):
+        with span('outer', 'stage', files=2) as outer:
+            with span('inner', 'bear_run') as inner:
+                inner.set(results=3)
+        self.assertEqual([(event, current_span.name)
+                          for event, current_span in self.events],
+                         [('start', 'outer'), ('start', 'inner'),
+                          ('end', 'inner'), ('end', 'outer')])
+        self.assertIsNone(outer.parent)
+        self.assertIs(inner.parent, outer)
+        self.assertGreaterEqual(outer.duration, inner.duration)
+        self.assertEqual(outer.end, outer.start + outer.duration)
+        self.assertEqual(inner.to_dict(),
+                         {'id': inner.id,
+                          'parent': outer.id,
+                          'name': 'inner',
+                          'kind': 'bear_run',
+                          'start': inner.start,
+                          'duration': inner.duration,
+                          'attributes': {'results': 3}})
+
+    def test_error(self):
+        with self.assertRaises(KeyError):
+            with span('failing', 'stage'):
+                raise KeyError
+        self.assertEqual(self.events[-1][1].attributes,
+                         {'error': 'KeyError'})
+
+    def test_threads(self):
+        spans = []
+
+        def run():
+            with span('thread', 'stage') as current_span:
+                spans.append(current_span)
+
+        with span('main', 'stage'):
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+        self.assertIsNone(spans[0].parent)
+
+    def test_failing_listener(self):
+        def fail(event, current_span):
+            raise ValueError('broken')
+
+        add_listener(fail)
+        try:
+            with self.assertLogs(level='WARNING') as logs, \
+                    span('stage', 'stage'):
+                pass
+        finally:
+            remove_listener(fail)
+        self.assertIn('ValueError: broken', logs.output[0])
+        self.assertEqual(len(self.events), 2)
+
+    def test_no_listeners(self):
+        remove_listener(self.listener)
+        try:
+            with span('ignored', 'stage') as current_span:
+                current_span.set(results=1)
+            self.assertIs(current_span, NULL_SPAN)
+        finally:
+            add_listener(self.listener)
+        self.assertEqual(self.events, [])
+
+    def test_timed(self):
+        with timed('stage', language='Python') as current_span:
+            self.assertIsInstance(current_span, Span)
+        self.assertEqual(current_span.kind, 'stage')
+        self.assertEqual(current_span.attributes, {'language': 'Python'})
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from pyprint.ConsolePrinter import ConsolePrinter
+from coala_utils.ContextManagers import retrieve_stdout
+
+from coala_quickstart.MemoryReport import (
+    MEMORY_REPORT_FORMAT,
+    MemoryReport,
+    format_size,
+    start_memory_report,
+    stop_memory_report,
+    )
+from coala_quickstart.Timings import start_timings, stop_timings, timed
+
+
+class MemoryReportTest(unittest.TestCase):
+
+    def tearDown(self):
+        stop_memory_report()
+        stop_timings()
+
+    def test_format_size(self):
+        self.assertEqual(format_size(0), '0 B')
+        self.assertEqual(format_size(1536), '1.5 KiB')
+        self.assertEqual(format_size(5 * 2 ** 30), '5.0 GiB')
+
+    def test_stage(self):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        report = MemoryReport()
+        with report.stage('retain'):
+            retained = [bytearray(2 ** 20)]
+            with report.stage('free'):
+                freed = bytearray(4 * 2 ** 20)
+                del freed
+        with report.stage('free'):
+            pass
+
+        self.assertEqual(list(report.records),
+                         ['retain/free', 'retain', 'free'])
+        rows = {row['stage']: row for row in report.get_rows()}
+        self.assertGreaterEqual(rows['retain']['retained'], 2 ** 20)
+        self.assertLess(abs(rows['retain/free']['retained']), 2 ** 16)
+        self.assertGreaterEqual(rows['retain/free']['peak'], 4 * 2 ** 20)
+        self.assertGreaterEqual(rows['retain']['peak'],
+                                rows['retain/free']['peak'])
+        self.assertEqual(rows['free']['calls'], 1)
+
+        self.assertEqual(rows['retain/free']['top'], [])
+        top = rows['retain']['top'][0]
+        self.assertTrue(top['site'].startswith(__file__ + ':'))
+        self.assertGreaterEqual(top['size'], 2 ** 20)
+        peaks = [row['peak'] for row in report.get_rows()]
+        self.assertEqual(peaks, sorted(peaks, reverse=True))
+        self.assertEqual(report.to_dict()['format'], MEMORY_REPORT_FORMAT)
+        self.assertEqual(report.to_dict()['peak'], rows['retain']['peak'])
+        del retained
+
+        with retrieve_stdout() as stdout:
+            report.print_report(ConsolePrinter(), sites=1)
+            lines = stdout.getvalue().splitlines()
+        self.assertEqual(lines[0].split(),
+                         ['Stage', 'Peak', 'Retained', 'Calls'])
+        self.assertIn(lines[1].split()[0], ('retain', 'retain/free'))
+        self.assertIn(__file__, '\n'.join(lines))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'memory.json')
+            report.write_json(path)
+            with open(path) as file:
+                self.assertEqual(json.load(file)['stages'],
+                                 report.to_dict()['stages'])
+
+    def test_start_and_stop(self):
+        self.assertIsNone(stop_memory_report())
+        timings = start_timings()
+        report = start_memory_report()
+        self.assertTrue(tracemalloc.is_tracing())
+        with timed('stage'):
+            pass
+        self.assertIs(stop_memory_report(), report)
+        self.assertFalse(tracemalloc.is_tracing())
+        with timed('other'):
+            pass
+        self.assertEqual(list(report.records), ['stage'])
+        self.assertEqual(list(timings.records), ['stage', 'other'])
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+
+from coala_quickstart.Hooks import span
+from coala_quickstart.MetricsExporter import (
+    PROMETHEUS_FILENAME,
+    TRACE_FILENAME,
+    MetricsExporter,
+    start_metrics_export,
+    stop_metrics_export,
+    )
+
+
+class MetricsExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'metrics')
+
+    def tearDown(self):
+        stop_metrics_export()
+        self.temp_dir.cleanup()
+
+    def test_export(self):
+        self.assertIsNone(stop_metrics_export())
+        exporter = start_metrics_export(self.directory)
+        self.assertIsInstance(exporter, MetricsExporter)
+        with span('stage', 'stage'):
+            for results in (2, 3):
+                with span('Py"Bear', 'bear_run', files=1, results=results,
+                          settings={'max_line_length': 80}):
+                    pass
+        with self.assertRaises(ValueError):
+            with span('stage', 'stage', files=True):
+                raise ValueError
+        self.assertIs(stop_metrics_export(), exporter)
+        with span('ignored', 'stage'):
+            pass
+
+        with open(os.path.join(self.directory, TRACE_FILENAME)) as file:
+            trace = [json.loads(line) for line in file]
+        self.assertEqual([item['name'] for item in trace],
+                         ['Py"Bear', 'Py"Bear', 'stage', 'stage'])
+        self.assertEqual(trace[0]['parent'], trace[2]['id'])
+        self.assertEqual(trace[1]['attributes'],
+                         {'files': 1, 'results': 3,
+                          'settings': {'max_line_length': 80}})
+
+        with open(os.path.join(self.directory,
+                               PROMETHEUS_FILENAME)) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(
+            [line for line in lines if not line.startswith('#')
+             and 'seconds' not in line],
+            ['coala_quickstart_span_spans_total'
+             '{kind="bear_run",name="Py\\"Bear"} 2',
+             'coala_quickstart_span_spans_total'
+             '{kind="stage",name="stage"} 2',
+             'coala_quickstart_span_errors_total'
+             '{kind="bear_run",name="Py\\"Bear"} 0',
+             'coala_quickstart_span_errors_total'
+             '{kind="stage",name="stage"} 1',
+             'coala_quickstart_span_files_total'
+             '{kind="bear_run",name="Py\\"Bear"} 2',
+             'coala_quickstart_span_results_total'
+             '{kind="bear_run",name="Py\\"Bear"} 5'])
+        self.assertIn('# TYPE coala_quickstart_span_seconds_total counter',
+                      lines)
+        self.assertFalse([name for name in os.listdir(self.directory)
+                          if name.endswith('.tmp')])
+
+    def test_append_trace(self):
+        for _ in range(2):
+            start_metrics_export(self.directory)
+            with span('stage', 'stage'):
+                pass
+        stop_metrics_export()
+        with open(os.path.join(self.directory, TRACE_FILENAME)) as file:
+            self.assertEqual(len(file.readlines()), 2)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from pyprint.NullPrinter import NullPrinter
+
+from coala_quickstart.Speculation import Speculation
+from coala_quickstart.generation.FileGlobs import (
+    get_project_files,
+    speculate_project_files,
+    )
+
+
+class SpeculationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.speculation = Speculation()
+        self.calls = []
+
+    def compute(self, value):
+        self.calls.append((value, threading.current_thread().name))
+        return value * 2
+
+    def test_get(self):
+        self.speculation.start('double', 1, self.compute, 1)
+        self.assertEqual(self.speculation.get('double', 1, self.compute, 1),
+                         2)
+        self.assertEqual(self.calls, [(1, 'speculation: double')])
+
+        # The result is only used once.
+        self.assertEqual(self.speculation.take('double', 1), (False, None))
+
+    def test_get_other_inputs(self):
+        self.speculation.start('double', 1, self.compute, 1)
+        self.assertEqual(self.speculation.get('double', 2, self.compute, 2),
+                         4)
+        self.assertEqual(self.calls[-1],
+                         (2, threading.current_thread().name))
+        self.assertEqual(self.speculation.take('double', 1), (False, None))
+
+    def test_get_not_started(self):
+        self.assertEqual(self.speculation.get('double', 3, self.compute, 3),
+                         6)
+
+    def test_get_error(self):
+        def fail():
+            raise ValueError('speculative')
+
+        def fail_again():
+            raise ValueError('again')
+
+        self.speculation.start('fail', None, fail)
+        with self.assertRaisesRegex(ValueError, 'again'):
+            self.speculation.get('fail', None, fail_again)
+
+    def test_cancel(self):
+        event = threading.Event()
+        self.speculation.start('wait', None, event.wait, 10)
+        self.speculation.start('double', 1, self.compute, 1)
+        self.speculation.cancel()
+        event.set()
+        self.assertEqual(self.speculation.take('wait', None), (False, None))
+        self.assertEqual(self.speculation.take('double', 1), (False, None))
+
+    def test_project_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsNone(speculate_project_files(directory))
+            for name in ('.gitignore', 'file.py', 'ignored.log'):
+                with open(os.path.join(directory, name), 'w') as file:
+                    file.write('*.log\n')
+
+            ignore_globs, files = speculate_project_files(directory)
+            self.assertEqual(sorted(files),
+                             [os.path.join(directory, '.gitignore'),
+                              os.path.join(directory, 'file.py')])
+
+            self.speculation.start('project files', directory,
+                                   lambda: (ignore_globs, ['speculated']))
+            self.assertEqual(
+                get_project_files(None, NullPrinter(), directory, None, True,
+                                  self.speculation),
+                (['speculated'], ignore_globs))
+
+            # The ignore globs changed since the speculation started.
+            self.speculation.start('project files', directory,
+                                   lambda: (['other'], ['speculated']))
+            self.assertEqual(
+                get_project_files(None, NullPrinter(), directory, None, True,
+                                  self.speculation),
+                (files, ignore_globs))
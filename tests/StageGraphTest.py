@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+import time
+import unittest
+
+from coala_quickstart.StageGraph import StageGraph
+from coala_quickstart.Timings import start_timings, stop_timings
+
+
+def sleep_and_return(seconds, value):
+    def stage(*results):
+        time.sleep(seconds)
+        return value
+    return stage
+
+
+class StageGraphTest(unittest.TestCase):
+
+    def tearDown(self):
+        stop_timings()
+
+    def test_add(self):
+        graph = StageGraph()
+        graph.add('a', int)
+        with self.assertRaisesRegex(ValueError, 'already exists'):
+            graph.add('a', int)
+        with self.assertRaisesRegex(ValueError, 'unknown stage'):
+            graph.add('b', int, ['c'])
+        with self.assertRaisesRegex(ValueError, 'main thread'):
+            graph.add('b', int, process=True, main_thread=True)
+
+    def test_run(self):
+        graph = StageGraph()
+        graph.add('a', lambda: 2)
+        graph.add('b', lambda: 3)
+        graph.add('sum', lambda a, b: a + b, ['a', 'b'])
+        graph.add('double', lambda total: 2 * total, ['sum'])
+        self.assertEqual(graph.run(),
+                         {'a': 2, 'b': 3, 'sum': 5, 'double': 10})
+
+    def test_overlap_and_critical_path(self):
+        timings = start_timings()
+        graph = StageGraph()
+        graph.add('slow', sleep_and_return(0.3, 'slow'))
+        graph.add('fast', sleep_and_return(0.1, 'fast'))
+        graph.add('after fast', sleep_and_return(0.1, None), ['fast'])
+        graph.add('end', sleep_and_return(0, None), ['slow', 'after fast'])
+        graph.run()
+
+        report = graph.get_report()
+        self.assertEqual(report['critical_stages'], ['slow', 'end'])
+        self.assertGreaterEqual(report['sequential'], 0.5)
+        self.assertGreaterEqual(report['critical_path'], 0.3)
+        self.assertEqual(timings.stage_graph, report)
+        self.assertLess(graph.stages['fast'].start,
+                        graph.stages['slow'].end)
+        self.assertLessEqual(graph.stages['fast'].end,
+                             graph.stages['after fast'].start)
+
+    def test_jobs(self):
+        graph = StageGraph()
+        graph.add('a', sleep_and_return(0.1, None))
+        graph.add('b', sleep_and_return(0.1, None))
+        graph.run(jobs=1)
+        self.assertLessEqual(graph.stages['a'].end, graph.stages['b'].start)
+
+    def test_error(self):
+        started = []
+        release = threading.Event()
+        graph = StageGraph()
+        graph.add('blocked', lambda: release.wait(10))
+        graph.add('failing', lambda: 1 / 0)
+        graph.add('dependent', lambda *results: started.append(True),
+                  ['blocked', 'failing'])
+        with self.assertRaises(ZeroDivisionError):
+            graph.run()
+        release.set()
+        self.assertEqual(started, [])
+        self.assertIsNone(graph.stages['blocked'].end)
+        self.assertEqual(graph.get_critical_path(), [])
+
+    def test_main_thread(self):
+        graph = StageGraph()
+        graph.add('background', sleep_and_return(0.2, None))
+        graph.add('main', threading.current_thread, main_thread=True)
+        graph.add('after', lambda main: threading.current_thread(), ['main'],
+                  main_thread=True)
+        graph.add('end', lambda *results: None, ['background', 'after'])
+        results = graph.run()
+        self.assertIs(results['main'], threading.current_thread())
+        self.assertIs(results['after'], threading.current_thread())
+        self.assertLess(graph.stages['after'].end,
+                        graph.stages['background'].end)
+
+    def test_main_thread_interrupted(self):
+        release = threading.Event()
+
+        def interrupted():
+            raise KeyboardInterrupt
+
+        graph = StageGraph()
+        graph.add('blocked', lambda: release.wait(10))
+        graph.add('prompt', interrupted, main_thread=True)
+        start = time.perf_counter()
+        with self.assertRaises(KeyboardInterrupt):
+            graph.run()
+        self.assertLess(time.perf_counter() - start, 5)
+        release.set()
+
+    def test_held_log_records(self):
+        messages = []
+        handler = logging.Handler()
+        handler.emit = lambda record: messages.append(record.getMessage())
+        logging.getLogger().addHandler(handler)
+        self.addCleanup(logging.getLogger().removeHandler, handler)
+        prompting = threading.Event()
+        logged = threading.Event()
+
+        def background():
+            prompting.wait(10)
+            logging.warning('background')
+            logged.set()
+
+        def prompt():
+            prompting.set()
+            logged.wait(10)
+            logging.warning('prompt')
+
+        graph = StageGraph()
+        graph.add('background', background)
+        graph.add('prompt', prompt, main_thread=True)
+        graph.run()
+        self.assertEqual(messages, ['prompt', 'background'])
+        self.assertEqual(handler.filters, [])
+
+    def test_process(self):
+        graph = StageGraph()
+        graph.add('pid', os.getpid, process=True)
+        graph.add('same', lambda pid: pid, ['pid'])
+        results = graph.run()
+        self.assertNotEqual(results['pid'], os.getpid())
+        self.assertEqual(results['same'], results['pid'])
@@ -1,4 +1,5 @@
 import os
+import tempfile
 import unittest.mock
 from contextlib import contextmanager
 
@@ -33,8 +34,9 @@ def generate_files(fnames, file_contents, directory=os.getcwd()):
 def bear_test_module():
     """
     This function mocks the ``pkg_resources.iter_entry_points()``
-    to use the testing bear module we have. Hence, it doesn't test
-    the collection of entry points.
+    and the cached entry point table of coala-quickstart to use the
+    testing bear module we have. Hence, it doesn't test the collection
+    of entry points.
     """
     bears_test_module = os.path.join(os.path.dirname(__file__),
                                      'test_bears', '__init__.py')
@@ -47,6 +49,31 @@ def bear_test_module():
                 __file__ = bears_test_module
             return PseudoPlugin()
 
+    def get_entry_points(group):
+        if group == 'coalabears':
+            return [('test_bears', 'tests.test_bears')]
+        return []
+
     with unittest.mock.patch('pkg_resources.iter_entry_points',
-                             return_value=[EntryPoint()]):
+                             return_value=[EntryPoint()]), \
+            unittest.mock.patch(
+                'coala_quickstart.generation.EntryPoints.get_entry_points',
+                side_effect=get_entry_points):
         yield
+
+
+def redirect_cache_dir(test_case):
+    """
+    Points the cache directory of coala-quickstart to a temporary directory
+    until the end of the test, so that the caches written by the test, like
+    the bear catalog and the entry point table, don't end up in the cache
+    directory of the user.
+
+    :param test_case: The ``unittest.TestCase`` running the test.
+    """
+    temp_dir = tempfile.TemporaryDirectory()
+    test_case.addCleanup(temp_dir.cleanup)
+    environ = unittest.mock.patch.dict(
+        'os.environ', {'COALA_QUICKSTART_CACHE_DIR': temp_dir.name})
+    environ.start()
+    test_case.addCleanup(environ.stop)
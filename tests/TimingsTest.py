@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from pyprint.ConsolePrinter import ConsolePrinter
+from coala_utils.ContextManagers import retrieve_stdout
+
+from coala_quickstart.Timings import (
+    TIMINGS_FORMAT,
+    Timings,
+    add_cpu_time,
+    add_recorder,
+    remove_recorder,
+    start_timings,
+    stop_timings,
+    timed,
+    )
+
+
+class TimingsTest(unittest.TestCase):
+
+    def tearDown(self):
+        stop_timings()
+
+    def test_stage(self):
+        timings = Timings()
+        with timings.stage('a'):
+            for _ in range(2):
+                with timings.stage('b'):
+                    pass
+        with self.assertRaises(ValueError):
+            with timings.stage('c'):
+                raise ValueError
+        self.assertEqual(list(timings.records), ['a/b', 'a', 'c'])
+        self.assertEqual(timings.records['a/b'][2], 2)
+        self.assertEqual(timings.records['a'][2], 1)
+        self.assertGreaterEqual(timings.records['a'][0],
+                                timings.records['a/b'][0])
+
+    def test_threads(self):
+        timings = Timings()
+
+        def run():
+            with timings.stage('thread'):
+                with timings.stage('step'):
+                    pass
+
+        with timings.stage('main'):
+            threads = [threading.Thread(target=run) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(sorted(timings.records),
+                         ['main', 'thread', 'thread/step'])
+        self.assertEqual(timings.records['thread/step'][2], 4)
+
+    def test_add_cpu_time(self):
+        add_cpu_time(10.0)
+        timings = start_timings()
+        with timed('a'):
+            with timed('b'):
+                add_cpu_time(10.0)
+            with timed('c'):
+                pass
+        self.assertGreaterEqual(timings.records['a/b'][1], 10.0)
+        self.assertGreaterEqual(timings.records['a'][1], 10.0)
+        self.assertLess(timings.records['a/c'][1], 10.0)
+
+    def test_rows(self):
+        timings = Timings()
+        timings.records['fast'] = [1.0, 0.5, 1]
+        timings.records['slow'] = [3.0, 2.0, 1]
+        timings.records['slow/step'] = [2.0, 2.0, 4]
+        self.assertEqual([row['stage'] for row in timings.get_rows()],
+                         ['slow', 'slow/step', 'fast'])
+        self.assertEqual(timings.get_total(), 4.0)
+        self.assertEqual(timings.to_dict()['format'], TIMINGS_FORMAT)
+        self.assertEqual(timings.to_dict()['stages'][1],
+                         {'stage': 'slow/step', 'wall': 2.0, 'cpu': 2.0,
+                          'calls': 4})
+
+        with retrieve_stdout() as stdout:
+            timings.print_report(ConsolePrinter())
+            lines = stdout.getvalue().splitlines()
+        self.assertEqual(lines[0].split(),
+                         ['Stage', 'Wall', '(s)', 'CPU', '(s)', 'Calls', '%'])
+        self.assertEqual(lines[1].split(),
+                         ['slow', '3.000', '2.000', '1', '75.0'])
+        self.assertEqual(lines[3].split(),
+                         ['fast', '1.000', '0.500', '1', '25.0'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'timings.json')
+            timings.write_json(path)
+            with open(path) as file:
+                self.assertEqual(json.load(file), timings.to_dict())
+
+    def test_timed(self):
+        with timed('ignored'):
+            pass
+        self.assertIsNone(stop_timings())
+
+        timings = start_timings()
+        with timed('stage'):
+            with timed('step'):
+                pass
+        self.assertIs(stop_timings(), timings)
+        with timed('ignored'):
+            pass
+        self.assertEqual(list(timings.records), ['stage/step', 'stage'])
+
+    def test_recorders(self):
+        timings = start_timings()
+        recorder = Timings()
+        add_recorder(recorder)
+        try:
+            with timed('stage'):
+                pass
+        finally:
+            remove_recorder(recorder)
+        with timed('other'):
+            pass
+        self.assertEqual(list(recorder.records), ['stage'])
+        self.assertEqual(list(timings.records), ['stage', 'other'])
+        self.assertIsNot(start_timings(), timings)
+        with timed('restarted'):
+            pass
+        self.assertNotIn('restarted', timings.records)
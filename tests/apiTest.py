@@ -0,0 +1,145 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from coala_utils.ContextManagers import retrieve_stdout
+
+from coala_quickstart.api import QuickstartSession
+from coala_quickstart.info_extraction.InfoStore import InfoStore
+from tests.TestUtilities import bear_test_module, redirect_cache_dir
+
+
+class QuickstartSessionTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.projects = []
+        for index in range(4):
+            project_dir = os.path.join(self.temp_dir.name,
+                                       'project{}'.format(index))
+            os.makedirs(project_dir)
+            with open(os.path.join(project_dir, 'main.py'), 'w') as file:
+                file.write('print("coala")\n')
+            if index % 2:
+                with open(os.path.join(project_dir, 'style.css'),
+                          'w') as file:
+                    file.write('body {}\n')
+            self.projects.append(project_dir)
+        # The session must not depend on the command line arguments.
+        self.argv = patch('sys.argv', ['coala-quickstart', '--invalid'])
+        self.argv.start()
+
+    def tearDown(self):
+        self.argv.stop()
+        self.temp_dir.cleanup()
+
+    def test_get_args(self):
+        args = QuickstartSession(self.projects[0]).get_args()
+        self.assertTrue(args.non_interactive)
+        self.assertFalse(args.incomplete_sections)
+        self.assertFalse(args.no_filter_by_capabilities)
+        self.assertIsNone(args.time_budget)
+
+        args = QuickstartSession(self.projects[0],
+                                 incomplete_sections=True,
+                                 filter_by_capabilities=False,
+                                 time_budget=2.5).get_args()
+        self.assertTrue(args.incomplete_sections)
+        self.assertTrue(args.no_filter_by_capabilities)
+        self.assertEqual(args.time_budget, 2.5)
+
+    def test_stages(self):
+        session = QuickstartSession(self.projects[1])
+        project_files, ignore_globs = session.collect_project_files()
+        self.assertEqual(sorted(os.path.basename(path)
+                                for path in project_files),
+                         ['main.py', 'style.css'])
+        self.assertEqual(ignore_globs, [])
+        self.assertIs(session.collect_project_files()[0], project_files)
+        self.assertEqual({language for language, _
+                          in session.detect_languages()},
+                         {'Python', 'CSS'})
+        self.assertIsInstance(session.collect_info(), InfoStore)
+
+        with bear_test_module():
+            relevant_bears = session.select_bears()
+        self.assertIn('All', relevant_bears)
+        self.assertNotIn(('All', 100), session.detect_languages())
+
+    def test_run(self):
+        session = QuickstartSession(self.projects[0])
+        with bear_test_module(), retrieve_stdout() as stdout:
+            settings = session.run()
+            self.assertEqual(stdout.getvalue(), '')
+        self.assertEqual(list(settings), ['all', 'all.Python'])
+        self.assertEqual(settings['all.Python']['files'], '**.py')
+        self.assertIsInstance(settings['all']['bears'], str)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.projects[0], '.coafile')))
+
+    def test_run_concurrently(self):
+        session = QuickstartSession(self.projects[0])
+        with bear_test_module():
+            graph = session.run_concurrently()
+        self.assertEqual(graph.get_critical_path()[-1], 'bear selection')
+        self.assertIsNotNone(session.all_bears)
+        self.assertIn('All', session.relevant_bears)
+
+    def test_load_bears_project_coafile(self):
+        bear_dir = os.path.join(self.temp_dir.name, 'bears')
+        os.makedirs(bear_dir)
+        with open(os.path.join(bear_dir, 'ProjectBear.py'), 'w') as file:
+            file.write('from coalib.bears.LocalBear import LocalBear\n\n\n'
+                       'class ProjectBear(LocalBear):\n'
+                       '    LANGUAGES = {"Python"}\n')
+        with open(os.path.join(self.projects[0], '.coafile'), 'w') as file:
+            file.write('[all]\nbear_dirs = {}\n'.format(bear_dir))
+
+        # The .coafile is read from the project, not the working directory.
+        for project_dir, expected in ((self.projects[0], True),
+                                      (self.projects[1], False)):
+            session = QuickstartSession(project_dir)
+            with bear_test_module():
+                local_bears, _ = session.load_bears()
+            names = {bear.__name__ for bears in local_bears.values()
+                     for bear in bears}
+            self.assertIn('TestLocalBear', names)
+            self.assertEqual('ProjectBear' in names, expected)
+
+    def test_write_coafile(self):
+        session = QuickstartSession(self.projects[0],
+                                    incomplete_sections=True)
+        with bear_test_module():
+            coafile = session.write_coafile()
+        self.assertEqual(coafile, os.path.join(self.projects[0], '.coafile'))
+        self.assertTrue(os.path.isfile(coafile))
+
+    def test_missing_project(self):
+        session = QuickstartSession(os.path.join(self.temp_dir.name, 'no'))
+        with self.assertRaises(FileNotFoundError):
+            session.run()
+
+    def test_concurrent_sessions(self):
+        with bear_test_module():
+            expected = [QuickstartSession(project_dir).run()
+                        for project_dir in self.projects]
+
+            cwd = os.getcwd()
+            results = [None] * len(self.projects)
+
+            def run(index):
+                results[index] = QuickstartSession(
+                    self.projects[index]).run()
+
+            threads = [threading.Thread(target=run, args=(index,))
+                       for index in range(len(self.projects))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, expected)
+        self.assertEqual(os.getcwd(), cwd)
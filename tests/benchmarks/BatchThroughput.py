@@ -0,0 +1,72 @@
+"""
+Throughput benchmark of the batch mode, in repositories per minute, on
+generated projects.
+
+Run it with ``python -m tests.benchmarks.BatchThroughput [projects] [jobs]``.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from coala_quickstart.Batch import get_batch_summary, run_batch
+from coala_quickstart.coala_quickstart import _get_arg_parser
+
+
+PROJECT_FILES = {
+    'setup.py': 'from setuptools import setup\n\nsetup(name="sample")\n',
+    'sample/__init__.py': 'def main():\n    return 42\n',
+    'web/index.js': 'function main() {\n  return 42;\n}\n',
+    'web/style.css': 'body {\n  margin: 0;\n}\n',
+    'README.md': '# Sample\n\nA generated project.\n',
+    'package.json': '{"name": "sample", "license": "MIT"}\n',
+    '.editorconfig': '[*]\nindent_style = space\nindent_size = 4\n',
+}
+
+
+def generate_projects(directory, count):
+    """
+    Creates ``count`` small projects with Python, JavaScript, CSS and
+    Markdown files below ``directory``.
+
+    :return: A list of the project directories.
+    """
+    projects = []
+    for index in range(count):
+        project_dir = os.path.join(directory, 'project{}'.format(index))
+        for name, content in PROJECT_FILES.items():
+            path = os.path.join(project_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(content)
+        projects.append(project_dir)
+    return projects
+
+
+def measure_throughput(projects=8, jobs=0):
+    """
+    Runs the batch mode on generated projects.
+
+    :param projects: Number of projects to generate.
+    :param jobs:     Number of worker processes, 0 means one per CPU.
+    :return:         The batch summary returned by ``get_batch_summary``.
+    """
+    args = _get_arg_parser().parse_args(['--ci'])
+    with tempfile.TemporaryDirectory() as directory:
+        project_dirs = generate_projects(directory, projects)
+        start = time.perf_counter()
+        results = run_batch(project_dirs, args, jobs)
+        return get_batch_summary(results, time.perf_counter() - start)
+
+
+def main():
+    projects = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    summary = measure_throughput(projects, jobs)
+    print('{} projects in {:.2f}s: {:.1f} repos/minute, {} failed'.format(
+        summary['projects'], summary['seconds'],
+        summary['repos_per_minute'], summary['failures']))
+
+
+if __name__ == '__main__':
+    main()
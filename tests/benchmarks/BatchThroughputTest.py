@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+
+from tests.benchmarks.BatchThroughput import (
+    PROJECT_FILES,
+    generate_projects,
+    measure_throughput,
+    )
+from tests.TestUtilities import bear_test_module, redirect_cache_dir
+
+
+class BatchThroughputTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+
+    def test_generate_projects(self):
+        with tempfile.TemporaryDirectory() as directory:
+            projects = generate_projects(directory, 2)
+            self.assertEqual(len(projects), 2)
+            for name in PROJECT_FILES:
+                self.assertTrue(os.path.isfile(
+                    os.path.join(projects[1], name)))
+
+    def test_measure_throughput(self):
+        with bear_test_module():
+            summary = measure_throughput(projects=2, jobs=1)
+        self.assertEqual(summary['projects'], 2)
+        self.assertEqual(summary['failures'], 0)
+        self.assertGreater(summary['repos_per_minute'], 0)
@@ -0,0 +1,81 @@
+"""
+Overhead of the green mode bear tests besides running the bears: starting
+the worker processes, dispatching every single test and guessing the
+setting values from the ``bear_settings.yaml`` metadata.
+
+Run it with ``python -m tests.benchmarks.BearTestOverhead [tests] [jobs]``.
+"""
+import sys
+import time
+
+from coala_quickstart.generation.SettingsClass import collect_bear_settings
+from coala_quickstart.green_mode import green_mode
+from coala_quickstart.green_mode.green_mode import (
+    BearTestPool,
+    get_kwargs,
+    settings_key,
+    )
+from tests.test_bears.AllKindsOfSettingsBaseBear import (
+    AllKindsOfSettingsBaseBear,
+    )
+from tests.test_bears.TestLocalDepBear import TestLocalDepBear
+
+
+def measure_overhead(tests=2000, jobs=2):
+    """
+    :param tests: Number of bear tests to dispatch.
+    :param jobs:  Number of worker processes, which are started even if
+                  there are less CPUs.
+    :return:      A dict with the ``startup`` seconds until the first test
+                  of a pool finished, the microseconds per test
+                  ``in_process`` and on the pool as ``per_task`` and the
+                  ``get_kwargs`` milliseconds per bear.
+    """
+    file_dict = {'file{}.py'.format(index): ['line\n'] * 10
+                 for index in range(tests // 2)}
+    bear_tests = [(filename, {'filename': filename, 'yield_results': value})
+                  for filename in sorted(file_dict)
+                  for value in (True, False)]
+
+    reserve_cpus, get_cpu_count = (green_mode._RESERVE_CPUS,
+                                   green_mode.get_cpu_count)
+    green_mode._RESERVE_CPUS = 0
+    green_mode.get_cpu_count = lambda: jobs
+    try:
+        timings = {}
+        for name, count in (('in_process', 1), ('per_task', jobs)):
+            start = time.perf_counter()
+            with BearTestPool(file_dict, [], count) as pool:
+                pool.run(TestLocalDepBear, bear_tests[:2])
+                started = time.perf_counter()
+                pool.run(TestLocalDepBear, bear_tests)
+                timings[name] = ((time.perf_counter() - started)
+                                 / len(bear_tests) * 1e6)
+            if count > 1:
+                timings['startup'] = started - start
+    finally:
+        green_mode._RESERVE_CPUS = reserve_cpus
+        green_mode.get_cpu_count = get_cpu_count
+
+    settings = collect_bear_settings({'test': {AllKindsOfSettingsBaseBear}})
+    settings = settings[0].optional_settings
+    contents = {'dir_structure': [], settings_key: []}
+    start = time.perf_counter()
+    for _ in range(5):
+        get_kwargs(settings, AllKindsOfSettingsBaseBear, contents)
+    timings['get_kwargs'] = (time.perf_counter() - start) / 5 * 1e3
+    return timings
+
+
+def main():
+    tests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    timings = measure_overhead(tests, jobs)
+    print('Pool startup:        {:8.2f} ms'.format(timings['startup'] * 1e3))
+    print('Per test in process: {:8.2f} us'.format(timings['in_process']))
+    print('Per test on pool:    {:8.2f} us'.format(timings['per_task']))
+    print('get_kwargs per bear: {:8.2f} ms'.format(timings['get_kwargs']))
+
+
+if __name__ == '__main__':
+    main()
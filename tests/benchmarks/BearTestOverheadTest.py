@@ -0,0 +1,20 @@
+import unittest
+
+from coala_quickstart.green_mode import green_mode
+from tests.benchmarks.BearTestOverhead import measure_overhead
+from tests.TestUtilities import redirect_cache_dir
+
+
+class BearTestOverheadTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+
+    def test_measure_overhead(self):
+        reserve_cpus = green_mode._RESERVE_CPUS
+        timings = measure_overhead(tests=20, jobs=2)
+        self.assertEqual(sorted(timings),
+                         ['get_kwargs', 'in_process', 'per_task', 'startup'])
+        for value in timings.values():
+            self.assertGreater(value, 0)
+        self.assertEqual(green_mode._RESERVE_CPUS, reserve_cpus)
@@ -0,0 +1,47 @@
+import importlib
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from coala_utils.ContextManagers import retrieve_stdout
+
+from tests.TestUtilities import bear_test_module, redirect_cache_dir
+
+# The benchmarks run on tiny inputs, with their command line arguments,
+# where ``{directory}`` is replaced by a temporary directory, and lines of
+# their output. Their timings are only measured when run on their own.
+BENCHMARKS = [
+    ('BatchThroughput', ['2', '1'], ['2 projects in', '0 failed']),
+    ('BearTestOverhead', ['10', '2'], ['Per test on pool']),
+    ('EarlyExit', ['10', '1'], ['All results', 'First result']),
+    ('IgnoreRanges', ['2', '10'], ['4 ignore ranges, 8 ignored lines']),
+    ('GreenModeScaling', ['2', '1'], ['Speedup', '1.00x']),
+    ('SearchStrategies', ['3'], ['dominance']),
+    ('SyntheticRepository', ['{directory}', '5'], ['Generated 5 files']),
+    ('RuleCodeInference', ['2', '5'], ['exhaustive', 'inferred']),
+]
+
+if sys.version_info >= (3, 7):
+    # ``-X importtime`` is only available since Python 3.7.
+    BENCHMARKS.append(('ImportTime', [], ['Total:']))
+
+
+class BenchmarksTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+
+    def test_main(self):
+        for name, arguments, lines in BENCHMARKS:
+            module = importlib.import_module('tests.benchmarks.' + name)
+            with self.subTest(benchmark=name), \
+                    tempfile.TemporaryDirectory() as directory:
+                argv = [name] + [argument.format(directory=directory)
+                                 for argument in arguments]
+                with bear_test_module(), patch('sys.argv', argv), \
+                        retrieve_stdout() as stdout:
+                    self.assertIn(module.main(), (None, 0))
+                    output = stdout.getvalue()
+                for line in lines:
+                    self.assertIn(line, output)
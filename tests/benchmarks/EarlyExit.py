@@ -0,0 +1,59 @@
+"""
+Time to find out that a bear isn't green on a noisy file, taking all of its
+results first against stopping at the first result outside of the ignore
+ranges.
+
+Run it with ``python -m tests.benchmarks.EarlyExit [lines] [runs]``.
+"""
+import sys
+import time
+
+from coala_quickstart.green_mode.green_mode import (
+    check_bear_results,
+    run_bear_test,
+    )
+from coalib.settings.Section import Section
+from tests.test_bears.RuleCodesBear import RuleCodesBear
+
+
+def measure_early_exit(lines=2000, runs=20):
+    """
+    Runs ``RuleCodesBear`` on a file with a result on every line.
+
+    :param lines: Number of lines of the file.
+    :param runs:  Number of runs to average.
+    :return:      A dict with the milliseconds per run taking all results
+                  as ``eager`` and stopping at the first one as ``lazy``.
+    """
+    file_dict = {'noisy.py': ['C1\n'] * lines}
+    arguments = {'filename': 'noisy.py'}
+
+    def eager():
+        bear = RuleCodesBear(Section('eager'), None)
+        results = list(bear.run(file=file_dict['noisy.py'], **arguments))
+        return check_bear_results(results, []), len(results)
+
+    def lazy():
+        return run_bear_test(RuleCodesBear, 'noisy.py', arguments,
+                             file_dict, [])
+
+    timings = {}
+    for name, function in (('eager', eager), ('lazy', lazy)):
+        start = time.perf_counter()
+        for _ in range(runs):
+            green, _ = function()
+            assert not green
+        timings[name] = (time.perf_counter() - start) / runs * 1e3
+    return timings
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    timings = measure_early_exit(lines, runs)
+    print('All results:  {:8.3f} ms'.format(timings['eager']))
+    print('First result: {:8.3f} ms'.format(timings['lazy']))
+
+
+if __name__ == '__main__':
+    main()
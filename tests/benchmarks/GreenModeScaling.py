@@ -0,0 +1,104 @@
+"""
+Scaling benchmark of the bear tests of the green mode over the number of
+processes, on generated files with a CPU bound bear.
+
+Run it with ``python -m tests.benchmarks.GreenModeScaling [files]
+[jobs ...]``. By default the numbers of processes are the powers of two up
+to the number of CPUs.
+"""
+import sys
+import time
+
+from pyprint.NullPrinter import NullPrinter
+
+from coala_quickstart.CPUCount import get_cpu_count
+from coala_quickstart.generation.SettingsClass import collect_bear_settings
+from coala_quickstart.green_mode import green_mode
+from coala_quickstart.green_mode.green_mode import bear_test_fun, settings_key
+from coalib.bears.LocalBear import LocalBear
+
+
+class BusyBear(LocalBear):
+    """
+    Spends CPU time on every line and never yields results, so every
+    combination of its settings is green.
+    """
+    LANGUAGES = {'Python'}
+
+    def run(self, filename, file, strict: bool = False,
+            verbose: bool = False, rounds: int = 200):
+        total = 0
+        for line in file:
+            for index in range(rounds):
+                total += hash((line, index, strict, verbose))
+        return []
+
+
+def generate_file_dict(files=200, lines=20):
+    """
+    :return: A dict with ``files`` Python file names as keys and their lists
+             of ``lines`` lines as values.
+    """
+    return {'file{}.py'.format(index):
+            ['value{} = {}\n'.format(line, index) for line in range(lines)]
+            for index in range(files)}
+
+
+def default_jobs():
+    """
+    :return: The powers of two up to the number of CPUs, and the number of
+             CPUs.
+    """
+    cpu_count = get_cpu_count()
+    jobs = [1]
+    while jobs[-1] * 2 <= cpu_count:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != cpu_count:
+        jobs.append(cpu_count)
+    return jobs
+
+
+def measure_scaling(files=200, jobs=None):
+    """
+    Runs ``bear_test_fun`` with ``BusyBear`` on generated files.
+
+    :param files: Number of files.
+    :param jobs:  The numbers of processes to measure, ``default_jobs()`` if
+                  None.
+    :return:      A list of dicts with the ``jobs``, ``seconds`` and the
+                  ``speedup`` over the first number of processes.
+    """
+    file_dict = generate_file_dict(files)
+    bears = {'Python': [BusyBear]}
+    bear_settings_obj = collect_bear_settings({'Python': {BusyBear}})
+    contents = {'dir_structure': [], settings_key: []}
+
+    # All the processes measured are used, none is reserved.
+    reserve_cpus = green_mode._RESERVE_CPUS
+    green_mode._RESERVE_CPUS = 0
+    rows = []
+    try:
+        for count in jobs or default_jobs():
+            start = time.perf_counter()
+            bear_test_fun(bears, bear_settings_obj, file_dict, [], contents,
+                          sorted(file_dict), 5, 5, NullPrinter(), count)
+            seconds = time.perf_counter() - start
+            rows.append({'jobs': count,
+                         'seconds': seconds,
+                         'speedup': (rows[0]['seconds'] if rows else seconds)
+                         / seconds})
+    finally:
+        green_mode._RESERVE_CPUS = reserve_cpus
+    return rows
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    jobs = [int(count) for count in sys.argv[2:]] or None
+    print('{:>6} {:>10} {:>8}'.format('Jobs', 'Seconds', 'Speedup'))
+    for row in measure_scaling(files, jobs):
+        print('{jobs:>6} {seconds:>10.3f} {speedup:>7.2f}x'.format(**row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import patch
+
+from coalib.settings.Section import Section
+
+from tests.benchmarks.GreenModeScaling import (
+    BusyBear,
+    default_jobs,
+    generate_file_dict,
+    measure_scaling,
+    )
+from tests.TestUtilities import redirect_cache_dir
+
+CPU_COUNT = 'tests.benchmarks.GreenModeScaling.get_cpu_count'
+
+
+class GreenModeScalingTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+
+    def test_generate_file_dict(self):
+        file_dict = generate_file_dict(files=3, lines=2)
+        self.assertEqual(sorted(file_dict), ['file0.py', 'file1.py',
+                                             'file2.py'])
+        self.assertEqual(file_dict['file2.py'],
+                         ['value0 = 2\n', 'value1 = 2\n'])
+
+    def test_busy_bear(self):
+        bear = BusyBear(Section('busy'), None)
+        self.assertEqual(bear.run('a.py', ['a\n'], rounds=2), [])
+
+    def test_default_jobs(self):
+        with patch(CPU_COUNT, return_value=6):
+            self.assertEqual(default_jobs(), [1, 2, 4, 6])
+        with patch(CPU_COUNT, return_value=1):
+            self.assertEqual(default_jobs(), [1])
+
+    def test_measure_scaling(self):
+        rows = measure_scaling(files=4, jobs=[1, 2])
+        self.assertEqual([row['jobs'] for row in rows], [1, 2])
+        self.assertEqual(rows[0]['speedup'], 1)
+        for row in rows:
+            self.assertGreater(row['seconds'], 0)
@@ -0,0 +1,79 @@
+"""
+Time to check the results of a bear against the ignore ranges of a project,
+scanning all of the ignore ranges for every affected range against looking
+it up in the sorted intervals of its file.
+
+Run it with ``python -m tests.benchmarks.IgnoreRanges [files] [lines]``.
+"""
+import sys
+import time
+
+from coala_quickstart.generation.Utilities import contained_in
+from coala_quickstart.green_mode.ignore_index import IgnoreRangeIndex
+from coalib.processes.Processing import yield_ignore_ranges
+from coalib.results.SourceRange import SourceRange
+
+
+def generate_file_dict(files=10, lines=200):
+    """
+    :return: A dict with ``files`` Python file names as keys and their lists
+             of ``lines`` lines as values, with an ignore comment on every
+             fifth line.
+    """
+    return {'file{}.py'.format(index):
+            ['x = 1  # noqa\n' if line % 5 == 0 else 'x = 1\n'
+             for line in range(lines)]
+            for index in range(files)}
+
+
+def measure_ignore_ranges(files=10, lines=200):
+    """
+    Checks whether a range on every line of the generated files lies in an
+    ignore range.
+
+    :param files: Number of files.
+    :param lines: Number of lines per file.
+    :return:      A dict with the number of ``ignore_ranges``, the number
+                  of ``ignored`` lines, and the milliseconds to build the
+                  index as ``build``, to check all ranges scanning the
+                  ignore ranges as ``linear`` and with the index as
+                  ``index``.
+    """
+    file_dict = generate_file_dict(files, lines)
+    ignore_ranges = list(yield_ignore_ranges(file_dict))
+    ranges = [SourceRange.from_values(filename, line, 1, line, 2)
+              for filename in sorted(file_dict)
+              for line in range(1, lines + 1)]
+
+    start = time.perf_counter()
+    index = IgnoreRangeIndex(ignore_ranges)
+    build = time.perf_counter() - start
+
+    def linear(source_range):
+        return any(contained_in(source_range, ignore)
+                   for _, ignore in ignore_ranges)
+
+    timings = {'ignore_ranges': len(ignore_ranges), 'build': build * 1e3}
+    ignored = {}
+    for name, function in (('linear', linear), ('index', index.contains)):
+        start = time.perf_counter()
+        ignored[name] = sum(map(function, ranges))
+        timings[name] = (time.perf_counter() - start) * 1e3
+    assert ignored['linear'] == ignored['index']
+    timings['ignored'] = ignored['index']
+    return timings
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    timings = measure_ignore_ranges(files, lines)
+    print('{ignore_ranges} ignore ranges, {ignored} ignored lines'
+          .format(**timings))
+    print('Index build: {:10.3f} ms'.format(timings['build']))
+    print('Linear scan: {:10.3f} ms'.format(timings['linear']))
+    print('Index:       {:10.3f} ms'.format(timings['index']))
+
+
+if __name__ == '__main__':
+    main()
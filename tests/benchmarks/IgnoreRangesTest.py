@@ -0,0 +1,12 @@
+import unittest
+
+from tests.benchmarks.IgnoreRanges import measure_ignore_ranges
+
+
+class IgnoreRangesTest(unittest.TestCase):
+
+    def test_measure_ignore_ranges(self):
+        timings = measure_ignore_ranges(files=5, lines=100)
+        self.assertEqual(timings['ignore_ranges'], 5 * 20)
+        # Every ignore comment ignores its line and the next one.
+        self.assertEqual(timings['ignored'], 5 * 40)
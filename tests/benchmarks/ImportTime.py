@@ -0,0 +1,88 @@
+"""
+Import time benchmark for the ``coala-quickstart`` entry point, based on
+the output of ``python -X importtime``.
+
+Run it with ``python -m tests.benchmarks.ImportTime [module]``.
+"""
+import json
+import os
+import subprocess
+import sys
+
+
+ENTRY_POINT_MODULE = 'coala_quickstart.coala_quickstart'
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed * 1e3, sorted(sys.modules)]))
+"""
+
+
+def parse_importtime(output):
+    """
+    Parses the output of ``python -X importtime``.
+
+    :param output:
+        The stderr of the interpreter run with ``-X importtime``.
+    :return:
+        A dict with the imported module names as keys and a tuple of
+        self and cumulative import time in microseconds as values.
+    """
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split(
+            '|', 2)
+        if not self_us.strip().isdigit():
+            # The header line of the output.
+            continue
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_import(module=ENTRY_POINT_MODULE, python=sys.executable):
+    """
+    Imports ``module`` in a fresh interpreter and returns the parsed
+    ``-X importtime`` output, which needs Python 3.7 or later.
+    """
+    env = dict(os.environ)
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    output = subprocess.check_output(
+        [python, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.STDOUT, universal_newlines=True, env=env)
+    return parse_importtime(output)
+
+
+def import_in_subprocess(module=ENTRY_POINT_MODULE, python=sys.executable):
+    """
+    Imports ``module`` in a fresh interpreter, which works on all Python
+    versions.
+
+    :return:
+        The time the import took in milliseconds and the names of the
+        modules in ``sys.modules`` after it.
+    """
+    output = subprocess.check_output(
+        [python, '-c', IMPORT_SCRIPT.format(module=module)],
+        universal_newlines=True)
+    elapsed, modules = json.loads(output)
+    return elapsed, set(modules)
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else ENTRY_POINT_MODULE
+    timings = measure_import(module)
+    print('Slowest imports for {}:'.format(module))
+    for name, (self_us, cumulative_us) in sorted(
+            timings.items(), key=lambda item: -item[1][0])[:20]:
+        print('{:>10.1f} ms {:>10.1f} ms  {}'.format(
+            self_us / 1000, cumulative_us / 1000, name))
+    print('Total: {:.1f} ms'.format(timings[module][1] / 1000))
+
+
+if __name__ == '__main__':
+    main()
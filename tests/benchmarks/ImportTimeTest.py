@@ -0,0 +1,56 @@
+import sys
+import unittest
+
+from tests.benchmarks.ImportTime import (
+    ENTRY_POINT_MODULE,
+    import_in_subprocess,
+    measure_import,
+    parse_importtime,
+    )
+
+# Budget for importing the entry point module, excluding interpreter start,
+# with a wide margin for slow machines.
+IMPORT_TIME_BUDGET_MS = 250
+
+# Subsystems which must only be imported when their stage runs.
+LAZY_MODULES = (
+    'coalib',
+    'coala_utils.FilePathCompleter',
+    'pyprint',
+    'coala_quickstart.generation.Bears',
+    'coala_quickstart.generation.SettingsClass',
+    'coala_quickstart.green_mode.green_mode_core',
+    'coala_quickstart.info_extractors',
+    )
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        output = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       120 |        120 |   os\n'
+                  'import time:      1178 |      21445 | spam.eggs\n'
+                  'some other line\n')
+        self.assertEqual(parse_importtime(output),
+                         {'os': (120, 120), 'spam.eggs': (1178, 21445)})
+
+    def test_entry_point_import_budget(self):
+        # The fastest of a few runs, as the others may be slowed down by other
+        # processes. ``-X importtime`` is only available since Python 3.7.
+        samples = []
+        for _ in range(3):
+            if sys.version_info >= (3, 7):
+                timings = measure_import(ENTRY_POINT_MODULE)
+                samples.append(timings[ENTRY_POINT_MODULE][1] / 1000)
+            else:
+                samples.append(import_in_subprocess(ENTRY_POINT_MODULE)[0])
+        self.assertLess(min(samples), IMPORT_TIME_BUDGET_MS)
+
+    def test_entry_point_lazy_imports(self):
+        _, imported = import_in_subprocess(ENTRY_POINT_MODULE)
+        for module in imported:
+            for lazy_module in LAZY_MODULES:
+                self.assertFalse(
+                    module == lazy_module or
+                    module.startswith(lazy_module + '.'),
+                    '{} is imported eagerly'.format(module))
@@ -0,0 +1,193 @@
+"""
+Benchmark of the scan, language detection, info extraction and settings
+generation stages on synthetic repositories of increasing size, with the
+time and memory of every stage compared against a stored baseline.
+
+Run it with ``python -m tests.benchmarks.Pipeline [--scales 1000 10000]
+[--baseline FILE] [--save-baseline FILE]``. Only the two smallest of the
+``SCALES`` are run by default.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from pyprint.NullPrinter import NullPrinter
+
+from coala_quickstart.generation.FileGlobs import get_project_files
+from coala_quickstart.generation.InfoCollector import collect_info
+from coala_quickstart.generation.Project import language_percentage
+from coala_quickstart.generation.Settings import generate_settings
+from coala_quickstart.generation.Utilities import split_by_language
+from coala_quickstart.MemoryReport import (
+    format_size,
+    start_memory_report,
+    stop_memory_report,
+    )
+from coala_quickstart.Timings import start_timings, stop_timings, timed
+from tests.benchmarks.SyntheticRepository import generate_repository
+
+
+SCALES = (1000, 10000, 100000, 1000000)
+
+STAGES = ('get_project_files', 'language_percentage', 'split_by_language',
+          'collect_info', 'generate_settings')
+
+BASELINE_FORMAT = 1
+
+# A stage regressed if it got slower than this factor of the baseline...
+DEFAULT_TOLERANCE = 1.25
+# ... and by more than this many seconds, to ignore the noise of fast
+# stages.
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def run_pipeline(project_dir):
+    """
+    Runs the stages on a project, each of them marked with
+    ``Timings.timed()``.
+    """
+    with timed('get_project_files'):
+        project_files, ignore_globs = get_project_files(
+            None, NullPrinter(), project_dir, None, True)
+    with timed('language_percentage'):
+        language_percentage(project_files)
+    with timed('split_by_language'):
+        lang_files = split_by_language(project_files)
+    with timed('collect_info'):
+        extracted_info = collect_info(project_dir)
+
+    # Sections without bears, the settings generation without the bears is
+    # measured.
+    relevant_bears = {lang: set() for lang in lang_files if lang != 'all'}
+    relevant_bears['All'] = set()
+    with timed('generate_settings'):
+        generate_settings(project_dir, project_files, ignore_globs,
+                          relevant_bears, extracted_info)
+    return project_files
+
+
+def measure_pipeline(files, memory=True, **generator_args):
+    """
+    Generates a repository and runs the pipeline on it.
+
+    :param files:          Number of files of the repository.
+    :param memory:         Whether to trace the memory of the stages, which
+                           slows them down.
+    :param generator_args: Further arguments of ``generate_repository``.
+    :return:               A dict with the stages as keys and dicts with
+                           their ``seconds`` and, if traced, ``peak`` and
+                           ``retained`` memory in bytes as values.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        generate_repository(directory, files, **generator_args)
+        if memory:
+            start_memory_report()
+        timings = start_timings()
+        try:
+            run_pipeline(directory)
+        finally:
+            stop_timings()
+            report = stop_memory_report()
+
+    results = {stage: {'seconds': timings.records[stage][0]}
+               for stage in STAGES}
+    if report is not None:
+        for row in report.get_rows():
+            if row['stage'] in results:
+                results[row['stage']].update(peak=row['peak'],
+                                             retained=row['retained'])
+    return results
+
+
+def run_benchmarks(scales=SCALES, memory=True):
+    """
+    :return: The results of ``measure_pipeline`` per scale, with the scales
+             as string keys to match the JSON baseline.
+    """
+    return {str(files): measure_pipeline(files, memory) for files in scales}
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    :param results:   The results of ``run_benchmarks``.
+    :param baseline:  Results of an earlier run to compare to.
+    :param tolerance: The factor a stage may get slower by.
+    :return:          A list of tuples of the scale, stage, baseline and
+                      current seconds of the regressed stages.
+    """
+    regressions = []
+    for scale, stages in sorted(results.items(), key=lambda i: int(i[0])):
+        for stage, result in sorted(stages.items()):
+            before = baseline.get(scale, {}).get(stage, {}).get('seconds')
+            if before is None:
+                continue
+            seconds = result['seconds']
+            if (seconds > before * tolerance and
+                    seconds - before > MIN_REGRESSION_SECONDS):
+                regressions.append((scale, stage, before, seconds))
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as file:
+        json.dump({'format': BASELINE_FORMAT, 'results': results}, file,
+                  indent=2, sort_keys=True)
+
+
+def print_results(results, baseline=None):
+    print('{:>8}  {:<20} {:>10} {:>10} {:>10} {:>10}'.format(
+        'Files', 'Stage', 'Seconds', 'Baseline', 'Peak', 'Retained'))
+    for scale, stages in sorted(results.items(), key=lambda i: int(i[0])):
+        for stage in STAGES:
+            result = stages[stage]
+            before = (baseline or {}).get(scale, {}).get(stage, {})
+            print('{:>8}  {:<20} {:>10.3f} {:>10} {:>10} {:>10}'.format(
+                scale, stage, result['seconds'],
+                '{:.3f}'.format(before['seconds'])
+                if 'seconds' in before else '-',
+                format_size(result['peak']) if 'peak' in result else '-',
+                format_size(result['retained'])
+                if 'retained' in result else '-'))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m tests.benchmarks.Pipeline')
+    arg_parser.add_argument('--scales', nargs='+', type=int,
+                            default=list(SCALES[:2]),
+                            help='numbers of files of the repositories')
+    arg_parser.add_argument('--baseline', metavar='FILE',
+                            help='compare to the baseline in FILE')
+    arg_parser.add_argument('--save-baseline', metavar='FILE',
+                            help='store the results as baseline in FILE')
+    arg_parser.add_argument('--tolerance', type=float,
+                            default=DEFAULT_TOLERANCE,
+                            help='factor a stage may get slower by')
+    arg_parser.add_argument('--no-memory', action='store_true',
+                            help='don\'t trace the memory of the stages')
+    args = arg_parser.parse_args()
+
+    baseline = (load_baseline(args.baseline)
+                if args.baseline and os.path.exists(args.baseline) else None)
+    results = run_benchmarks(args.scales, not args.no_memory)
+    print_results(results, baseline)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+
+    regressions = compare_to_baseline(results, baseline or {},
+                                      args.tolerance)
+    for scale, stage, before, seconds in regressions:
+        print('Regression: {} on {} files took {:.3f}s instead of '
+              '{:.3f}s'.format(stage, scale, seconds, before))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
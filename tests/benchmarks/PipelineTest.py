@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from coala_utils.ContextManagers import retrieve_stdout
+
+from tests.benchmarks.Pipeline import (
+    STAGES,
+    compare_to_baseline,
+    main,
+    measure_pipeline,
+    run_pipeline,
+    )
+from tests.benchmarks.SyntheticRepository import (
+    IGNORED_DIR,
+    generate_repository,
+    )
+from tests.TestUtilities import redirect_cache_dir
+
+
+class PipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+
+    def test_run_pipeline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = generate_repository(directory, 100, ignored_ratio=0.2)
+            project_files = run_pipeline(directory)
+        ignored = [path for path in paths
+                   if path.startswith(IGNORED_DIR + os.sep)]
+        self.assertTrue(ignored)
+        self.assertEqual(len(project_files),
+                         len(paths) - len(ignored) + 4)
+
+    def test_measure_pipeline(self):
+        results = measure_pipeline(20)
+        self.assertEqual(sorted(results), sorted(STAGES))
+        for result in results.values():
+            self.assertGreaterEqual(result['seconds'], 0)
+            self.assertGreater(result['peak'], 0)
+
+        results = measure_pipeline(20, memory=False, depth=1)
+        self.assertNotIn('peak', results['collect_info'])
+
+    def test_compare_to_baseline(self):
+        baseline = {'1000': {'collect_info': {'seconds': 1.0},
+                             'generate_settings': {'seconds': 0.01}}}
+        results = {'1000': {'collect_info': {'seconds': 1.5},
+                            'generate_settings': {'seconds': 0.03},
+                            'split_by_language': {'seconds': 9.0}},
+                   '10000': {'collect_info': {'seconds': 9.0}}}
+        self.assertEqual(compare_to_baseline(results, baseline),
+                         [('1000', 'collect_info', 1.0, 1.5)])
+        self.assertEqual(compare_to_baseline(results, baseline, 2), [])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, 'baseline.json')
+            argv = ['Pipeline', '--scales', '10', '--no-memory',
+                    '--baseline', baseline, '--save-baseline', baseline]
+            with patch('sys.argv', argv), retrieve_stdout() as stdout:
+                self.assertEqual(main(), 0)
+                self.assertIn('collect_info', stdout.getvalue())
+            with open(baseline) as file:
+                stored = json.load(file)
+            self.assertEqual(sorted(stored['results']['10']), sorted(STAGES))
+
+            for result in stored['results']['10'].values():
+                result['seconds'] = -1
+            with open(baseline, 'w') as file:
+                json.dump(stored, file)
+            with patch('sys.argv', argv[:-2]), retrieve_stdout() as stdout:
+                self.assertEqual(main(), 1)
+                self.assertIn('Regression: collect_info on 10 files',
+                              stdout.getvalue())
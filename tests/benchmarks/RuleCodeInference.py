@@ -0,0 +1,84 @@
+"""
+Number of bear invocations to find the green rule codes to ignore and
+select of a linter, testing every code against inferring them from the
+results of one run per file, on generated files violating a few rules
+each.
+
+Run it with ``python -m tests.benchmarks.RuleCodeInference [files]
+[codes]``.
+"""
+import sys
+import time
+from collections import OrderedDict
+
+from coala_quickstart.Hooks import add_listener, remove_listener
+from coala_quickstart.green_mode.green_mode import local_bear_test
+from tests.test_bears.RuleCodesBear import RuleCodesBear
+
+RULE_CODES = {'ignore': 'ignore', 'select': 'select'}
+
+
+def generate_file_dict(files=10, codes=40):
+    """
+    :return: A dict with ``files`` Python file names as keys and their lists
+             of lines naming some of the first ``codes`` rule codes as
+             values.
+    """
+    return {'file{}.py'.format(index):
+            ['C{}\n'.format((index * 7 + line * 3) % codes + 1)
+             for line in range(index % 4)] + ['ok\n']
+            for index in range(files)}
+
+
+def measure_inference(files=10, codes=40):
+    """
+    Runs ``local_bear_test`` of ``RuleCodesBear`` with every code as value
+    of its ``ignore`` and ``select`` settings, and again inferring them.
+
+    :param files: Number of files.
+    :param codes: Number of rule codes.
+    :return:      A list of dicts with the ``mode``, the number of bear
+                  ``invocations``, the ``seconds`` and the number of files
+                  found to be green with some settings as ``green_files``.
+    """
+    file_dict = generate_file_dict(files, codes)
+    values = ['C{}'.format(code) for code in range(1, codes + 1)]
+    invocations = []
+
+    def count(event, span):
+        if event == 'end' and span.kind == 'bear_run':
+            invocations.append(span)
+
+    rows = []
+    add_listener(count)
+    try:
+        for mode, rule_codes in (('exhaustive', None),
+                                 ('inferred', RULE_CODES)):
+            del invocations[:]
+            start = time.perf_counter()
+            results = local_bear_test(
+                RuleCodesBear, file_dict, sorted(file_dict), 'Python',
+                OrderedDict([('ignore', values), ('select', values)]), [],
+                jobs=1, rule_codes=rule_codes)[RuleCodesBear]
+            rows.append({'mode': mode,
+                         'invocations': len(invocations),
+                         'seconds': time.perf_counter() - start,
+                         'green_files': len({arguments['filename']
+                                             for arguments in results})})
+    finally:
+        remove_listener(count)
+    return rows
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    codes = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    print('{:<11} {:>11} {:>9} {:>11}'.format('Mode', 'Invocations',
+                                              'Seconds', 'Green files'))
+    for row in measure_inference(files, codes):
+        print('{mode:<11} {invocations:>11} {seconds:>9.3f} '
+              '{green_files:>11}'.format(**row))
+
+
+if __name__ == '__main__':
+    main()
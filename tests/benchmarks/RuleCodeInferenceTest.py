@@ -0,0 +1,14 @@
+import unittest
+
+from tests.benchmarks.RuleCodeInference import measure_inference
+
+
+class RuleCodeInferenceTest(unittest.TestCase):
+
+    def test_measure_inference(self):
+        exhaustive, inferred = measure_inference(files=4, codes=10)
+        self.assertEqual(exhaustive['mode'], 'exhaustive')
+        self.assertEqual(exhaustive['invocations'], 4 * 10 * 10)
+        # One run per file and one more for the files with results.
+        self.assertEqual(inferred['invocations'], 4 + 3)
+        self.assertEqual(inferred['green_files'], 4)
@@ -0,0 +1,117 @@
+"""
+Number of bear invocations of the green mode search strategies with file
+and combination major probing, and the share of the green setting
+combinations of the exhaustive file major search they find, on generated
+files with a bear whose results depend on its settings.
+
+Run it with ``python -m tests.benchmarks.SearchStrategies [files]``.
+"""
+import sys
+from collections import OrderedDict
+
+from coala_quickstart.Hooks import add_listener, remove_listener
+from coala_quickstart.green_mode.green_mode import local_bear_test
+from coala_quickstart.green_mode.search_strategies import (
+    SEARCH_STRATEGIES,
+    get_search_strategy,
+    )
+from coalib.bears.LocalBear import LocalBear
+
+SETTINGS = OrderedDict([
+    ('max_line_length', list(range(60, 161, 10))),
+    ('allow_trailing_whitespace', [False, True]),
+    ('ignore_comments', [False, True]),
+    ('use_spaces', [True, False]),
+])
+
+
+class StyleBear(LocalBear):
+    """
+    Yields a result for every line violating its settings. The longer lines
+    allowed and the more lines ignored, the less results.
+    """
+    LANGUAGES = {'Python'}
+
+    def run(self, filename, file, max_line_length: int = 80,
+            allow_trailing_whitespace: bool = False,
+            ignore_comments: bool = False, use_spaces: bool = True):
+        for line in file:
+            if ignore_comments and line.lstrip().startswith('#'):
+                continue
+            content = line.rstrip('\n')
+            if (len(content) > max_line_length or
+                    (not allow_trailing_whitespace and
+                     content != content.rstrip()) or
+                    content.startswith('\t' if use_spaces else '    ')):
+                yield line
+
+
+def generate_file_dict(files=20):
+    """
+    :return: A dict with ``files`` Python file names as keys and their lists
+             of lines, of different lengths per file, as values.
+    """
+    return {'file{}.py'.format(index):
+            ['    value = {!r}\n'.format('x' * (7 * index % 100)),
+             '# comment {} \n'.format('y' * (5 * index % 140))]
+            for index in range(files)}
+
+
+def measure_strategies(files=20):
+    """
+    Runs ``local_bear_test`` of ``StyleBear`` on generated files with every
+    strategy of ``SEARCH_STRATEGIES`` and both probings.
+
+    :param files: Number of files.
+    :return:      A list of dicts with the ``strategy``, the ``probing``,
+                  the number of bear ``invocations``, the number of
+                  ``green`` combinations per file found and the share of
+                  the ones of the exhaustive file major search as
+                  ``recall``.
+    """
+    file_dict = generate_file_dict(files)
+    invocations = []
+
+    def count(event, span):
+        if event == 'end' and span.kind == 'bear_run':
+            invocations.append(span)
+
+    rows = []
+    reference = None
+    add_listener(count)
+    try:
+        for probing in ('file-major', 'combination-major'):
+            for name in SEARCH_STRATEGIES:
+                del invocations[:]
+                results = local_bear_test(
+                    StyleBear, file_dict, sorted(file_dict), 'Python',
+                    OrderedDict(SETTINGS), [], jobs=1,
+                    strategy=get_search_strategy(name),
+                    probing=probing)[StyleBear]
+                green = {tuple(sorted(arguments.items()))
+                         for arguments in results}
+                if reference is None:
+                    reference = green
+                rows.append({'strategy': name,
+                             'probing': probing,
+                             'invocations': len(invocations),
+                             'green': len(green),
+                             'recall': (len(green & reference) /
+                                        len(reference)
+                                        if reference else 1.0)})
+    finally:
+        remove_listener(count)
+    return rows
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print('{:<15} {:<18} {:>11} {:>7} {:>7}'.format(
+        'Strategy', 'Probing', 'Invocations', 'Green', 'Recall'))
+    for row in measure_strategies(files):
+        print('{strategy:<15} {probing:<18} {invocations:>11} {green:>7} '
+              '{recall:>7.1%}'.format(**row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+import unittest
+
+from coala_quickstart.green_mode.search_strategies import SEARCH_STRATEGIES
+from tests.benchmarks.SearchStrategies import measure_strategies
+
+
+class SearchStrategiesTest(unittest.TestCase):
+
+    def test_measure_strategies(self):
+        rows = measure_strategies(files=8)
+        self.assertEqual([(row['probing'], row['strategy']) for row in rows],
+                         [(probing, name)
+                          for probing in ('file-major', 'combination-major')
+                          for name in SEARCH_STRATEGIES])
+        exhaustive = rows[0]
+        self.assertEqual(exhaustive['invocations'], 8 * 88)
+        self.assertEqual(exhaustive['recall'], 1.0)
+        for row in rows[1:]:
+            self.assertLess(row['invocations'], exhaustive['invocations'])
+        for row in rows[1:4]:
+            self.assertEqual(row['recall'], 1.0)
+        # Only the combinations green for all files are found.
+        for row in rows[4:]:
+            self.assertEqual(row['green'], rows[4]['green'])
+            self.assertLess(row['recall'], 1.0)
@@ -0,0 +1,162 @@
+"""
+Deterministic generator of synthetic repositories for the benchmarks.
+
+Run it with ``python -m tests.benchmarks.SyntheticRepository DIR [files]``.
+"""
+import json
+import os
+import random
+import sys
+
+
+# Extensions of the generated source files and their relative weights.
+DEFAULT_LANGUAGE_MIX = {
+    '.py': 40,
+    '.js': 25,
+    '.css': 10,
+    '.md': 10,
+    '.c': 10,
+    '.txt': 5,
+}
+
+FILE_CONTENTS = {
+    '.py': 'def f{0}():\n    return {0}\n',
+    '.js': 'function f{0}() {{\n  return {0};\n}}\n',
+    '.css': '.c{0} {{\n  margin: {0}px;\n}}\n',
+    '.md': '# Title {0}\n\nText {0}.\n',
+    '.c': 'int f{0}(void) {{\n    return {0};\n}}\n',
+    '.txt': 'Line {0}\n',
+}
+
+HASHBANG_CONTENT = '#!/usr/bin/env python3\nprint({0})\n'
+
+# Every generated file below this directory is ignored by the .gitignore.
+IGNORED_DIR = 'build'
+
+
+def generate_repository(directory,
+                        files=1000,
+                        depth=3,
+                        fanout=8,
+                        language_mix=None,
+                        gitignore_lines=10,
+                        hashbang_ratio=0.05,
+                        ignored_ratio=0.05,
+                        manifest_entries=10,
+                        seed=0):
+    """
+    Creates a repository with the same directory structure and contents for
+    the same arguments.
+
+    :param directory:
+        The directory to create the repository in.
+    :param files:
+        Number of source files.
+    :param depth:
+        Maximum nesting depth of the directories of the source files.
+    :param fanout:
+        Number of subdirectories per directory.
+    :param language_mix:
+        A dict with the file extensions as keys and their relative weights
+        as values, ``DEFAULT_LANGUAGE_MIX`` if None.
+    :param gitignore_lines:
+        Number of lines of the ``.gitignore`` file.
+    :param hashbang_ratio:
+        Ratio of source files without an extension but with a hashbang.
+    :param ignored_ratio:
+        Ratio of source files ignored by the ``.gitignore`` file.
+    :param manifest_entries:
+        Number of dependencies in the ``package.json`` and ``Gemfile`` and
+        of sections in the ``.editorconfig``.
+    :param seed:
+        The seed of the random choices.
+    :return:
+        A list of the relative paths of the source files.
+    """
+    rng = random.Random(seed)
+    language_mix = language_mix or DEFAULT_LANGUAGE_MIX
+    extensions = sorted(language_mix)
+    weights = [language_mix[extension] for extension in extensions]
+    # ``random.choices`` is only available since Python 3.6.
+    cumulative = [sum(weights[:index + 1]) for index in range(len(weights))]
+
+    paths = []
+    created_dirs = set()
+    for index in range(files):
+        parts = ['dir{}'.format(rng.randrange(fanout))
+                 for _ in range(rng.randint(0, depth))]
+        if rng.random() < ignored_ratio:
+            parts.insert(0, IGNORED_DIR)
+        if rng.random() < hashbang_ratio:
+            name, content = 'script{}'.format(index), HASHBANG_CONTENT
+        else:
+            choice = rng.uniform(0, cumulative[-1])
+            extension = next(extension for extension, total
+                             in zip(extensions, cumulative)
+                             if choice <= total)
+            name = 'file{}{}'.format(index, extension)
+            content = FILE_CONTENTS.get(extension, FILE_CONTENTS['.txt'])
+        path = os.path.join(*(parts + [name]))
+        file_dir = os.path.join(directory, *parts)
+        if file_dir not in created_dirs:
+            os.makedirs(file_dir, exist_ok=True)
+            created_dirs.add(file_dir)
+        with open(os.path.join(directory, path), 'w') as file:
+            file.write(content.format(index))
+        paths.append(path)
+
+    write_gitignore(directory, gitignore_lines)
+    write_manifests(directory, manifest_entries)
+    return paths
+
+
+def write_gitignore(directory, lines):
+    """
+    Writes a ``.gitignore`` with ``lines`` lines, which ignores the
+    ``IGNORED_DIR`` and patterns matching no generated file.
+    """
+    patterns = [IGNORED_DIR + '/', '*.log']
+    patterns += ['pattern{}/*.tmp'.format(index)
+                 for index in range(max(lines - len(patterns), 0))]
+    with open(os.path.join(directory, '.gitignore'), 'w') as file:
+        file.write('\n'.join(patterns[:lines]) + '\n')
+
+
+def write_manifests(directory, entries):
+    """
+    Writes a ``package.json``, ``Gemfile`` and ``.editorconfig`` with
+    ``entries`` dependencies or sections each.
+    """
+    package = {
+        'name': 'synthetic',
+        'license': 'MIT',
+        'dependencies': {'package{}'.format(index): '~{}.0'.format(index)
+                         for index in range(entries)},
+        'devDependencies': {'eslint': '~4', 'csslint': '~1'},
+        'scripts': {'lint': 'eslint .'},
+    }
+    with open(os.path.join(directory, 'package.json'), 'w') as file:
+        json.dump(package, file, indent=2, sort_keys=True)
+
+    with open(os.path.join(directory, 'Gemfile'), 'w') as file:
+        file.write("source 'https://rubygems.org'\n\n")
+        for index in range(entries):
+            file.write("gem 'gem{}', '~> {}.0'\n".format(index, index))
+
+    with open(os.path.join(directory, '.editorconfig'), 'w') as file:
+        file.write('root = true\n\n[*]\nindent_style = space\n'
+                   'indent_size = 4\n')
+        for index in range(entries):
+            file.write('\n[dir{}/**]\nindent_size = {}\n'.format(
+                index, 2 + index % 3))
+
+
+def main():
+    directory = sys.argv[1]
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    paths = generate_repository(directory, files)
+    print('Generated {} files in {}'.format(len(paths), directory))
+
+
+if __name__ == '__main__':
+    main()
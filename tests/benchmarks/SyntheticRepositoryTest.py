@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from tests.benchmarks.SyntheticRepository import (
+    IGNORED_DIR,
+    generate_repository,
+    )
+
+
+def read_repository(directory):
+    contents = {}
+    for dir_name, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            path = os.path.join(dir_name, file_name)
+            with open(path) as file:
+                contents[os.path.relpath(path, directory)] = file.read()
+    return contents
+
+
+class SyntheticRepositoryTest(unittest.TestCase):
+
+    def test_deterministic(self):
+        with tempfile.TemporaryDirectory() as first, \
+                tempfile.TemporaryDirectory() as second, \
+                tempfile.TemporaryDirectory() as other:
+            paths = generate_repository(first, 50)
+            self.assertEqual(generate_repository(second, 50), paths)
+            self.assertNotEqual(generate_repository(other, 50, seed=1),
+                                paths)
+            self.assertEqual(read_repository(first),
+                             read_repository(second))
+
+    def test_parameters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = generate_repository(
+                directory, 200, depth=2, language_mix={'.py': 1},
+                gitignore_lines=5, hashbang_ratio=0.5, ignored_ratio=0.2,
+                manifest_entries=3)
+            self.assertEqual(len(paths), 200)
+            self.assertLessEqual(max(path.count(os.sep) for path in paths),
+                                 3)
+            extensions = {os.path.splitext(path)[1] for path in paths}
+            self.assertEqual(extensions, {'', '.py'})
+            hashbangs = [path for path in paths
+                         if not os.path.splitext(path)[1]]
+            self.assertTrue(50 < len(hashbangs) < 150)
+            with open(os.path.join(directory, hashbangs[0])) as file:
+                self.assertTrue(file.readline().startswith('#!'))
+            self.assertTrue(any(path.startswith(IGNORED_DIR + os.sep)
+                                for path in paths))
+
+            contents = read_repository(directory)
+            self.assertEqual(len(contents['.gitignore'].splitlines()), 5)
+            self.assertEqual(contents['Gemfile'].count('gem '), 3)
+            self.assertIn('"package2"', contents['package.json'])
+            self.assertIn('[dir2/**]', contents['.editorconfig'])
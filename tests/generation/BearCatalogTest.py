@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from coala_quickstart.generation import BearCatalog as catalog_module
+from coala_quickstart.generation.BearCatalog import (
+    CATALOG_FILENAME,
+    BearCatalog,
+    get_bear_files,
+    get_bear_id,
+    get_cache_dir,
+    get_default_catalog,
+    )
+from tests.test_bears.AllKindsOfSettingsBaseBear import (
+    AllKindsOfSettingsBaseBear)
+from tests.test_bears.AllKindsOfSettingsDependentBear import (
+    AllKindsOfSettingsDependentBear)
+from tests.test_bears.BearA import BearA
+
+
+class BearCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, CATALOG_FILENAME)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_bear_id(self):
+        self.assertEqual(get_bear_id(BearA), 'tests.test_bears.BearA.BearA')
+
+    def test_get_bear_files(self):
+        files = get_bear_files(AllKindsOfSettingsDependentBear)
+        self.assertEqual(
+            {os.path.basename(path) for path in files},
+            {'AllKindsOfSettingsDependentBear.py',
+             'AllKindsOfSettingsBaseBear.py'})
+        with patch('inspect.getfile', side_effect=TypeError):
+            self.assertIsNone(get_bear_files(BearA))
+
+    def test_get_cache_dir(self):
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_CACHE_DIR': self.temp_dir.name}):
+            self.assertEqual(get_cache_dir(), self.temp_dir.name)
+        with patch.dict('os.environ', {'COALA_QUICKSTART_CACHE_DIR': ''}):
+            self.assertIn('coala-quickstart', get_cache_dir())
+
+    def test_default_catalog(self):
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_CACHE_DIR': self.temp_dir.name}), \
+                patch.object(catalog_module, '_default_catalog', None):
+            catalog = get_default_catalog()
+            self.assertEqual(catalog.path, self.path)
+            self.assertIs(get_default_catalog(), catalog)
+            with tempfile.TemporaryDirectory() as other_dir, \
+                    patch.dict('os.environ',
+                               {'COALA_QUICKSTART_CACHE_DIR': other_dir}):
+                self.assertEqual(get_default_catalog().path, os.path.join(
+                    other_dir, CATALOG_FILENAME))
+
+    def test_persistence(self):
+        catalog = BearCatalog(self.path)
+        self.assertEqual(catalog.entries, {})
+        catalog.set(BearA, 'key', {'value': [1, 2]})
+        catalog.save()
+        self.assertFalse(catalog.dirty)
+
+        catalog = BearCatalog(self.path)
+        self.assertEqual(catalog.get(get_bear_id(BearA), 'key'),
+                         {'value': [1, 2]})
+        self.assertIsNone(catalog.get(get_bear_id(BearA), 'other'))
+        self.assertIsNone(catalog.get('unknown.Bear', 'key'))
+
+    def test_stale_format(self):
+        with open(self.path, 'w') as catalog_file:
+            json.dump({'format': -1, 'bears': {'a': {}}}, catalog_file)
+        self.assertEqual(BearCatalog(self.path).entries, {})
+
+        with open(self.path, 'w') as catalog_file:
+            catalog_file.write('{broken')
+        self.assertEqual(BearCatalog(self.path).entries, {})
+
+    def test_invalidation(self):
+        catalog = BearCatalog()
+        catalog.set(AllKindsOfSettingsDependentBear, 'key', 1)
+        catalog.set(AllKindsOfSettingsDependentBear, 'other', 2)
+        bear_id = get_bear_id(AllKindsOfSettingsDependentBear)
+        self.assertEqual(catalog.get(bear_id, 'key'), 1)
+        self.assertEqual(catalog.get(bear_id, 'other'), 2)
+
+        # A change in a dependency invalidates the entry.
+        base_file = get_bear_files(AllKindsOfSettingsBaseBear).pop()
+        stamps = catalog.entries[bear_id]['files']
+        stamps[base_file] = [0, 0]
+        self.assertIsNone(catalog.get(bear_id, 'key'))
+        self.assertNotIn(bear_id, catalog.entries)
+
+    def test_unwritable(self):
+        catalog = BearCatalog(self.path)
+        catalog.save()
+        self.assertFalse(os.path.exists(self.path))
+
+        catalog.set(BearA, 'key', 1)
+        with patch('os.makedirs', side_effect=PermissionError), \
+                self.assertLogs(level='WARNING'):
+            catalog.save()
+        self.assertTrue(catalog.dirty)
+
+        with patch('inspect.getfile', side_effect=TypeError):
+            catalog.set(AllKindsOfSettingsBaseBear, 'key', 1)
+        self.assertIsNone(
+            catalog.get(get_bear_id(AllKindsOfSettingsBaseBear), 'key'))
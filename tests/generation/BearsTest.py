@@ -1,7 +1,10 @@
+import json
 import os
 import sys
+import tempfile
 import unittest
 from copy import deepcopy
+from unittest.mock import patch
 
 
 from pyprint.ConsolePrinter import ConsolePrinter
@@ -16,8 +19,14 @@ from coala_quickstart.Constants import (
     GREEN_MODE_INCOMPATIBLE_BEAR_LIST,
     IMPORTANT_BEAR_LIST,
     )
+from coala_quickstart.Timings import record_stage_graph
+from coala_quickstart.generation.EntryPoints import use_cached_bear_dirs
 from coala_quickstart.generation.InfoCollector import collect_info
-from tests.TestUtilities import bear_test_module, generate_files
+from tests.TestUtilities import (
+    bear_test_module,
+    generate_files,
+    redirect_cache_dir,
+    )
 
 
 editorconfig = """
@@ -114,6 +123,7 @@ context_file_contents = [editorconfig, package_json, gemfile, gruntfile]
 class TestBears(unittest.TestCase):
 
     def setUp(self):
+        redirect_cache_dir(self)
         self.project_dir = os.path.join(
             os.path.dirname(os.path.realpath(__file__)),
             "project_dir")
@@ -147,7 +157,8 @@ class TestBears(unittest.TestCase):
                                     self.printer,
                                     self.arg_parser,
                                     {})
-        all_bears = get_filtered_bears(['Python', 'C'])[0]
+        with use_cached_bear_dirs():
+            all_bears = get_filtered_bears(['Python', 'C'])[0]
         bears = all_bears['cli']
         important_bears = []
 
@@ -358,6 +369,97 @@ class TestBears(unittest.TestCase):
         os.remove('.coafile')
         os.chdir(orig_cwd)
 
+    def test_bears_ci_mode_timings(self):
+        orig_cwd = os.getcwd()
+        os.chdir(os.path.dirname(os.path.realpath(__file__)))
+        os.chdir("bears_ci_testfiles")
+        with tempfile.TemporaryDirectory() as directory:
+            timings_file = os.path.join(directory, 'timings.json')
+            sys.argv += ['--ci', '--timings', timings_file]
+            with retrieve_stdout() as custom_stdout:
+                main()
+                self.assertIn("Wall (s)", custom_stdout.getvalue())
+            with open(timings_file) as file:
+                timings = json.load(file)
+            stages = [row['stage'] for row in timings['stages']]
+            sys.argv[-1] = os.path.join(directory, 'missing', 'timings.json')
+            with retrieve_stdout(), self.assertLogs(level='ERROR') as logs:
+                main()
+            self.assertIn("Unable to write the timings", logs.output[-1])
+        os.remove('.coafile')
+        os.remove('.coafile.new')
+        os.chdir(orig_cwd)
+        for stage in ('file scanning', 'language detection',
+                      'info extraction', 'info extraction/GemfileInfoExtractor',
+                      'bear selection', 'bear loading',
+                      'bear selection/capability filtering',
+                      'settings filling', 'writing'):
+            self.assertIn(stage, stages)
+        self.assertEqual(timings['stage_graph']['critical_stages'][-1],
+                         'bear selection')
+
+    def test_bears_ci_mode_memory_report(self):
+        orig_cwd = os.getcwd()
+        os.chdir(os.path.dirname(os.path.realpath(__file__)))
+        os.chdir("bears_ci_testfiles")
+        with tempfile.TemporaryDirectory() as directory:
+            report_file = os.path.join(directory, 'memory.json')
+            timings_file = os.path.join(directory, 'timings.json')
+            sys.argv += ['--ci', '--timings', timings_file,
+                         '--memory-report', report_file]
+            with retrieve_stdout() as custom_stdout, \
+                    patch('coala_quickstart.StageGraph.record_stage_graph',
+                          wraps=record_stage_graph) as record:
+                main()
+                self.assertIn("Wall (s)", custom_stdout.getvalue())
+                self.assertIn("Retained", custom_stdout.getvalue())
+            with open(report_file) as file:
+                report = json.load(file)
+        os.remove('.coafile')
+        os.chdir(orig_cwd)
+        stages = [row['stage'] for row in report['stages']]
+        self.assertIn('bear loading', stages)
+        self.assertIn('settings filling', stages)
+        self.assertGreater(report['peak'], 0)
+        # The stages don't overlap, so that their peaks are their own.
+        graph = record.call_args[0][0]
+        stages = sorted(graph.stages.values(), key=lambda stage: stage.start)
+        for stage, following in zip(stages, stages[1:]):
+            self.assertLessEqual(stage.end, following.start)
+
+    def test_bears_ci_mode_metrics(self):
+        orig_cwd = os.getcwd()
+        os.chdir(os.path.dirname(os.path.realpath(__file__)))
+        os.chdir("bears_ci_testfiles")
+        with tempfile.TemporaryDirectory() as directory:
+            sys.argv += ['--ci', '--metrics', directory]
+            with retrieve_stdout():
+                main()
+            with open(os.path.join(directory,
+                                   'coala_quickstart_trace.jsonl')) as file:
+                trace = [json.loads(line) for line in file]
+            with open(os.path.join(directory,
+                                   'coala_quickstart.prom')) as file:
+                metrics = file.read()
+            file_path = os.path.join(directory, 'file')
+            open(file_path, 'w').close()
+            sys.argv[-1] = file_path
+            with retrieve_stdout(), self.assertLogs(level='ERROR') as logs:
+                main()
+            self.assertIn("Unable to write the metrics",
+                          '\n'.join(logs.output))
+        os.remove('.coafile')
+        os.remove('.coafile.new')
+        os.chdir(orig_cwd)
+        spans = {(item['kind'], item['name']): item for item in trace}
+        self.assertGreater(
+            spans['bear_load', 'bear loading']['attributes']['bears'], 0)
+        self.assertEqual(
+            spans['extractor', 'EditorconfigInfoExtractor']['attributes'],
+            {'files': 0, 'infos': 0})
+        self.assertIn('coala_quickstart_span_bears_total'
+                      '{kind="bear_load",name="bear loading"}', metrics)
+
     def test_bears_no_filter_by_capability_mode(self):
         languages = []
         with bear_test_module():
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pyprint.ConsolePrinter import ConsolePrinter
+from coala_utils.ContextManagers import retrieve_stdout
+
+from coala_quickstart.coala_quickstart import _get_arg_parser
+from coala_quickstart.generation.Bears import filter_bears_by_time_budget
+from coala_quickstart.generation.Calibration import (
+    BearCalibrator,
+    BearCostEstimate,
+    measure_bear,
+    print_bear_estimates,
+    sample_files,
+    select_bears_within_budget,
+    )
+from coala_quickstart.generation import Calibration
+from tests.test_bears.NonOptionalSettingBear import NonOptionalSettingBear
+from tests.test_bears.SmellCapabilityBear import SmellCapabilityBear
+from tests.test_bears.TestGlobalBear import TestGlobalBear
+from tests.test_bears.TestLocalBear import TestLocalBear
+from tests.TestUtilities import generate_files
+
+
+class FakeCalibrator(BearCalibrator):
+
+    def __init__(self, costs):
+        super().__init__([])
+        self.costs = costs
+
+    def estimate(self, bear, language):
+        if bear not in self.costs:
+            return None
+        estimate = BearCostEstimate(bear, language, 1, self.costs[bear],
+                                    None, 1)
+        self.estimates[(bear, language)] = estimate
+        return estimate
+
+
+class WarningBear(TestLocalBear):
+
+    def run(self, filename, file):
+        self.warn('Measured anyway.')
+        return []
+
+
+class CheapSmellBear(SmellCapabilityBear):
+    pass
+
+
+class ExpensiveSmellBear(SmellCapabilityBear):
+    pass
+
+
+class CalibrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_dir = self.temp_dir.name
+        self.printer = ConsolePrinter()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def generate(self, names_and_sizes):
+        names = [name for name, _ in names_and_sizes]
+        contents = ['x\n' * size for _, size in names_and_sizes]
+        return generate_files(names, contents, self.project_dir)
+
+    def test_sample_files(self):
+        files = [('a{}.py'.format(i), i) for i in range(10)]
+        files += [('b.c', 1), ('c.js', 3), ('d.js', 4)]
+        with self.generate(files) as paths:
+            sample = [os.path.basename(path) for path in sample_files(
+                paths + ['missing.py'])]
+            self.assertEqual(sample, ['b.c', 'c.js', 'a0.py', 'd.js',
+                                      'a4.py', 'a9.py'])
+            self.assertEqual(len(sample_files(paths, max_samples=2)), 2)
+            self.assertEqual(sample_files([]), [])
+
+    def test_measure_bear(self):
+        with self.generate([('a.py', 3), ('b.py', 5)]) as paths:
+            estimate = measure_bear(TestLocalBear, 'Python', paths, 10)
+            self.assertEqual(estimate.sampled_files, 2)
+            self.assertEqual(estimate.total_files, 10)
+            self.assertGreater(estimate.seconds, 0)
+            self.assertGreater(estimate.peak_memory, 0)
+            self.assertAlmostEqual(estimate.estimated_seconds,
+                                   estimate.seconds_per_file * 10)
+
+            estimate = measure_bear(TestGlobalBear, 'Python', paths, 2)
+            self.assertEqual(estimate.sampled_files, 2)
+
+            estimate = measure_bear(WarningBear, 'Python', paths, 2)
+            self.assertEqual(estimate.sampled_files, 2)
+
+            with self.assertLogs(level='WARNING') as logs:
+                self.assertIsNone(
+                    measure_bear(NonOptionalSettingBear, 'All', paths, 2))
+            self.assertIn('NonOptionalSettingBear', logs.output[0])
+            with patch.object(Calibration, '_run_bear', return_value=False), \
+                    self.assertLogs(level='WARNING') as logs:
+                self.assertIsNone(
+                    measure_bear(TestLocalBear, 'Python', paths, 2))
+            self.assertIn('TestLocalBear as it failed', logs.output[0])
+
+        estimate = measure_bear(TestLocalBear, 'Python', [], 2)
+        self.assertEqual(estimate.estimated_seconds, 0)
+        self.assertIsNone(estimate.peak_memory)
+
+    def test_calibrator(self):
+        with self.generate([('a.py', 3), ('b.c', 5)]) as paths:
+            calibrator = BearCalibrator(paths)
+            estimate = calibrator.estimate(TestLocalBear, 'Python')
+            self.assertEqual(estimate.total_files, 1)
+            self.assertIs(calibrator.estimate(TestLocalBear, 'Python'),
+                          estimate)
+            self.assertEqual(
+                calibrator.estimate(TestLocalBear, 'All').total_files, 2)
+
+    def test_apply_time_budget(self):
+        selected = {'All': {ExpensiveSmellBear, TestLocalBear},
+                    'Python': {TestGlobalBear}}
+        candidates = {'All': {CheapSmellBear, SmellCapabilityBear,
+                              ExpensiveSmellBear}}
+        calibrator = FakeCalibrator({
+            ExpensiveSmellBear: 10, TestLocalBear: 1, TestGlobalBear: 2,
+            CheapSmellBear: 3, SmellCapabilityBear: 4})
+
+        changes = Calibration.apply_time_budget(
+            selected, candidates, calibrator, 6)
+        self.assertEqual(selected, {'All': {CheapSmellBear, TestLocalBear},
+                                    'Python': {TestGlobalBear}})
+        self.assertEqual([(dropped.bear, replacement.bear)
+                          for dropped, replacement in changes],
+                         [(ExpensiveSmellBear, CheapSmellBear)])
+
+        changes = Calibration.apply_time_budget(
+            selected, candidates, calibrator, 1)
+        self.assertEqual(selected, {'All': {TestLocalBear},
+                                    'Python': set()})
+        self.assertEqual([(dropped.bear, replacement)
+                          for dropped, replacement in changes],
+                         [(CheapSmellBear, None), (TestGlobalBear, None)])
+
+        with retrieve_stdout() as stdout:
+            print_bear_estimates(self.printer, calibrator, changes, 1)
+            output = stdout.getvalue()
+            self.assertIn('CheapSmellBear exceeds the time budget', output)
+            self.assertIn('n/a', output)
+
+    def test_select_bears_within_budget(self):
+        with self.generate([('a.py', 3)]) as paths, \
+                retrieve_stdout() as stdout:
+            selected = select_bears_within_budget(
+                {'Python': {TestLocalBear}}, {}, paths, 60, self.printer)
+            self.assertEqual(selected, {'Python': {TestLocalBear}})
+            self.assertIn('TestLocalBear', stdout.getvalue())
+
+    def test_filter_bears_by_time_budget(self):
+        arg_parser = _get_arg_parser()
+        selected = {'Python': {TestLocalBear}}
+        args = arg_parser.parse_args([])
+        self.assertIs(filter_bears_by_time_budget(
+            args, selected, {}, ['a.py'], self.printer), selected)
+        args = arg_parser.parse_args(['--time-budget', '2.5'])
+        self.assertEqual(args.time_budget, 2.5)
+        self.assertIs(filter_bears_by_time_budget(
+            args, selected, {}, [], self.printer), selected)
+        with patch.object(Calibration, 'select_bears_within_budget',
+                          return_value={}) as select:
+            self.assertEqual(filter_bears_by_time_budget(
+                args, selected, {}, ['a.py'], self.printer), {})
+            select.assert_called_once_with(selected, {}, ['a.py'], 2.5,
+                                           self.printer)
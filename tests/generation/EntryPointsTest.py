@@ -0,0 +1,222 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+from coala_quickstart.generation import EntryPoints
+from coala_quickstart.generation.EntryPoints import (
+    ENTRY_POINTS_FILENAME,
+    collect_registered_bears_dirs,
+    get_entry_points,
+    get_module_dir,
+    get_registered_info_extractors,
+    get_site_stamp,
+    load_entry_point,
+    load_entry_point_table,
+    scan_entry_points,
+    use_cached_bear_dirs,
+    )
+from coala_quickstart.generation.InfoCollector import collect_info
+from coala_quickstart.info_extractors.PackageJSONInfoExtractor import (
+    PackageJSONInfoExtractor)
+from tests.TestUtilities import bear_test_module, generate_files
+
+
+class FakeEntryPoint:
+
+    def __init__(self, group, name, value):
+        self.group = group
+        self.name = name
+        self.value = value
+
+
+class FakeDistribution:
+
+    def __init__(self, *entry_points):
+        self.entry_points = [FakeEntryPoint(*entry_point)
+                             for entry_point in entry_points]
+
+
+class EntryPointsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, ENTRY_POINTS_FILENAME)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_site_stamp(self):
+        missing = os.path.join(self.temp_dir.name, 'missing')
+        stamp = get_site_stamp(['', missing, self.path, self.temp_dir.name])
+        self.assertEqual([path for path, _ in stamp], [self.temp_dir.name])
+        self.assertEqual(get_site_stamp(), get_site_stamp(sys.path))
+
+    def test_scan_entry_points_pkg_resources(self):
+        with patch.dict('sys.modules', {'importlib.metadata': None,
+                                        'importlib_metadata': None}):
+            table = scan_entry_points()
+        self.assertIn(['coala', 'coalib.coala:main'],
+                      table['console_scripts'])
+
+    def test_scan_entry_points_importlib_metadata(self):
+        metadata = types.ModuleType('importlib_metadata')
+        metadata.distributions = lambda: [
+            FakeDistribution(('coalabears', 'a', 'bears'),
+                             ('coalabears', 'a', 'bears')),
+            FakeDistribution(('console_scripts', 'b', 'b.main:main'))]
+        with patch.dict('sys.modules', {'importlib.metadata': None,
+                                        'importlib_metadata': metadata}):
+            self.assertEqual(scan_entry_points(),
+                             {'coalabears': [['a', 'bears']],
+                              'console_scripts': [['b', 'b.main:main']]})
+
+    def test_load_entry_point_table(self):
+        table = {'coalabears': [['a', 'bears']]}
+        with patch.object(EntryPoints, 'scan_entry_points',
+                          return_value=table) as scan:
+            self.assertEqual(load_entry_point_table(self.path), table)
+            self.assertEqual(load_entry_point_table(self.path), table)
+            self.assertEqual(scan.call_count, 1)
+
+            # A change on the import path invalidates the table.
+            with patch.object(EntryPoints, 'get_site_stamp',
+                              return_value=[]):
+                load_entry_point_table(self.path)
+            self.assertEqual(scan.call_count, 2)
+
+            with open(self.path, 'w') as table_file:
+                json.dump({'format': -1}, table_file)
+            load_entry_point_table(self.path)
+            self.assertEqual(scan.call_count, 3)
+
+            with open(self.path, 'w') as table_file:
+                json.dump([], table_file)
+            load_entry_point_table(self.path)
+            self.assertEqual(scan.call_count, 4)
+
+    def test_load_entry_point_table_unwritable(self):
+        with patch.object(EntryPoints, 'scan_entry_points',
+                          return_value={}), \
+                patch('os.makedirs', side_effect=PermissionError), \
+                self.assertLogs(level='WARNING'):
+            self.assertEqual(load_entry_point_table(self.path), {})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_get_entry_points(self):
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_CACHE_DIR': self.temp_dir.name}), \
+                patch.object(EntryPoints, '_entry_point_table', None), \
+                patch.object(EntryPoints, 'scan_entry_points',
+                             return_value={'g': [['a', 'b:c']]}):
+            self.assertEqual(get_entry_points('g'), [('a', 'b:c')])
+            self.assertEqual(get_entry_points('other'), [])
+            self.assertTrue(os.path.exists(self.path))
+
+    def test_get_entry_points_installed(self):
+        stamps = [[['site', 1]], [['site', 1]], [['site', 2]]]
+        with patch.dict('os.environ',
+                        {'COALA_QUICKSTART_CACHE_DIR': self.temp_dir.name}), \
+                patch.object(EntryPoints, '_entry_point_table', None), \
+                patch.object(EntryPoints, 'get_site_stamp',
+                             side_effect=lambda: stamps[0]), \
+                patch.object(EntryPoints, 'scan_entry_points',
+                             return_value={'g': [['a', 'b']]}) as scan:
+            self.assertEqual(get_entry_points('g'), [('a', 'b')])
+            stamps.pop(0)
+            self.assertEqual(get_entry_points('g'), [('a', 'b')])
+            self.assertEqual(scan.call_count, 1)
+
+            # A distribution was installed by another process.
+            stamps.pop(0)
+            scan.return_value = {'g': [['a', 'b'], ['c', 'd']]}
+            self.assertEqual(get_entry_points('g'), [('a', 'b'), ('c', 'd')])
+            self.assertEqual(scan.call_count, 2)
+
+    def test_get_module_dir(self):
+        tests_dir = os.path.dirname(os.path.dirname(__file__))
+        self.assertEqual(get_module_dir('tests.test_bears:attr'),
+                         os.path.join(tests_dir, 'test_bears'))
+        self.assertEqual(get_module_dir('tests.TestUtilities'), tests_dir)
+        self.assertIsNone(get_module_dir('missing_module_abc'))
+        self.assertIsNone(get_module_dir('missing_module_abc.sub'))
+        self.assertIsNone(get_module_dir('sys'))
+
+    def test_collect_registered_bears_dirs(self):
+        with bear_test_module():
+            bear_dirs = collect_registered_bears_dirs('coalabears')
+            self.assertEqual([os.path.basename(path) for path in bear_dirs],
+                             ['test_bears'])
+            self.assertEqual(collect_registered_bears_dirs('other'), [])
+
+    def test_use_cached_bear_dirs(self):
+        import coalib.settings.Section as section_module
+        original = section_module.collect_registered_bears_dirs
+        with use_cached_bear_dirs():
+            self.assertIs(section_module.collect_registered_bears_dirs,
+                          collect_registered_bears_dirs)
+            with use_cached_bear_dirs():
+                pass
+            self.assertIs(section_module.collect_registered_bears_dirs,
+                          collect_registered_bears_dirs)
+        self.assertIs(section_module.collect_registered_bears_dirs, original)
+
+        with self.assertRaises(ValueError), use_cached_bear_dirs():
+            raise ValueError
+        self.assertIs(section_module.collect_registered_bears_dirs, original)
+
+    def test_use_cached_bear_dirs_threads(self):
+        import coalib.settings.Section as section_module
+        original = section_module.collect_registered_bears_dirs
+        entered = threading.Event()
+        release = threading.Event()
+
+        def other_thread():
+            with use_cached_bear_dirs():
+                entered.set()
+                release.wait(10)
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        entered.wait(10)
+        with use_cached_bear_dirs():
+            release.set()
+            thread.join(10)
+            # The other thread's block ended first.
+            self.assertIs(section_module.collect_registered_bears_dirs,
+                          collect_registered_bears_dirs)
+        self.assertIs(section_module.collect_registered_bears_dirs, original)
+
+    def test_load_entry_point(self):
+        self.assertIs(load_entry_point('os.path:join'), os.path.join)
+        self.assertIs(load_entry_point('os'), os)
+
+    def test_registered_info_extractors(self):
+        entry_points = [
+            ('package', 'coala_quickstart.info_extractors.'
+                        'PackageJSONInfoExtractor:PackageJSONInfoExtractor'),
+            ('missing', 'missing_module_abc:Extractor'),
+            ('function', 'os.path:join')]
+        with patch.object(EntryPoints, 'get_entry_points',
+                          return_value=entry_points), \
+                self.assertLogs(level='WARNING') as logs:
+            self.assertEqual(get_registered_info_extractors(),
+                             [PackageJSONInfoExtractor])
+        self.assertEqual(len(logs.output), 2)
+
+    def test_collect_info_with_plugins(self):
+        with patch.object(EntryPoints, 'get_entry_points',
+                          return_value=[('package', 'coala_quickstart.'
+                                         'info_extractors.PackageJSONInfo'
+                                         'Extractor:PackageJSONInfoExtractor')
+                                        ]), \
+                generate_files(['package.json'],
+                               ['{"license": "MIT"}'],
+                               self.temp_dir.name):
+            info = collect_info(self.temp_dir.name)
+        # Found by both the builtin and the registered extractor.
+        self.assertEqual(len(info['LicenseUsedInfo']), 2)
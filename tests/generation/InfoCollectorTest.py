@@ -3,7 +3,8 @@ import unittest
 
 from coala_quickstart.generation.InfoCollector import (
     collect_info)
-from tests.TestUtilities import generate_files
+from coala_quickstart.info_extraction.InfoStore import InfoStore
+from tests.TestUtilities import generate_files, redirect_cache_dir
 
 
 package_json = """
@@ -62,6 +63,7 @@ end
 class InfoCollectorTest(unittest.TestCase):
 
     def setUp(self):
+        redirect_cache_dir(self)
         self.uut = collect_info
         self.test_dir = os.path.join(
             os.path.dirname(os.path.realpath(__file__)),
@@ -78,6 +80,7 @@ class InfoCollectorTest(unittest.TestCase):
                 self.test_dir) as gen_files:
 
             collected_info = self.uut(self.test_dir)
+            self.assertIsInstance(collected_info, InfoStore)
 
             expected_results = [
                 ('TrailingWhitespaceInfo', ['.editorconfig'], 1),
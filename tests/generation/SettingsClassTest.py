@@ -1,6 +1,8 @@
 import unittest
+from unittest.mock import patch
 
 from pyprint.ConsolePrinter import ConsolePrinter
+from coala_quickstart.generation.BearCatalog import BearCatalog
 from coala_quickstart.generation.SettingsClass import (
     collect_bear_settings, BearSettings, SettingTypes)
 from tests.test_bears.AllKindsOfSettingsDependentBear import (
@@ -14,11 +16,13 @@ from tests.test_bears.LinterBearWithCreateArguments import (
 from tests.test_bears.SomeLinterBear import SomeLinterBear
 from tests.test_bears.LinterBearWithParameters import LinterBearWithParameters
 from tests.test_bears.BearA import BearA
+from tests.TestUtilities import redirect_cache_dir
 
 
 class TestSettingsClass(unittest.TestCase):
 
     def setUp(self):
+        redirect_cache_dir(self)
         self.printer = ConsolePrinter()
         self.log_printer = None
 
@@ -185,3 +189,22 @@ class TestSettingsClass(unittest.TestCase):
         with self.assertRaises(ValueError, msg='Invalid trigger Type'):
             setting = SettingTypes({'a': bool}, None, None,
                                    'wubalubadubdub')
+
+    def test_bear_settings_from_catalog(self):
+        catalog = BearCatalog()
+        relevant_bears = {'test': {AllKindsOfSettingsDependentBear,
+                                   LinterBearWithCreateArguments}}
+        introspected = collect_bear_settings(relevant_bears, catalog)
+        self.assertEqual(len(catalog.entries), 2)
+
+        with patch.object(BearSettings, 'introspect_bear') as introspect:
+            cached = collect_bear_settings(relevant_bears, catalog)
+            self.assertFalse(introspect.called)
+
+        for first, second in zip(introspected, cached):
+            self.assertIs(first.bear, second.bear)
+            self.assertEqual(first.to_metadata(), second.to_metadata())
+            self.assertEqual(second.non_optional_settings.settings_bool,
+                             first.non_optional_settings.settings_bool)
+            self.assertEqual(second.optional_settings.settings_others,
+                             first.optional_settings.settings_others)
@@ -12,6 +12,7 @@ from coala_quickstart.coala_quickstart import _get_arg_parser
 from coala_quickstart.generation.Settings import write_info, generate_settings
 from coala_quickstart.generation.Bears import filter_relevant_bears
 from coala_quickstart.generation.Project import get_used_languages
+from tests.TestUtilities import redirect_cache_dir
 
 
 class SettingsTest(unittest.TestCase):
@@ -24,6 +25,7 @@ class SettingsTest(unittest.TestCase):
         return tail or os.path.basename(head)
 
     def setUp(self):
+        redirect_cache_dir(self)
         self.project_dir = os.getcwd()
         self.printer = ConsolePrinter()
         self.coafile = os.path.join(tempfile.gettempdir(), '.coafile')
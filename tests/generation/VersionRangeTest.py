@@ -0,0 +1,120 @@
+import unittest
+
+from coala_quickstart.generation.Bears import is_version_newer
+from coala_quickstart.generation.VersionRange import (
+    ANY_VERSION,
+    VersionRange,
+    is_version_compatible,
+    parse_range,
+    parse_requirement_range,
+    parse_version,
+    )
+
+
+class VersionRangeTest(unittest.TestCase):
+
+    def assertMatches(self, spec, matching, not_matching):
+        version_range = parse_range(spec)
+        for version in matching:
+            self.assertTrue(version_range.contains(version),
+                            '{} should match {}'.format(version, spec))
+        for version in not_matching:
+            self.assertFalse(version_range.contains(version),
+                             '{} should not match {}'.format(version, spec))
+
+    def test_parse_version(self):
+        self.assertEqual(parse_version('1.2.3'), (1, 2, 3))
+        self.assertEqual(parse_version('v1.2.0'), (1, 2))
+        self.assertEqual(parse_version('=1.0.0-rc.1'), (1,))
+        self.assertEqual(parse_version('0.0.0'), ())
+        with self.assertRaises(ValueError):
+            parse_version('')
+
+    def test_any_version(self):
+        for spec in ('', '*', 'x', 'latest', '>=0'):
+            self.assertEqual(parse_range(spec), ANY_VERSION)
+        self.assertTrue(ANY_VERSION.contains((0, 1)))
+
+    def test_npm_caret(self):
+        self.assertMatches('^1.2.3', ['1.2.3', '1.9'], ['1.2.2', '2.0.0'])
+        self.assertMatches('^1.2', ['1.2.0', '1.99'], ['1.1.9', '2'])
+        self.assertMatches('^0.2.3', ['0.2.9'], ['0.3.0', '0.2.2'])
+        self.assertMatches('^0.0.3', ['0.0.3'], ['0.0.4'])
+        self.assertMatches('^0.0', ['0.0.9'], ['0.1.0'])
+        self.assertMatches('^0', ['0.9'], ['1.0.0'])
+
+    def test_npm_tilde(self):
+        self.assertMatches('~1.2.3', ['1.2.3', '1.2.9'], ['1.3.0', '1.2'])
+        self.assertMatches('~1.2', ['1.2.0', '1.2.9'], ['1.3.0'])
+        self.assertMatches('~1', ['1.9'], ['2.0', '0.9'])
+        self.assertMatches('~1.0.0-beta.6', ['1.0.0', '1.0.9'], ['1.1'])
+
+    def test_npm_x_ranges(self):
+        self.assertMatches('1.2.x', ['1.2.0', '1.2.7'], ['1.3', '1.1'])
+        self.assertMatches('1.2', ['1.2.7'], ['1.3'])
+        self.assertMatches('1.*', ['1.9'], ['2'])
+        self.assertMatches('>1.2.x', ['1.3.0'], ['1.2.9'])
+        self.assertMatches('<=1.2.x', ['1.2.9'], ['1.3.0'])
+        self.assertMatches('<1.2.x', ['1.1.9'], ['1.2.0'])
+
+    def test_npm_comparator_sets(self):
+        self.assertMatches('>=1 <2', ['1.0.0', '1.9.9'], ['2', '0.9'])
+        self.assertMatches('>=1.0.0 <=1.5', ['1.5'], ['1.5.1'])
+        self.assertMatches('>1.0 || <0.5', ['1.0.1', '0.4'], ['1.0', '0.7'])
+        self.assertMatches('1.2.3 - 2.3', ['1.2.3', '2.3.9'], ['2.4.0'])
+        self.assertMatches('1.2.3 - 2.3.4', ['2.3.4'], ['2.3.5'])
+        self.assertMatches('1.2.3 - *', ['99'], ['1.2.2'])
+        self.assertMatches('1.2.3', ['1.2.3'], ['1.2.4'])
+
+    def test_gem_ranges(self):
+        self.assertMatches('~> 3.0', ['3.0', '3.9.9'], ['4.0', '2.9'])
+        self.assertMatches('~> 3.0.1', ['3.0.5'], ['3.1'])
+        self.assertMatches('~> 3', ['3.5'], ['4'])
+        self.assertMatches('>= 1.0, < 2', ['1.5'], ['2.0'])
+        self.assertMatches('!= 1.5', ['1.4', '1.6'], ['1.5.0'])
+
+    def test_pep440_ranges(self):
+        self.assertMatches('~=2.2', ['2.2', '2.9'], ['3.0', '2.1'])
+        self.assertMatches('~=1.4.5', ['1.4.9'], ['1.5'])
+        self.assertMatches('==1.2', ['1.2.0'], ['1.2.1'])
+        self.assertMatches('===1.2.0', ['1.2'], ['1.2.1'])
+        self.assertMatches('==1.2.*', ['1.2.5'], ['1.3'])
+        self.assertMatches('>=2, !=2.1.*', ['2.0.9', '2.2'], ['2.1.4'])
+        self.assertMatches('>1.2', ['1.2.1'], ['1.2'])
+
+    def test_unsatisfiable(self):
+        self.assertTrue(parse_range('>2 <1').is_empty)
+        self.assertTrue(parse_range('<*').is_empty)
+        self.assertTrue(parse_range('>=1 <1').is_empty)
+        self.assertFalse(parse_range('>=1 <=1').is_empty)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_range('>=1 foo')
+        with self.assertRaises(ValueError):
+            parse_range('garbage')
+
+    def test_memoized(self):
+        self.assertIs(parse_range('^4.5.6'), parse_range('^4.5.6'))
+
+    def test_intersects(self):
+        self.assertTrue(parse_range('^1.2').intersects(parse_range('~1.5')))
+        self.assertFalse(parse_range('^1.2').intersects(parse_range('>=2')))
+        self.assertEqual(parse_range('>=1').intersection(parse_range('<2')),
+                         parse_range('>=1 <2'))
+        self.assertEqual(repr(VersionRange([])), 'VersionRange([])')
+        self.assertNotEqual(hash(ANY_VERSION), hash(VersionRange([])))
+
+    def test_requirement_range(self):
+        self.assertTrue(parse_requirement_range('2.9.5').contains('3'))
+        self.assertFalse(parse_requirement_range('2.9.5').contains('2.9'))
+        self.assertFalse(parse_requirement_range('~2.9.5').contains('3'))
+
+    def test_is_version_compatible(self):
+        self.assertTrue(is_version_compatible('~3', '3.1.0'))
+        self.assertTrue(is_version_compatible('~8.0', '8.0.2'))
+        self.assertFalse(is_version_compatible('~8.0', '8.1.3'))
+        self.assertTrue(is_version_compatible('~> 3.0', '~>3.5'))
+        self.assertFalse(is_version_compatible('>=1 <2', '2.0.0'))
+        self.assertTrue(is_version_newer('3.0', '2.9.5'))
+        self.assertFalse(is_version_newer('1.0.0', '1.2'))
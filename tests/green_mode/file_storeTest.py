@@ -0,0 +1,156 @@
+import os
+import pickle
+import tempfile
+import unittest
+from array import array
+from unittest.mock import Mock, patch
+
+from coala_quickstart.green_mode import green_mode
+from coala_quickstart.green_mode.file_store import FileLines, FileStore
+from coala_quickstart.green_mode.green_mode import (
+    BearTestPool,
+    bear_test_fun,
+    initialize_project_data,
+    )
+from coala_quickstart.generation.SettingsClass import collect_bear_settings
+from coalib.processes.Processing import get_file_dict
+from tests.test_bears.TestGlobalBear import TestGlobalBear
+from tests.test_bears.TestLocalBear import TestLocalBear
+from tests.TestUtilities import redirect_cache_dir
+
+
+class CountingBuffer(bytes):
+
+    def __getitem__(self, index):
+        self.reads.append(index)
+        return super().__getitem__(index)
+
+
+class FileStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+        self.file_dict = {'a.py': ('import os\n', '\n', 'print(1)'),
+                          'b.txt': ('héllo ☃\n', 'x\ud800\n'),
+                          'empty.py': (),
+                          'raw.bin': None}
+        self.store = FileStore(self.file_dict)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_mapping(self):
+        self.assertEqual(sorted(self.store), sorted(self.file_dict))
+        self.assertEqual(len(self.store), 4)
+        self.assertIn('a.py', self.store)
+        self.assertIsNone(self.store['raw.bin'])
+        with self.assertRaises(KeyError):
+            self.store['missing.py']
+        for filename, lines in self.file_dict.items():
+            self.assertEqual(self.store[filename], lines)
+        self.assertEqual(self.store.size,
+                         sum(len(line.encode('utf-8', 'surrogatepass'))
+                             for lines in self.file_dict.values() if lines
+                             for line in lines))
+
+    def test_file_lines(self):
+        lines = self.store['a.py']
+        self.assertIsInstance(lines, FileLines)
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0], 'import os\n')
+        self.assertEqual(lines[-1], 'print(1)')
+        self.assertEqual(lines[1:], ('\n', 'print(1)'))
+        self.assertEqual(lines[::-2], ('print(1)', 'import os\n'))
+        self.assertEqual(list(lines), list(self.file_dict['a.py']))
+        self.assertEqual(''.join(lines), 'import os\n\nprint(1)')
+        self.assertEqual(list(enumerate(lines, 1))[1], (2, '\n'))
+        self.assertIn('\n', lines)
+        self.assertEqual(lines.index('print(1)'), 2)
+        self.assertEqual(lines, list(self.file_dict['a.py']))
+        self.assertNotEqual(lines, self.store['b.txt'])
+        self.assertNotEqual(lines, 'import os\n')
+        with self.assertRaises(IndexError):
+            lines[3]
+        with self.assertRaises(IndexError):
+            lines[-4]
+        with self.assertRaises(TypeError):
+            hash(lines)
+        self.assertIn('import os', repr(lines))
+        self.assertEqual(self.store['empty.py'], ())
+
+    def test_decoded_once(self):
+        buffer = CountingBuffer(b'a\nb\n')
+        buffer.reads = []
+        lines = FileLines(buffer, array('q', [0, 2, 4]), 0, 2)
+        self.assertEqual(list(lines), ['a\n', 'b\n'])
+        self.assertEqual(lines[1], 'b\n')
+        self.assertEqual(list(lines), ['a\n', 'b\n'])
+        self.assertEqual(len(buffer.reads), 2)
+        self.assertIs(self.store['a.py'], self.store['a.py'])
+
+    def test_add(self):
+        with FileStore() as store:
+            self.assertEqual(len(store), 0)
+            store.add('empty.py', ())
+            self.assertEqual(store['empty.py'], ())
+            with self.assertRaises(ValueError):
+                store.add('a.py', ('a\n',))
+
+        with FileStore() as store:
+            for filename, lines in self.file_dict.items():
+                store.add(filename, lines)
+            self.assertEqual(dict(store), self.file_dict)
+
+    def test_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.store['b.txt'])),
+                         self.file_dict['b.txt'])
+        with pickle.loads(pickle.dumps(self.store)) as store:
+            self.assertEqual(dict(store), dict(self.store))
+
+    def test_get_file_dict(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = []
+            for name, content in (('unix.py', 'a = 1\nb = 2\n'),
+                                  ('windows.py', 'a = 1\r\nb = 2'),
+                                  ('unicode.md', 'äöü\n')):
+                filenames.append(os.path.join(directory, name))
+                with open(filenames[-1], 'w', encoding='utf-8',
+                          newline='') as file:
+                    file.write(content)
+            file_dict = get_file_dict(filenames, allow_raw_files=True)
+            with FileStore(file_dict) as store:
+                self.assertEqual(dict(store), file_dict)
+
+    def test_bear_tests(self):
+        bears = {'Python': [TestLocalBear, TestGlobalBear]}
+        bear_settings_obj = collect_bear_settings({'test': set(bears[
+            'Python'])})
+        file_dict = {'A.py': ('a\n', 'b\n'), 'C.py': ('c\n',)}
+        contents = initialize_project_data(
+            os.path.dirname(__file__) + os.sep, [])
+        printer = Mock()
+        results = []
+        green_mode._RESERVE_CPUS, reserve_cpus = 1, green_mode._RESERVE_CPUS
+        try:
+            for files in (file_dict, FileStore(file_dict)):
+                with patch('coala_quickstart.green_mode.green_mode.'
+                           'get_cpu_count', return_value=3):
+                    results.append(bear_test_fun(
+                        bears, bear_settings_obj, files, [], contents,
+                        ['A.py', 'C.py'], 5, 5, printer, 2))
+        finally:
+            green_mode._RESERVE_CPUS = reserve_cpus
+        self.assertEqual(results[0], results[1])
+
+    def test_forked_workers(self):
+        green_mode._RESERVE_CPUS, reserve_cpus = 1, green_mode._RESERVE_CPUS
+        try:
+            with patch('coala_quickstart.green_mode.green_mode.'
+                       'get_cpu_count', return_value=3), \
+                    BearTestPool(self.store, [], 2) as pool:
+                outcomes = pool.run(TestLocalBear, [
+                    ('a.py', {'filename': 'a.py', 'yield_results': True}),
+                    ('b.txt', {'filename': 'b.txt'})])
+        finally:
+            green_mode._RESERVE_CPUS = reserve_cpus
+        self.assertEqual(outcomes, [(False, 1), (True, 0)])
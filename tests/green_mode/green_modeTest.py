@@ -2,18 +2,23 @@ import operator
 import os
 import unittest
 import yaml
+from collections import Counter, OrderedDict
 from copy import deepcopy
 from pathlib import Path
 from textwrap import dedent
 from unittest.mock import patch
 
+from coala_quickstart.Hooks import add_listener, remove_listener
+from coala_quickstart.Timings import start_timings, stop_timings
 from coala_quickstart.generation.SettingsClass import (
     collect_bear_settings,
     )
 from coala_quickstart.green_mode.Setting import (
+    SettingExtremes,
     find_max_min_of_setting,
     )
 from coala_quickstart.green_mode import green_mode
+from coala_quickstart.green_mode.file_store import FileStore
 from coala_quickstart.green_mode.green_mode import (
     bear_test_fun,
     check_bear_results,
@@ -21,10 +26,14 @@ from coala_quickstart.green_mode.green_mode import (
     generate_data_struct_for_sections,
     generate_green_mode_sections,
     get_kwargs,
+    get_rule_code,
+    get_rule_code_settings,
     get_setting_type,
     global_bear_test,
     initialize_project_data,
+    load_bear_settings,
     local_bear_test,
+    run_bear_test,
     run_quickstartbear,
     )
 from coala_quickstart.generation.Utilities import (
@@ -34,6 +43,7 @@ from coala_quickstart.generation.Utilities import (
     )
 from coala_quickstart.green_mode.QuickstartBear import (
     QuickstartBear)
+from coalib.processes.Processing import get_file_dict
 from coalib.results.Result import Result
 from coalib.results.SourceRange import (
     SourcePosition,
@@ -47,12 +57,18 @@ from tests.test_bears.AnotherTestLocalDepBear import AnotherTestLocalDepBear
 from tests.test_bears.TestGlobalBear import TestGlobalBear
 from tests.test_bears.TestLocalBear import TestLocalBear
 from tests.test_bears.TestLocalDepBear import TestLocalDepBear
+from tests.test_bears.MaxLinesBear import MaxLinesBear
+from tests.test_bears.RuleCodesBear import RuleCodesBear
+from tests.TestUtilities import redirect_cache_dir
 
 settings_key = 'green_mode_infinite_value_settings'
 
 
 class Test_green_mode(unittest.TestCase):
 
+    def setUp(self):
+        redirect_cache_dir(self)
+
     def test_get_yaml_contents(self):
         project_data = 'example_.project_data.yaml'
         full_path = str(Path(__file__).parent / project_data)
@@ -135,6 +151,9 @@ class Test_green_mode(unittest.TestCase):
                            'example_.project_data.yaml',
                            'green_modeTest.py',
                            'filename_operationsTest.py',
+                           'file_storeTest.py',
+                           'search_strategiesTest.py',
+                           'ignore_indexTest.py',
                            'bear_settings.yaml',
                            {'test_dir': ['file_aggregatorTest.py',
                                          'test_file.py']}]
@@ -161,6 +180,9 @@ class Test_green_mode(unittest.TestCase):
                            'green_modeTest.py',
                            'test_dir' + os.sep + 'file_aggregatorTest.py',
                            'filename_operationsTest.py',
+                           'file_storeTest.py',
+                           'search_strategiesTest.py',
+                           'ignore_indexTest.py',
                            'test_dir' + os.sep + 'test_file.py']
         test_final_data = [prefix + x for x in test_final_data]
         self.assertCountEqual(final_data, test_final_data)
@@ -201,6 +223,19 @@ class Test_green_mode(unittest.TestCase):
         test_contents = {settings_key: [{'key': 1}]}
         self.assertEqual(final_contents, test_contents)
 
+    def test_setting_extremes(self):
+        extremes = SettingExtremes(OrderedDict([('max', operator.gt),
+                                                ('min', operator.lt)]))
+        self.assertEqual(extremes.update_contents({settings_key: []}),
+                         {settings_key: []})
+        for values in ({'max': 3, 'min': 3}, {'max': 5, 'min': 4},
+                       {'max': 1, 'min': 2}):
+            extremes.add(values)
+        self.assertEqual(extremes.values, {'max': 5, 'min': 2})
+        contents = {settings_key: [{'min': 1}]}
+        self.assertEqual(extremes.update_contents(contents),
+                         {settings_key: [{'min': 1}, {'max': 5}]})
+
     def test_run_quickstartbear(self):
         dir_path = str(Path(__file__).parent) + os.sep
         ignore_globs = ['*pycache*', '**.pyc', '**.orig']
@@ -217,6 +252,11 @@ class Test_green_mode(unittest.TestCase):
         start = SourcePosition(ignore_file_name, line=3, column=1)
         stop = SourcePosition(ignore_file_name, line=4, column=20)
         self.assertEqual(test_contents, final_contents)
+        self.assertTrue(ignore_ranges.contains(SourceRange(start, stop)))
+        with complete_file_dict:
+            self.assertEqual(dict(complete_file_dict),
+                             get_file_dict(complete_filename_list,
+                                           allow_raw_files=True))
         # TODO: Test for the ignores too which is currently broken
         # due to the tests contained in this file have test coafile
         # which contain the ignore field which is also accounted
@@ -231,8 +271,31 @@ class Test_green_mode(unittest.TestCase):
         test_contents = deepcopy(contents)
         (final_contents, ignore_ranges, complete_file_dict,
          complete_filename_list) = run_quickstartbear(contents, dir_path)
+        complete_file_dict.close()
         self.assertEqual(test_contents, final_contents)
 
+    def test_run_quickstartbear_file_store(self):
+        dir_path = str(Path(__file__).parent) + os.sep
+        contents = {'dir_structure': initialize_project_data(dir_path, []),
+                    settings_key: []}
+        with FileStore() as file_store:
+            (_, _, complete_file_dict,
+             complete_filename_list) = run_quickstartbear(
+                deepcopy(contents), dir_path, file_store)
+            self.assertIs(complete_file_dict, file_store)
+            self.assertCountEqual(file_store, complete_filename_list)
+
+        with patch.object(QuickstartBear, 'execute',
+                          side_effect=ValueError), \
+                patch.object(FileStore, 'close', autospec=True) as close:
+            with self.assertRaises(ValueError):
+                run_quickstartbear(deepcopy(contents), dir_path)
+            self.assertEqual(close.call_count, 1)
+            with FileStore() as file_store, self.assertRaises(ValueError):
+                run_quickstartbear(deepcopy(contents), dir_path, file_store)
+            # Only closed by the ``with`` block.
+            self.assertEqual(close.call_count, 2)
+
     def test_get_setting_type(self):
         __location__ = os.path.realpath(
             os.path.join(os.getcwd(), os.path.dirname(__file__)))
@@ -241,6 +304,38 @@ class Test_green_mode(unittest.TestCase):
         self.assertEqual(type_setting, 'typeX')
         self.assertEqual(val, '')
 
+    def test_load_bear_settings(self):
+        path = str(Path(green_mode.__file__).parent / 'bear_settings.yaml')
+        bear_settings = load_bear_settings(path)
+        self.assertIs(load_bear_settings(path), bear_settings)
+        self.assertIn('type2', bear_settings)
+
+        # The cached values are not shared with the callers.
+        type_setting, values = get_setting_type('file_naming_convention',
+                                                'FilenameBear')
+        self.assertEqual(type_setting, 'type3')
+        values.append('modified')
+        self.assertNotIn('modified', get_setting_type(
+            'file_naming_convention', 'FilenameBear')[1])
+
+    def test_get_rule_code_settings(self):
+        __location__ = os.path.realpath(
+            os.path.join(os.getcwd(), os.path.dirname(__file__)))
+        self.assertEqual(get_rule_code_settings(RuleCodesBear, __location__),
+                         {'ignore': 'ignore', 'select': 'select'})
+        self.assertEqual(get_rule_code_settings(TestLocalBear, __location__),
+                         {})
+        self.assertIsNone(get_setting_type('ignore', RuleCodesBear,
+                                           __location__))
+        self.assertEqual(list(get_rule_code_settings('PycodestyleBear')),
+                         ['pycodestyle_ignore', 'pycodestyle_select'])
+
+    def test_get_rule_code(self):
+        self.assertEqual(get_rule_code(Result('PycodestyleBear (E501)', '')),
+                         'E501')
+        self.assertIsNone(get_rule_code(Result('PycodestyleBear', '')))
+        self.assertIsNone(get_rule_code(1))
+
     def test_get_kwargs_1(self):
         relevant_bears = {'test':
                           {AllKindsOfSettingsBaseBear, }}
@@ -314,6 +409,82 @@ class Test_green_mode(unittest.TestCase):
         ignore_ranges = [('+=', ignore_object)]
         self.assertFalse(check_bear_results(results, ignore_ranges))
 
+    def test_check_bear_results_any_ignore_range(self):
+        start = SourcePosition('a.py', line=368, column=4)
+        end = SourcePosition('a.py', line=442, column=2)
+        results = [Result(affected_code=[SourceRange(start, end)],
+                          message='green_mode', origin=QuickstartBear)]
+
+        ignore_ranges = [
+            ('+', SourceRange.from_values('a.py', 1, 1, 2, 1)),
+            ('+', SourceRange.from_values('a.py', 300, 1, 500, 1)),
+            ('+', SourceRange.from_values('b.py', 1, 1, 900, 1))]
+        self.assertTrue(check_bear_results(results, ignore_ranges))
+        self.assertFalse(check_bear_results(results, ignore_ranges[::2]))
+
+    def test_check_bear_results_lazy(self):
+        taken = []
+
+        def results():
+            for result in ['a', 'b']:
+                taken.append(result)
+                yield result
+
+        self.assertFalse(check_bear_results(results(), []))
+        self.assertEqual(taken, ['a'])
+
+    def test_run_bear_test_early_exit(self):
+        file_dict = {'A.py': ('C1\n',) * 50 + ('error\n',)}
+        arguments = {'filename': 'A.py'}
+        self.assertEqual(run_bear_test(RuleCodesBear, 'A.py', arguments,
+                                       file_dict, []),
+                         (False, 1))
+        self.assertEqual(run_bear_test(RuleCodesBear, 'A.py', arguments,
+                                       file_dict, [], origins=True),
+                         (False, 51, {'C1', None}))
+        self.assertEqual(run_bear_test(RuleCodesBear, 'A.py',
+                                       dict(arguments, select=['C2']),
+                                       file_dict, []),
+                         (False, 1))
+        file_dict = {'A.py': ('C3\n',)}
+        self.assertEqual(run_bear_test(RuleCodesBear, 'A.py', arguments,
+                                       file_dict, []),
+                         (True, 0))
+
+    def test_bear_test_fun_timings(self):
+        from pyprint.ConsolePrinter import ConsolePrinter
+        bears = {'Python': [TestLocalBear, TestGlobalBear]}
+        bear_settings_obj = collect_bear_settings({'test': set(bears[
+            'Python'])})
+        file_dict = {'A.py': {'a\n', 'b\n'}}
+        contents = initialize_project_data(
+            str(Path(__file__).parent) + os.sep, [])
+        spans = []
+
+        def listener(event, current_span):
+            if event == 'end':
+                spans.append(current_span)
+
+        timings = start_timings()
+        add_listener(listener)
+        try:
+            bear_test_fun(bears, bear_settings_obj, file_dict, [], contents,
+                          ['A.py'], 5, 5, ConsolePrinter())
+        finally:
+            stop_timings()
+            remove_listener(listener)
+        self.assertEqual(sorted(timings.records),
+                         ['TestGlobalBear', 'TestLocalBear'])
+        runs = [current_span for current_span in spans
+                if current_span.kind == 'bear_run']
+        self.assertEqual({current_span.name for current_span in runs},
+                         {'TestGlobalBear', 'TestLocalBear'})
+        for current_span in runs:
+            self.assertEqual(current_span.attributes['files'], 1)
+            self.assertIn('results', current_span.attributes)
+            self.assertNotIn('file', current_span.attributes['settings'])
+            self.assertEqual(current_span.parent.kind, 'bear')
+
     def test_bear_test_fun_1(self):
         from pyprint.ConsolePrinter import ConsolePrinter
         printer = ConsolePrinter()
@@ -567,9 +738,13 @@ class Test_green_mode(unittest.TestCase):
                                  for i in contents.split('\n')])
 
 
+CPU_COUNT = 'coala_quickstart.green_mode.green_mode.get_cpu_count'
+
+
 class MultiProcessingTest(unittest.TestCase):
 
     def setUp(self):
+        redirect_cache_dir(self)
         self.orig_cpus = green_mode._RESERVE_CPUS
 
     def tearDown(self):
@@ -584,22 +759,22 @@ class MultiProcessingTest(unittest.TestCase):
 
     def test_reserve_cpus(self):
         green_mode._RESERVE_CPUS = 1
-        with patch('multiprocessing.cpu_count', return_value=1):
+        with patch(CPU_COUNT, return_value=1):
             self.assertIsNone(green_mode._create_mp_pool(0))
         green_mode._RESERVE_CPUS = 2
-        with patch('multiprocessing.cpu_count', return_value=2):
+        with patch(CPU_COUNT, return_value=2):
             self.assertIsNone(green_mode._create_mp_pool(0))
 
         green_mode._RESERVE_CPUS = 1
-        with patch('multiprocessing.cpu_count', return_value=2):
+        with patch(CPU_COUNT, return_value=2):
             self.assertIsNotNone(green_mode._create_mp_pool(0))
 
         green_mode._RESERVE_CPUS = 1
-        with patch('multiprocessing.cpu_count', return_value=2):
+        with patch(CPU_COUNT, return_value=2):
             self.assertIsNotNone(green_mode._create_mp_pool(2))
 
         green_mode._RESERVE_CPUS = 1
-        with patch('multiprocessing.cpu_count', return_value=10):
+        with patch(CPU_COUNT, return_value=10):
             self.assertIsNotNone(green_mode._create_mp_pool(2))
 
     def test_ci_pool_min(self):
@@ -607,16 +782,172 @@ class MultiProcessingTest(unittest.TestCase):
             return
 
         if green_mode._DISABLE_MP:
-            with patch('multiprocessing.cpu_count', return_value=3):
+            with patch(CPU_COUNT, return_value=3):
                 self.assertIsNone(green_mode._create_mp_pool(0))
-            with patch('multiprocessing.cpu_count', return_value=100):
+            with patch(CPU_COUNT, return_value=100):
                 self.assertIsNone(green_mode._create_mp_pool(0))
         elif green_mode._RESERVE_CPUS == 2:
-            with patch('multiprocessing.cpu_count', return_value=2):
+            with patch(CPU_COUNT, return_value=2):
                 self.assertIsNone(green_mode._create_mp_pool(0))
-            with patch('multiprocessing.cpu_count', return_value=3):
+            with patch(CPU_COUNT, return_value=3):
                 self.assertIsNotNone(green_mode._create_mp_pool(0))
         else:
-            with patch('multiprocessing.cpu_count', return_value=2):
+            with patch(CPU_COUNT, return_value=2):
                 self.assertIsNotNone(green_mode._create_mp_pool(2))
                 self.assertIsNotNone(green_mode._create_mp_pool(0))
+
+    def test_bear_test_pool(self):
+        file_dict = {'A.py': ['a\n'], 'C.py': ['c\n']}
+        kwargs = {'yield_results': [True, False]}
+        spans = []
+
+        def listener(event, current_span):
+            if event == 'end':
+                spans.append(current_span)
+
+        green_mode._RESERVE_CPUS = 1
+        add_listener(listener)
+        try:
+            with patch(CPU_COUNT, return_value=3), \
+                    patch.object(green_mode, 'add_cpu_time') as add_cpu_time:
+                with green_mode.BearTestPool(file_dict, [], 0) as pool:
+                    self.assertEqual(pool.processes, 2)
+                    local_results = local_bear_test(
+                        TestLocalBear, file_dict, ['A.py', 'C.py'],
+                        'Python', dict(kwargs), [], pool=pool)
+                    global_results = global_bear_test(
+                        TestGlobalBear, file_dict, dict(kwargs), [],
+                        pool=pool)
+                    self.assertIsNotNone(pool.pool)
+                self.assertIsNone(pool.pool)
+        finally:
+            remove_listener(listener)
+
+        self.assertCountEqual(local_results[TestLocalBear],
+                              [{'yield_results': False, 'filename': 'A.py'},
+                               {'yield_results': False, 'filename': 'C.py'}])
+        self.assertEqual(global_results,
+                         {TestGlobalBear: [{'yield_results': False}]})
+        self.assertEqual(
+            sorted((current_span.name, current_span.attributes['results'],
+                    current_span.attributes['files'])
+                   for current_span in spans),
+            [('TestGlobalBear', 0, 2), ('TestGlobalBear', 1, 2),
+             ('TestLocalBear', 0, 1), ('TestLocalBear', 0, 1),
+             ('TestLocalBear', 1, 1), ('TestLocalBear', 1, 1)])
+        # The CPU time of the workers is added to the stages of the bears.
+        self.assertEqual(add_cpu_time.call_count, 6)
+
+        with patch.object(green_mode, 'add_cpu_time') as add_cpu_time, \
+                green_mode.BearTestPool(file_dict, [], 1) as pool:
+            pool.run(TestLocalBear, [(name, {'filename': name})
+                                     for name in file_dict])
+        self.assertEqual(add_cpu_time.call_count, 0)
+
+    def test_combination_major_probing(self):
+        file_dict = {'A.py': ('a\n',), 'B.py': ('b\n',) * 3,
+                     'C.py': ('c\n',) * 2}
+        kwargs = OrderedDict([('max_lines', [1, 2, 3, 4])])
+        failures = Counter()
+        spans = []
+
+        def listener(event, current_span):
+            if event == 'end':
+                spans.append(current_span.attributes['settings']['filename'])
+
+        add_listener(listener)
+        try:
+            results = local_bear_test(
+                MaxLinesBear, file_dict, sorted(file_dict), 'Python',
+                kwargs, [], jobs=1, probing='combination-major',
+                failures=failures)[MaxLinesBear]
+        finally:
+            remove_listener(listener)
+
+        self.assertEqual(
+            results,
+            [{'max_lines': lines, 'filename': filename}
+             for lines in (3, 4) for filename in ('B.py', 'C.py', 'A.py')])
+        # The longest file is tested first, the combinations left on the
+        # next two files.
+        self.assertEqual(spans, ['B.py'] * 4 + ['C.py', 'A.py'] * 2)
+        self.assertEqual(failures, {'B.py': 2})
+
+        results = local_bear_test(
+            MaxLinesBear, file_dict, sorted(file_dict), 'Python',
+            OrderedDict([('max_lines', [2])]), [], jobs=1,
+            probing='combination-major', failures=failures)[MaxLinesBear]
+        self.assertEqual(results, [])
+        self.assertEqual(failures, {'B.py': 3})
+
+    def test_infer_rule_codes(self):
+        file_dict = {'A.py': ('C1\n', 'C2\n', 'C3\n'), 'B.py': ('C3\n',),
+                     'C.py': ('ok\n', 'C4\n'), 'D.py': ('C1\n', 'error\n')}
+        codes = ['C1', 'C2', 'C3', 'C4']
+        kwargs = OrderedDict([('ignore', codes), ('select', codes)])
+        rule_codes = {'ignore': 'ignore', 'select': 'select'}
+        spans = []
+
+        def listener(event, current_span):
+            if event == 'end':
+                spans.append(current_span.attributes['settings'])
+
+        add_listener(listener)
+        try:
+            results = local_bear_test(
+                RuleCodesBear, file_dict, sorted(file_dict), 'Python',
+                kwargs, [], jobs=1, rule_codes=rule_codes)[RuleCodesBear]
+        finally:
+            remove_listener(listener)
+
+        self.assertCountEqual(results, [
+            {'filename': 'A.py', 'ignore': ['C3', 'C1', 'C2']},
+            {'filename': 'B.py'},
+            {'filename': 'C.py', 'ignore': ['C3', 'C4']}])
+        # One run per file and one to verify the inferred values of the
+        # files with results.
+        self.assertEqual(len(spans), 4 + 2)
+
+        # Only the rules to select can be inferred.
+        results = local_bear_test(
+            RuleCodesBear, file_dict, ['A.py', 'C.py'], 'Python',
+            OrderedDict([('select', codes)]), [], jobs=1,
+            probing='combination-major',
+            rule_codes=rule_codes)[RuleCodesBear]
+        self.assertEqual(results, [{'select': ['C3'], 'filename': 'A.py'},
+                                   {'select': ['C3'], 'filename': 'C.py'}])
+
+        # Selecting D1 turns on a rule which is off by default, so it is
+        # verified on the file without results too.
+        file_dict = {'A.py': ('C1\n',), 'B.py': ('D1\n',)}
+        results = local_bear_test(
+            RuleCodesBear, file_dict, ['A.py', 'B.py'], 'Python',
+            OrderedDict([('select', ['C1', 'D1'])]), [], jobs=1,
+            probing='combination-major',
+            rule_codes=rule_codes)[RuleCodesBear]
+        self.assertEqual(results, [])
+
+    def test_bear_test_pool_error(self):
+        green_mode._RESERVE_CPUS = 1
+        with patch(CPU_COUNT, return_value=3):
+            with self.assertRaises(KeyError):
+                with green_mode.BearTestPool({}, [], 2) as pool:
+                    pool.run(TestLocalBear, [('A.py', {}), ('C.py', {})])
+            self.assertIsNone(pool.pool)
+
+    def test_bear_test_fun_jobs(self):
+        from pyprint.ConsolePrinter import ConsolePrinter
+        bears = {'Python': [TestLocalBear, TestLocalDepBear, TestGlobalBear]}
+        bear_settings_obj = collect_bear_settings({'test': set(bears[
+            'Python'])})
+        file_dict = {'A.py': ['a\n'], 'C.py': ['c\n']}
+        contents = initialize_project_data(
+            str(Path(__file__).parent) + os.sep, [])
+        results = []
+        green_mode._RESERVE_CPUS = 1
+        for jobs in (1, 2):
+            with patch(CPU_COUNT, return_value=3):
+                results.append(bear_test_fun(
+                    bears, bear_settings_obj, file_dict, [], contents,
+                    ['A.py', 'C.py'], 5, 5, ConsolePrinter(), jobs))
+        self.assertEqual(results[0], results[1])
@@ -0,0 +1,75 @@
+import unittest
+
+from coala_quickstart.generation.Utilities import contained_in
+from coala_quickstart.green_mode.ignore_index import (
+    IgnoreRangeIndex,
+    get_ignore_index,
+    )
+from coalib.results.SourceRange import SourceRange
+
+
+def source_range(start_line, start_column, end_line, end_column,
+                 filename='a.py'):
+    return SourceRange.from_values(filename, start_line, start_column,
+                                   end_line, end_column)
+
+
+class IgnoreRangeIndexTest(unittest.TestCase):
+
+    def test_contains(self):
+        index = IgnoreRangeIndex([('+', source_range(10, 4, 20, 2)),
+                                  ('+', source_range(12, 1, 14, 1)),
+                                  ('+', source_range(30, 1, 40, 1))])
+        self.assertEqual(len(index), 3)
+        self.assertTrue(index.contains(source_range(10, 4, 20, 2)))
+        self.assertTrue(index.contains(source_range(13, 1, 18, 5)))
+        self.assertTrue(index.contains(source_range(35, 1, 36, 1)))
+        self.assertFalse(index.contains(source_range(10, 3, 11, 1)))
+        self.assertFalse(index.contains(source_range(19, 1, 20, 3)))
+        self.assertFalse(index.contains(source_range(15, 1, 31, 1)))
+        self.assertFalse(index.contains(source_range(1, 1, 2, 1)))
+        self.assertFalse(index.contains(source_range(13, 1, 14, 1,
+                                                     'b.py')))
+
+    def test_contains_like_contained_in(self):
+        ignores = [source_range(line, column, line + length, column + 2)
+                   for line, column, length in ((3, 1, 4), (5, 3, 0),
+                                                (5, 2, 9), (20, 1, 1))]
+        index = IgnoreRangeIndex(('+', ignore) for ignore in ignores)
+        for line in range(1, 25):
+            for length in range(0, 4):
+                for column in range(1, 5):
+                    tested = source_range(line, column, line + length,
+                                          column + 1)
+                    self.assertEqual(
+                        index.contains(tested),
+                        any(contained_in(tested, ignore)
+                            for ignore in ignores),
+                        tested)
+
+    def test_no_columns(self):
+        index = IgnoreRangeIndex([('+', SourceRange.from_values('a.py', 1)),
+                                  ('+', source_range(5, 1, 9, 1))])
+        self.assertEqual(len(index), 2)
+        self.assertFalse(index.contains(SourceRange.from_values('a.py', 1)))
+        self.assertFalse(index.contains(SourceRange.from_values('a.py', 6)))
+        self.assertTrue(index.contains(source_range(6, 1, 7, 1)))
+
+    def test_add(self):
+        index = IgnoreRangeIndex()
+        self.assertEqual(len(index), 0)
+        self.assertFalse(index.contains(source_range(6, 1, 7, 1)))
+        index.add([('+', source_range(30, 1, 40, 1))])
+        index.add([('+', source_range(5, 1, 9, 1)),
+                   ('+', source_range(1, 1, 2, 1, 'b.py'))])
+        self.assertEqual(len(index), 3)
+        self.assertTrue(index.contains(source_range(6, 1, 7, 1)))
+        self.assertTrue(index.contains(source_range(31, 1, 32, 1)))
+        self.assertTrue(index.contains(source_range(1, 1, 2, 1, 'b.py')))
+
+    def test_get_ignore_index(self):
+        index = IgnoreRangeIndex()
+        self.assertIs(get_ignore_index(index), index)
+        index = get_ignore_index([('+', source_range(5, 1, 9, 1))])
+        self.assertIsInstance(index, IgnoreRangeIndex)
+        self.assertEqual(len(index), 1)
@@ -0,0 +1,167 @@
+import unittest
+from collections import OrderedDict
+
+from coala_quickstart.green_mode.green_mode import (
+    bear_test_fun,
+    global_bear_test,
+    local_bear_test,
+    )
+from coala_quickstart.green_mode.search_strategies import (
+    SEARCH_STRATEGIES,
+    BinarySearch,
+    DominanceSearch,
+    ExhaustiveSearch,
+    OneAtATimeSearch,
+    get_search_strategy,
+    run_searches,
+    )
+from coala_quickstart.generation.SettingsClass import collect_bear_settings
+from pyprint.NullPrinter import NullPrinter
+from tests.test_bears.TestGlobalBear import TestGlobalBear
+from tests.test_bears.TestLocalBear import TestLocalBear
+from tests.TestUtilities import redirect_cache_dir
+
+SPACE = OrderedDict([('max_line_length', [80, 60, 120, 100, 140]),
+                     ('allow_trailing_whitespace', [False, True]),
+                     ('use_spaces', [True, False])])
+
+
+def is_green(arguments):
+    return (arguments.get('max_line_length', 100) >= 100 and
+            arguments.get('allow_trailing_whitespace', True) and
+            arguments['use_spaces'])
+
+
+class search_strategiesTest(unittest.TestCase):
+
+    def setUp(self):
+        redirect_cache_dir(self)
+
+    def search(self, strategy, spaces, green=is_green):
+        tests = []
+
+        def evaluate(batch):
+            tests.extend(batch)
+            return [green(arguments) for _, arguments in batch]
+
+        return run_searches(strategy, spaces, evaluate), tests
+
+    def test_exhaustive(self):
+        (results,), tests = self.search(ExhaustiveSearch(), [SPACE])
+        self.assertEqual(len(tests), 20)
+        self.assertEqual(results, [
+            {'max_line_length': length, 'allow_trailing_whitespace': True,
+             'use_spaces': True} for length in (120, 100, 140)])
+
+    def test_strategies_find_monotonic_greens(self):
+        (expected,), _ = self.search(ExhaustiveSearch(), [SPACE])
+        for name in SEARCH_STRATEGIES:
+            with self.subTest(strategy=name):
+                (results,), tests = self.search(get_search_strategy(name),
+                                                [SPACE])
+                self.assertEqual(results, expected)
+                self.assertLessEqual(len(tests), 20)
+
+    def test_strategies_non_monotonic(self):
+        space = OrderedDict([('indent_size', [4, 2, 8, 1, 3, 5, 6, 0]),
+                             ('use_spaces', [True, False])])
+
+        def green(arguments):
+            return arguments['indent_size'] == 2 and arguments['use_spaces']
+
+        for name in SEARCH_STRATEGIES:
+            with self.subTest(strategy=name):
+                (results,), _ = self.search(get_search_strategy(name),
+                                            [space], green)
+                self.assertEqual(results,
+                                 [{'indent_size': 2, 'use_spaces': True}])
+
+    def test_one_at_a_time(self):
+        (results,), tests = self.search(OneAtATimeSearch(), [SPACE])
+        # The combinations of the green values were all probed.
+        self.assertEqual(len(tests), 7)
+        self.assertEqual(len(results), 3)
+
+        def interacting(arguments):
+            return (arguments['max_line_length'] == 60) == (
+                arguments['use_spaces'] is False)
+        (results,), _ = self.search(OneAtATimeSearch(), [SPACE],
+                                    interacting)
+        self.assertNotIn(False, [arguments['use_spaces']
+                                 for arguments in results])
+
+    def test_binary(self):
+        (results,), tests = self.search(BinarySearch(), [SPACE])
+        self.assertLess(len(tests), 20)
+        self.assertEqual(len(results), 3)
+
+        # Green up to some value.
+        (results,), _ = self.search(
+            BinarySearch(), [SPACE],
+            lambda arguments: arguments['max_line_length'] <= 80)
+        self.assertEqual(len(results), 8)
+
+        # Only settings whose values can be compared are binary searched.
+        (results,), tests = self.search(
+            BinarySearch(lambda setting, value: None), [SPACE])
+        self.assertEqual(len(tests), 20)
+
+        space = OrderedDict([('use_spaces', [True, False])])
+        (results,), tests = self.search(BinarySearch(), [space])
+        self.assertEqual(len(tests), 2)
+        self.assertEqual(results, [{'use_spaces': True}])
+
+    def test_dominance(self):
+        (results,), tests = self.search(DominanceSearch(), [SPACE])
+        self.assertLess(len(tests), 20)
+        self.assertEqual(len(results), 3)
+
+        strategy = DominanceSearch(lambda setting, value: None)
+        (results,), tests = self.search(strategy, [SPACE])
+        self.assertEqual(len(tests), 20)
+
+    def test_run_searches(self):
+        spaces = [SPACE, OrderedDict([('use_spaces', [True, False])]),
+                  OrderedDict([('use_spaces', [])])]
+        rounds = []
+
+        def evaluate(batch):
+            rounds.append(sorted({index for index, _ in batch}))
+            return [True] * len(batch)
+
+        results = run_searches(BinarySearch(), spaces, evaluate)
+        self.assertEqual([len(result) for result in results], [20, 2, 0])
+        # The searches run their rounds together.
+        self.assertEqual(rounds[0], [0, 1])
+
+    def test_bear_tests(self):
+        file_dict = {'A.py': ('a\n',), 'C.py': ('c\n',)}
+        kwargs = OrderedDict([('yield_results', [True, False])])
+        for name in SEARCH_STRATEGIES:
+            strategy = get_search_strategy(name)
+            with self.subTest(strategy=name):
+                local_results = local_bear_test(
+                    TestLocalBear, file_dict, ['A.py', 'C.py'], 'Python',
+                    OrderedDict(kwargs), [], jobs=1, strategy=strategy)
+                self.assertCountEqual(
+                    local_results[TestLocalBear],
+                    [{'yield_results': False, 'filename': 'A.py'},
+                     {'yield_results': False, 'filename': 'C.py'}])
+                self.assertEqual(
+                    global_bear_test(TestGlobalBear, file_dict,
+                                     OrderedDict(kwargs), [], jobs=1,
+                                     strategy=strategy),
+                    {TestGlobalBear: [{'yield_results': False}]})
+
+    def test_bear_test_fun(self):
+        bears = {'Python': [TestLocalBear, TestGlobalBear]}
+        bear_settings_obj = collect_bear_settings({'Python': set(
+            bears['Python'])})
+        contents = {'dir_structure': [],
+                    'green_mode_infinite_value_settings': []}
+        file_dict = {'A.py': ('a\n',)}
+        results = [bear_test_fun(bears, bear_settings_obj, file_dict, [],
+                                 contents, ['A.py'], 5, 5, NullPrinter(), 1,
+                                 get_search_strategy(name))
+                   for name in ('exhaustive', 'dominance')]
+        self.assertEqual(results[0], results[1])
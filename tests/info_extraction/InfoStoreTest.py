@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import patch
+
+from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
+from coala_quickstart.info_extraction.Info import Info
+from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
+from coala_quickstart.info_extraction.InfoScope import InfoScope
+from coala_quickstart.info_extraction.InfoStore import InfoStore
+
+
+class DummyInfoExtractor(InfoExtractor):
+    pass
+
+
+class DerivedInfoExtractor(DummyInfoExtractor):
+    pass
+
+
+class OtherInfoExtractor(InfoExtractor):
+    pass
+
+
+class InfoA(Info):
+    pass
+
+
+class InfoB(Info):
+    pass
+
+
+def make_extractor(extractor_class):
+    return extractor_class.__new__(extractor_class)
+
+
+class InfoStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dummy = make_extractor(DummyInfoExtractor)
+        self.derived = make_extractor(DerivedInfoExtractor)
+        self.other = make_extractor(OtherInfoExtractor)
+        self.a1 = InfoA('setup.py', 1, self.dummy)
+        self.a2 = InfoA('package.json', 2, self.derived)
+        self.a3 = InfoA('setup.py', 3, self.other)
+        self.b1 = InfoB('setup.py', 4)
+        self.uut = InfoStore([self.a1, self.a2, self.a3, self.b1])
+
+    def test_dict_compatibility(self):
+        self.assertEqual(self.uut, {'InfoA': [self.a1, self.a2, self.a3],
+                                    'InfoB': [self.b1]})
+        self.assertEqual(self.uut.get('LintTaskInfo', []), [])
+
+    def test_from_dict(self):
+        self.assertIs(InfoStore.from_dict(self.uut), self.uut)
+        store = InfoStore.from_dict({'InfoA': [self.a1, self.a2]})
+        self.assertIsInstance(store, InfoStore)
+        self.assertEqual(store.get_by_source('setup.py'), [self.a1])
+
+    def test_indexes(self):
+        self.assertEqual(self.uut.get_by_kind(InfoA),
+                         [self.a1, self.a2, self.a3])
+        self.assertEqual(self.uut.get_by_kind('InfoB'), [self.b1])
+        self.assertEqual(self.uut.get_by_kind('InfoC'), [])
+        self.assertEqual(self.uut.get_by_source('setup.py'),
+                         [self.a1, self.a3, self.b1])
+        self.assertEqual(self.uut.get_by_source('Gemfile'), [])
+        self.assertEqual(self.uut.get_by_extractor(DummyInfoExtractor),
+                         [self.a1, self.a2])
+        self.assertEqual(
+            self.uut.get_by_extractor((DerivedInfoExtractor,
+                                       OtherInfoExtractor)),
+            [self.a2, self.a3])
+
+    def test_get_in_scope(self):
+        def in_scope(**kwargs):
+            return self.uut.get_in_scope(InfoScope('global', **kwargs),
+                                         InfoA)
+
+        self.assertEqual(in_scope(), [self.a1, self.a2, self.a3])
+        self.assertEqual(in_scope(allowed_sources=['setup.py']),
+                         [self.a1, self.a3])
+        self.assertEqual(in_scope(allowed_extractors=(DummyInfoExtractor,)),
+                         [self.a1, self.a2])
+        self.assertEqual(in_scope(allowed_sources=['setup.py'],
+                                  allowed_extractors=(DummyInfoExtractor,)),
+                         [self.a1])
+        self.assertEqual(in_scope(allowed_sources=['package.json'],
+                                  allowed_extractors=[OtherInfoExtractor]),
+                         [])
+
+    def test_get_in_scope_matches_check(self):
+        section = Section('test')
+        section.append(Setting('files', '**'))
+        for kwargs in ({},
+                       {'allowed_sources': ['setup.py']},
+                       {'allowed_extractors': (OtherInfoExtractor,)},
+                       {'allowed_sources': ['setup.py'],
+                        'allowed_extractors': (DummyInfoExtractor,)}):
+            scope = InfoScope('global', **kwargs)
+            self.assertEqual(
+                self.uut.get_in_scope(scope, InfoA),
+                [info for info in self.uut['InfoA']
+                 if scope.check_is_applicable_information(section, info)])
+
+    def test_get_applicable(self):
+        scope = InfoScope(
+            'global',
+            section_match_method=lambda files, info: info.value > 1)
+        python = Section('python')
+        python.append(Setting('files', '*.py'))
+        other = Section('python')
+        other.append(Setting('files', '*.js'))
+
+        check_method = scope.check_is_applicable_information
+        with patch.object(scope, 'check_is_applicable_information',
+                          wraps=check_method) as check:
+            self.assertEqual(self.uut.get_applicable(scope, InfoA, python),
+                             [self.a2, self.a3])
+            self.assertEqual(self.uut.get_applicable(scope, 'InfoA', python),
+                             [self.a2, self.a3])
+            self.assertEqual(check.call_count, 3)
+
+            self.uut.get_applicable(scope, InfoA, other)
+            self.assertEqual(check.call_count, 6)
+
+            # Adding information invalidates the cached results.
+            a4 = InfoA('setup.py', 5)
+            self.uut.add(a4)
+            self.assertEqual(self.uut.get_applicable(scope, InfoA, python),
+                             [self.a2, self.a3, a4])
+            self.assertEqual(check.call_count, 10)
+
+    def test_get_applicable_section_name(self):
+        scope = InfoScope('global')
+        self.assertEqual(self.uut.get_applicable(scope, InfoB, 'python'),
+                         [self.b1])
+        self.assertEqual(
+            self.uut.get_applicable(scope, InfoB, Section('python')),
+            [self.b1])
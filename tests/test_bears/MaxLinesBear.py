@@ -0,0 +1,10 @@
+from coalib.bears.LocalBear import LocalBear
+
+
+class MaxLinesBear(LocalBear):
+    CAN_FIX = {}
+    LANGUAGES = {}
+
+    def run(self, filename, file, max_lines: int = 1):
+        if len(file) > max_lines:
+            yield 1
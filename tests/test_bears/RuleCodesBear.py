@@ -0,0 +1,25 @@
+from coalib.bears.LocalBear import LocalBear
+from coalib.results.Result import Result
+
+
+class RuleCodesBear(LocalBear):
+    CAN_FIX = {}
+    LANGUAGES = {}
+
+    def run(self, filename, file, ignore: list = ('C3',),
+            select: list = ()):
+        # The lines starting with C are violations of the rule they name,
+        # the ones starting with D only if their rule is selected.
+        for line_number, line in enumerate(file, 1):
+            code = line.strip()
+            if code == 'error':
+                origin = 'RuleCodesBear'
+            elif code.startswith('D') and code in select:
+                origin = 'RuleCodesBear ({})'.format(code)
+            elif (not code.startswith('C') or code in ignore or
+                    (select and code not in select)):
+                continue
+            else:
+                origin = 'RuleCodesBear ({})'.format(code)
+            yield Result.from_values(origin, 'Violation', file=filename,
+                                     line=line_number)